@@ -0,0 +1,82 @@
+"""
+Alembic environment.
+
+Migrations run against the database the app is configured for (app.core.config), or
+sqlalchemy.url in alembic.ini when it is set. On SQLite the badminton and
+access_control schemas are attached databases, as in app.core.database.
+
+target_metadata is the app's models, so `alembic revision --autogenerate` diffs them
+against the database. Write index changes with the helpers in app.core.migrations.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, make_url, pool, text
+
+import app.models  # noqa: F401 - registers every table on Base.metadata
+from app.core.config import settings
+from app.core.database import Base, attach_sqlite_schemas
+from app.core.migrations import LOCK_TIMEOUT
+
+config = context.config
+if config.config_file_name is not None:
+    # Keep the loggers the app already set up when init_db.py stamps from inside it
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+SCHEMAS = {"badminton", "access_control"}
+
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or settings.full_database_url
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """Only compare the app's schemas, not public, extensions or alembic_version"""
+    if type_ == "schema":
+        return name in SCHEMAS
+    return True
+
+
+def configure_options(dialect_name: str) -> dict:
+    return {
+        "target_metadata": target_metadata,
+        "include_schemas": True,
+        "include_name": include_name,
+        "compare_type": True,
+        # One transaction per revision, so a failed revision leaves the earlier ones applied
+        "transaction_per_migration": True,
+        # SQLite cannot ALTER most things in place
+        "render_as_batch": dialect_name == "sqlite",
+    }
+
+
+def run_migrations_offline() -> None:
+    """Print the SQL instead of running it (alembic upgrade head --sql)"""
+    url = database_url()
+    context.configure(
+        url=url, literal_binds=True, dialect_opts={"paramstyle": "named"},
+        **configure_options(make_url(url).get_backend_name()),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    engine = create_engine(database_url(), poolclass=pool.NullPool)
+    dialect_name = engine.url.get_backend_name()
+    if dialect_name == "sqlite":
+        attach_sqlite_schemas(engine)
+    with engine.connect() as connection:
+        if dialect_name == "postgresql":
+            connection.execute(text(f"SET lock_timeout = '{LOCK_TIMEOUT}'"))
+            connection.commit()
+        context.configure(connection=connection, **configure_options(dialect_name))
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,52 @@
+"""Composite and partial indexes for standings, the feed and comment threads
+
+Proposed by benchmarks/index_advisor.py from the benchmark's statements:
+- Match (tournament_id, status): verified matches of one tournament (standings,
+  leaderboard, medals). It also serves tournament_id alone, so it replaces
+  idx_match_tournament_id.
+- Post (created_at DESC) WHERE is_deleted = false: the feed, newest live posts first.
+- Comment (post_id, parent_comment_id, created_at) WHERE is_deleted = false: a post's
+  live top-level comments in posting order.
+
+On Postgres every index is built and dropped CONCURRENTLY, so reads and writes go on
+while it builds. IF [NOT] EXISTS makes the revision safe on databases created from
+init_database.sql, which already has the new set.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import create_index_concurrently, drop_index_concurrently
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _live(dialect_name: str) -> sa.TextClause:
+    # Written like the queries' own filter, so the planner can use the partial index
+    return sa.text("is_deleted = false" if dialect_name == "postgresql" else "is_deleted = 0")
+
+
+def upgrade() -> None:
+    live = _live(op.get_context().dialect.name)
+    create_index_concurrently("idx_match_tournament_status", "Match", ["tournament_id", "status"])
+    create_index_concurrently(
+        "idx_post_feed", "Post", [sa.text("created_at DESC")], postgresql_where=live, sqlite_where=live,
+    )
+    create_index_concurrently(
+        "idx_comment_thread", "Comment", ["post_id", "parent_comment_id", "created_at"],
+        postgresql_where=live, sqlite_where=live,
+    )
+    drop_index_concurrently("idx_match_tournament_id", "Match")
+
+
+def downgrade() -> None:
+    create_index_concurrently("idx_match_tournament_id", "Match", ["tournament_id"])
+    for name, table in (("idx_comment_thread", "Comment"), ("idx_post_feed", "Post"), ("idx_match_tournament_status", "Match")):
+        drop_index_concurrently(name, table)
@@ -0,0 +1,149 @@
+"""Give databases created by create_all the indexes of init_database.sql
+
+Databases built by init_db.py (Base.metadata.create_all) had none of the foreign key,
+filter and search indexes of init_database.sql, and carried an ix_* index on every
+primary key, which the primary key already provides. The models now declare the SQL
+file's indexes, so both ways of creating the schema agree; this revision brings
+existing databases there.
+
+On databases created from init_database.sql every step is a no-op.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import create_index_concurrently, drop_index_concurrently
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, schema)
+INDEXES = [
+    ("idx_user_username", "User", ["username"], "badminton"),
+    ("idx_user_email", "User", ["email"], "badminton"),
+    ("idx_user_role_id", "User", ["role_id"], "badminton"),
+    ("idx_user_profile_picture", "User", ["profile_picture_url"], "badminton"),
+    ("idx_match_player1_id", "Match", ["player1_id"], "badminton"),
+    ("idx_match_player2_id", "Match", ["player2_id"], "badminton"),
+    ("idx_match_status", "Match", ["status"], "badminton"),
+    ("idx_match_type", "Match", ["match_type"], "badminton"),
+    ("idx_match_player1_verified", "Match", ["player1_verified"], "badminton"),
+    ("idx_match_player2_verified", "Match", ["player2_verified"], "badminton"),
+    ("idx_match_verification_status", "Match", ["player1_verified", "player2_verified"], "badminton"),
+    ("idx_tournament_is_active", "Tournament", ["is_active"], "badminton"),
+    ("idx_medals_user_id", "medals", ["user_id"], "badminton"),
+    ("idx_medals_tournament_id", "medals", ["tournament_id"], "badminton"),
+    ("idx_medals_medal_type", "medals", ["medal_type"], "badminton"),
+    ("idx_tournament_participants_tournament_id", "tournament_participants", ["tournament_id"], "badminton"),
+    ("idx_tournament_participants_user_id", "tournament_participants", ["user_id"], "badminton"),
+    ("idx_tournament_invitations_tournament_id", "tournament_invitations", ["tournament_id"], "badminton"),
+    ("idx_tournament_invitations_user_id", "tournament_invitations", ["user_id"], "badminton"),
+    ("idx_tournament_invitations_status", "tournament_invitations", ["status"], "badminton"),
+    ("idx_reports_created_by", "reports", ["created_by_id"], "badminton"),
+    ("idx_reports_event_date", "reports", ["event_date"], "badminton"),
+    ("idx_reports_created_at", "reports", ["created_at"], "badminton"),
+    ("idx_report_reactions_report_id", "report_reactions", ["report_id"], "badminton"),
+    ("idx_report_reactions_user_id", "report_reactions", ["user_id"], "badminton"),
+    ("idx_report_views_report_id", "report_views", ["report_id"], "badminton"),
+    ("idx_report_views_user_id", "report_views", ["user_id"], "badminton"),
+    ("idx_report_views_viewed_at", "report_views", ["viewed_at"], "badminton"),
+    ("idx_post_user_id", "Post", ["user_id"], "badminton"),
+    ("idx_post_created_at", "Post", [sa.text("created_at DESC")], "badminton"),
+    ("idx_post_is_deleted", "Post", ["is_deleted"], "badminton"),
+    ("idx_comment_post_id", "Comment", ["post_id"], "badminton"),
+    ("idx_comment_user_id", "Comment", ["user_id"], "badminton"),
+    ("idx_comment_parent_comment_id", "Comment", ["parent_comment_id"], "badminton"),
+    ("idx_comment_created_at", "Comment", [sa.text("created_at DESC")], "badminton"),
+    ("idx_comment_is_deleted", "Comment", ["is_deleted"], "badminton"),
+    ("idx_attachment_post_id", "Attachment", ["post_id"], "badminton"),
+    ("idx_attachment_comment_id", "Attachment", ["comment_id"], "badminton"),
+    ("idx_attachment_file_type", "Attachment", ["file_type"], "badminton"),
+    ("idx_post_reaction_post_id", "PostReaction", ["post_id"], "badminton"),
+    ("idx_post_reaction_user_id", "PostReaction", ["user_id"], "badminton"),
+    ("idx_comment_reaction_comment_id", "CommentReaction", ["comment_id"], "badminton"),
+    ("idx_comment_reaction_user_id", "CommentReaction", ["user_id"], "badminton"),
+    ("idx_idempotency_keys_expires_at", "idempotency_keys", ["expires_at"], "badminton"),
+    ("idx_roles_permissions_role_id", "RolesPermissions", ["role_id"], "access_control"),
+    ("idx_roles_permissions_permission_id", "RolesPermissions", ["permission_id"], "access_control"),
+]
+
+# Postgres only: pg_trgm and full-text search
+SEARCH_INDEXES = [
+    ("idx_user_username_trgm", "User", "lower(username) gin_trgm_ops"),
+    ("idx_user_full_name_trgm", "User", "lower(full_name) gin_trgm_ops"),
+    ("idx_user_name_search", "User", "to_tsvector('simple', (coalesce(full_name, '') || ' ') || username)"),
+    ("idx_tournament_name_search", "Tournament", "to_tsvector('simple', name)"),
+    ("idx_reports_content_search", "reports", "to_tsvector('english', content)"),
+    ("idx_post_content_search", "Post", "to_tsvector('english', content)"),
+    ("idx_comment_content_search", "Comment", "to_tsvector('english', content)"),
+]
+
+# index=True on primary keys and on idempotency_keys.expires_at
+REDUNDANT_INDEXES = [
+    ("ix_badminton_User_id", "User", "badminton"),
+    ("ix_badminton_Match_id", "Match", "badminton"),
+    ("ix_badminton_Tournament_id", "Tournament", "badminton"),
+    ("ix_badminton_medals_id", "medals", "badminton"),
+    ("ix_badminton_tournament_participants_id", "tournament_participants", "badminton"),
+    ("ix_badminton_tournament_invitations_id", "tournament_invitations", "badminton"),
+    ("ix_badminton_reports_id", "reports", "badminton"),
+    ("ix_badminton_report_reactions_id", "report_reactions", "badminton"),
+    ("ix_badminton_report_views_id", "report_views", "badminton"),
+    ("ix_badminton_Post_id", "Post", "badminton"),
+    ("ix_badminton_Comment_id", "Comment", "badminton"),
+    ("ix_badminton_Attachment_id", "Attachment", "badminton"),
+    ("ix_badminton_PostReaction_id", "PostReaction", "badminton"),
+    ("ix_badminton_CommentReaction_id", "CommentReaction", "badminton"),
+    ("ix_badminton_idempotency_keys_id", "idempotency_keys", "badminton"),
+    ("ix_badminton_idempotency_keys_expires_at", "idempotency_keys", "badminton"),
+    ("ix_access_control_Role_role_id", "Role", "access_control"),
+    ("ix_access_control_PermissionGroup_permission_group_id", "PermissionGroup", "access_control"),
+    ("ix_access_control_Permission_permission_id", "Permission", "access_control"),
+    ("ix_access_control_User_id", "User", "access_control"),
+]
+
+# username and email were unique through these indexes rather than a constraint
+UNIQUE_INDEXES = [
+    ("ix_badminton_User_username", "User_username_key"),
+    ("ix_badminton_User_email", "User_email_key"),
+]
+
+
+def _index_exists(name: str) -> bool:
+    return bool(op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_indexes WHERE schemaname = 'badminton' AND indexname = :name"),
+        {"name": name},
+    ).scalar())
+
+
+def upgrade() -> None:
+    dialect_name = op.get_context().dialect.name
+    for name, table, columns, schema in INDEXES:
+        create_index_concurrently(name, table, columns, schema=schema)
+    if dialect_name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, table, expression in SEARCH_INDEXES:
+            create_index_concurrently(name, table, [sa.text(expression)], postgresql_using="gin")
+        # Turn the unique indexes into the constraints init_database.sql has; this only
+        # renames the index, the table is locked for an instant
+        for index_name, constraint_name in UNIQUE_INDEXES:
+            if not op.get_context().as_sql and _index_exists(index_name):
+                op.execute(
+                    f'ALTER TABLE badminton."User" ADD CONSTRAINT "{constraint_name}" '
+                    f'UNIQUE USING INDEX "{index_name}"'
+                )
+    # SQLite cannot add constraints; there the unique ix_ indexes stay
+    for name, table, schema in REDUNDANT_INDEXES:
+        drop_index_concurrently(name, table, schema=schema)
+
+
+def downgrade() -> None:
+    # The ix_* indexes were redundant and the idx_* ones are what init_database.sql
+    # creates, so there is nothing to restore
+    pass
@@ -0,0 +1,45 @@
+"""Attachment.processing_status for server-side uploads
+
+Attachments uploaded through the API are stored first and get their metadata and
+renditions from a background worker; processing_status tracks that (pending, ready,
+failed). Rows recorded from client-supplied metadata keep NULL. The partial index
+lets the housekeeping job find pending rows without scanning the table.
+
+Adding a nullable column without a default only touches the catalog, so the table is
+not rewritten. IF NOT EXISTS makes the revision a no-op on databases created from
+init_database.sql, which already has the column and the index.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import create_index_concurrently, drop_index_concurrently
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+PENDING = sa.text("processing_status = 'pending'")
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.execute('ALTER TABLE badminton."Attachment" ADD COLUMN IF NOT EXISTS processing_status VARCHAR(20)')
+    elif op.get_context().as_sql or "processing_status" not in {
+        column["name"] for column in sa.inspect(op.get_bind()).get_columns("Attachment", schema="badminton")
+    }:
+        op.add_column("Attachment", sa.Column("processing_status", sa.String(20), nullable=True), schema="badminton")
+    create_index_concurrently(
+        "idx_attachment_pending", "Attachment", ["created_at"], postgresql_where=PENDING, sqlite_where=PENDING,
+    )
+
+
+def downgrade() -> None:
+    drop_index_concurrently("idx_attachment_pending", "Attachment")
+    with op.batch_alter_table("Attachment", schema="badminton") as batch:
+        batch.drop_column("processing_status")
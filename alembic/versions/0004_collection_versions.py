@@ -0,0 +1,38 @@
+"""badminton.collection_versions for conditional GETs
+
+One row per cache namespace (matches, reports, invitations, ...) whose version is
+bumped by every transaction that changes the namespace; read endpoints derive their
+ETags from it (app/core/versions.py, app/core/conditional.py). Rows are created on
+the first change, so the table starts empty.
+
+The table is skipped when it already exists, which makes the revision a no-op on
+databases created from init_database.sql.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not op.get_context().as_sql and sa.inspect(op.get_bind()).has_table("collection_versions", schema="badminton"):
+        return
+    op.create_table(
+        "collection_versions",
+        sa.Column("namespace", sa.String(32), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        schema="badminton",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("collection_versions", schema="badminton")
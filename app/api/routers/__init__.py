@@ -0,0 +1,85 @@
+"""
+Router registry.
+
+Routers are listed by module name and URL prefix so the application can include them
+all at startup or, with LAZY_ROUTERS enabled, import each one on the first request
+under its prefix. Lazy loading keeps cold starts short on scale-to-zero hosts, where
+the first request otherwise waits for every router, schema and service to import.
+"""
+import importlib
+import threading
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, FastAPI
+
+# Module name -> URL prefix, in include order
+ROUTER_PREFIXES: Dict[str, str] = {
+    "auth": "/auth",
+    "users": "/users",
+    "verification": "/verification",
+    "matches": "/matches",
+    "tournaments": "/tournaments",
+    "permissions": "/permissions",
+    "roles": "/roles",
+    "medals": "/medals",
+    "tournament_invitations": "/tournament-invitations",
+    "reports": "/reports",
+    "posts": "/posts",
+    "events": "/events",
+    "search": "/search",
+    "media": "/media",
+}
+
+
+def import_router(name: str) -> APIRouter:
+    return importlib.import_module(f"{__name__}.{name}").router
+
+
+class RouterRegistry:
+    """Includes routers into an app exactly once, either all up front or on demand"""
+
+    def __init__(self, app: FastAPI, prefixes: Optional[Dict[str, str]] = None) -> None:
+        self.app = app
+        self.prefixes = dict(prefixes if prefixes is not None else ROUTER_PREFIXES)
+        self.loaded: List[str] = []
+        self._lock = threading.Lock()
+
+    def load(self, name: str) -> None:
+        if name in self.loaded:
+            return
+        with self._lock:
+            if name in self.loaded:
+                return
+            self.app.include_router(import_router(name))
+            self.loaded.append(name)
+            # The cached OpenAPI schema no longer lists every route
+            self.app.openapi_schema = None
+
+    def load_all(self) -> None:
+        for name in self.prefixes:
+            self.load(name)
+
+    def router_for_path(self, path: str) -> Optional[str]:
+        for name, prefix in self.prefixes.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return name
+        return None
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware that imports a router right before its first request is routed"""
+
+    def __init__(self, app, registry: RouterRegistry) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            if path == self.registry.app.openapi_url:
+                self.registry.load_all()
+            else:
+                name = self.registry.router_for_path(path)
+                if name is not None:
+                    self.registry.load(name)
+        await self.app(scope, receive, send)
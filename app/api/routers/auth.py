@@ -4,9 +4,8 @@ from sqlalchemy.orm import Session
 from datetime import timedelta
 
 from app.core.database import get_db
-from app.models.models import User
 from app.schemas.schemas import UserCreate, UserResponse, UserLogin
-from app.core.auth import authenticate_user, create_access_token, get_password_hash, get_current_user
+from app.core.auth import authenticate_user_async, create_access_token, get_password_hash, get_current_user
 from app.core.config import settings
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
@@ -20,7 +19,7 @@ async def authenticate(
     """
     Verify login details and issue JWT in an HttpOnly cookie.
     """
-    user = User.authenticate(db, username=user_login.username, password=user_login.password)
+    user = await authenticate_user_async(db, username=user_login.username, password=user_login.password)
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect username or password")
     if not user.is_active:
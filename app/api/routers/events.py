@@ -0,0 +1,95 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_active_user
+from app.core.database import get_db
+from app.core.events import EVENTS_CHANNEL, get_event_backend
+from app.models.models import User
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+HEARTBEAT_SECONDS = 15
+EVENT_QUEUE_SIZE = 100
+RESYNC_EVENT = {"id": None, "type": "resync", "data": {}, "tournament_id": None}
+
+
+def _is_relevant(event: Dict[str, Any], user_id: int, tournament_id: Optional[int], types: Optional[Set[str]]) -> bool:
+    """Decide whether an event belongs on this client's stream"""
+    if event.get("user_ids") is not None and user_id not in event["user_ids"]:
+        return False
+    if tournament_id is not None and event.get("tournament_id") not in (None, tournament_id):
+        return False
+    if types is not None and event.get("type") not in types:
+        return False
+    return True
+
+
+def _enqueue(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+    """Queue an event; a client that falls too far behind is told to refetch instead"""
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC_EVENT)
+
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    data = json.dumps({"tournament_id": event.get("tournament_id"), **event["data"]}, default=str)
+    lines = [f"event: {event['type']}", f"data: {data}"]
+    if event.get("id"):
+        lines.insert(0, f"id: {event['id']}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _event_stream(request: Request, queue: asyncio.Queue, unsubscribe: Callable[[], None]) -> AsyncIterator[str]:
+    try:
+        # Ask EventSource clients to reconnect after 5s if the connection drops
+        yield "retry: 5000\n\n"
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            yield _format_sse(event)
+    finally:
+        unsubscribe()
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    tournament_id: Optional[int] = Query(None, description="Only include events for this tournament (plus global events)"),
+    types: Optional[str] = Query(None, description="Comma-separated event types, e.g. match.verified,standings.changed"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Server-sent events stream of live updates for the current user"""
+    user_id = current_user.id
+    type_filter = {t.strip() for t in types.split(",") if t.strip()} if types else None
+
+    # The stream can stay open for hours; give the pooled connection back right away
+    db.close()
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+
+    def on_event(event: Dict[str, Any]) -> None:
+        # Called from whichever thread published the event
+        if _is_relevant(event, user_id, tournament_id, type_filter):
+            loop.call_soon_threadsafe(_enqueue, queue, event)
+
+    unsubscribe = get_event_backend().subscribe(EVENTS_CHANNEL, on_event)
+
+    return StreamingResponse(
+        _event_stream(request, queue, unsubscribe),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,25 +1,54 @@
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query as OrmQuery, Session, selectinload
 from typing import Optional
 
 from app.core.auth import get_current_active_user
 from app.core.database import get_db
 from app.core.authorize import authorize
+from app.core.conditional import collection_etag
+from app.core.fields import FIELDS_DESCRIPTION, Computed, load_fields, parse_fields, render_fields
 from app.models.models import Match, User
-from app.schemas.schemas import MatchCreate, MatchResponse, MatchVerification
+from app.schemas.schemas import (
+    MatchCreate, MatchesResponse, MatchResponse, MatchSummary, MatchVerification, UserResponse, UserSuggestion
+)
 from app.common.enums import MatchStatus, MatchType
+from app.core.events import EventTypes, publish_event
+from app.services.idempotency_service import (
+    IDEMPOTENCY_HEADER,
+    hash_request,
+    validate_idempotency_key,
+    get_idempotent_response,
+    save_idempotent_response
+)
 
 router = APIRouter(prefix="/matches", tags=["matches"])
 
-@router.post("", response_model=MatchResponse)
-def create_match(
-    match: MatchCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    authorize(current_user, db, ["matches_can_create"])
+# Match columns holding a user id, for the users lookup of the normalized list
+USER_ID_FIELDS = (
+    "player1_id", "player2_id", "submitted_by_id", "verified_by_id", "player1_verified_by_id", "player2_verified_by_id",
+)
+
+def _nested_user(relationship: str) -> Computed:
+    """A nested user field of the match list, loaded with its medals in one query"""
+    def value(match: Match):
+        user = getattr(match, relationship)
+        if user is None:
+            return None
+        return {**{name: getattr(user, name, None) for name in UserResponse.model_fields}, "medals": user.get_medal_counts()}
+    return Computed(
+        value,
+        columns=(f"{relationship}_id",),
+        options=(selectinload(getattr(Match, relationship)).selectinload(User.medals),),
+    )
+
+NESTED_USERS = {name: _nested_user(name) for name in ("player1", "player2", "submitted_by")}
+
+def _validate_match(db: Session, match: MatchCreate) -> None:
+    """Check that the players (and tournament, if any) allow this match to be recorded"""
     # Verify both players exist
     player1 = db.query(User).filter(User.id == match.player1_id).first()
     player2 = db.query(User).filter(User.id == match.player2_id).first()
@@ -62,14 +91,14 @@ def create_match(
         if not player2_participant:
             raise HTTPException(status_code=400, detail=f"Player {player2.full_name} is not a participant in this tournament")
 
-    # Create match
+def _add_match(db: Session, match: MatchCreate, submitted_by_id: int) -> Match:
+    """Add a match to the session (flushed, not committed) with submitter auto-verification"""
     db_match = Match(
         **match.dict(),
-        submitted_by_id=current_user.id
+        submitted_by_id=submitted_by_id
     )
     db.add(db_match)
-    db.commit()
-    db.refresh(db_match)
+    db.flush()
     
     # Auto-verify for the submitter if they are one of the players
     if db_match.submitted_by_id == db_match.player1_id:
@@ -85,20 +114,106 @@ def create_match(
         db_match.verified_at = func.now()
         db_match.verified_by_id = db_match.submitted_by_id
     
-    db.commit()
+    db.flush()
     db.refresh(db_match)
     return db_match
 
-@router.get("", response_model=list[MatchResponse])
-def read_matches(
-    skip: int = 0,
-    limit: int = 500,
-    match_type: Optional[str] = Query(None, description="Filter by match type: casual or tournament"),
-    status: Optional[str] = Query(None, description="Filter by status: pending_verification, verified, or rejected"),
+def _commit_idempotent(db: Session, user_id: int, scope: str, key: Optional[str], request_hash: str, response_body):
+    """Commit the pending write together with its idempotency record; replay the winner on a concurrent retry"""
+    if key:
+        save_idempotent_response(db, user_id, scope, key, request_hash, response_body)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        replay = get_idempotent_response(db, user_id, scope, key, request_hash) if key else None
+        if replay is None:
+            raise
+        return replay
+    return None
+
+def _publish_match_event(db_match: Match) -> None:
+    """Notify connected clients about a new or newly verified match"""
+    data = {"match_id": db_match.id, "status": db_match.status.value}
+    if db_match.status == MatchStatus.VERIFIED:
+        publish_event(EventTypes.MATCH_VERIFIED, data, tournament_id=db_match.tournament_id)
+        if db_match.tournament_id:
+            publish_event(EventTypes.STANDINGS_CHANGED, {}, tournament_id=db_match.tournament_id)
+    else:
+        # Only the players have something to verify
+        publish_event(
+            EventTypes.MATCH_CREATED, data,
+            user_ids=[db_match.player1_id, db_match.player2_id],
+            tournament_id=db_match.tournament_id
+        )
+
+@router.post("", response_model=MatchResponse)
+def create_match(
+    match: MatchCreate,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    authorize(current_user, db, ["matches_can_view_all"])
+    authorize(current_user, db, ["matches_can_create"])
+
+    # Retries with the same key return the original result without re-validating or inserting
+    request_hash = hash_request(match)
+    if idempotency_key:
+        validate_idempotency_key(idempotency_key)
+        replay = get_idempotent_response(db, current_user.id, "POST /matches", idempotency_key, request_hash)
+        if replay:
+            return replay
+
+    _validate_match(db, match)
+
+    # Create match
+    db_match = _add_match(db, match, current_user.id)
+    replay = _commit_idempotent(
+        db, current_user.id, "POST /matches", idempotency_key, request_hash,
+        MatchResponse.model_validate(db_match, from_attributes=True)
+    )
+    if replay:
+        return replay
+
+    db.refresh(db_match)
+    _publish_match_event(db_match)
+    return db_match
+
+@router.post("/bulk", response_model=list[MatchResponse])
+def create_matches_bulk(
+    matches: list[MatchCreate],
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Import several matches in one transaction (all or nothing)"""
+    authorize(current_user, db, ["matches_can_create"])
+
+    request_hash = hash_request(matches)
+    if idempotency_key:
+        validate_idempotency_key(idempotency_key)
+        replay = get_idempotent_response(db, current_user.id, "POST /matches/bulk", idempotency_key, request_hash)
+        if replay:
+            return replay
+
+    for match in matches:
+        _validate_match(db, match)
+
+    db_matches = [_add_match(db, match, current_user.id) for match in matches]
+    replay = _commit_idempotent(
+        db, current_user.id, "POST /matches/bulk", idempotency_key, request_hash,
+        [MatchResponse.model_validate(db_match, from_attributes=True) for db_match in db_matches]
+    )
+    if replay:
+        return replay
+
+    for db_match in db_matches:
+        db.refresh(db_match)
+        _publish_match_event(db_match)
+    return db_matches
+
+def _filtered_matches(db: Session, match_type: Optional[str], status: Optional[str]) -> OrmQuery:
+    """Matches newest first, narrowed by the optional match_type and status filters"""
     query = db.query(Match)
 
     # Only filter if match_type is provided and not empty
@@ -119,10 +234,71 @@ def read_matches(
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}. Valid values: pending_verification, verified, rejected")
 
-    matches = query.order_by(Match.match_date.desc()).offset(skip).limit(limit).all()
-    return matches
+    return query.order_by(Match.match_date.desc())
+
+@router.get("", response_model=list[MatchResponse], dependencies=[Depends(collection_etag("matches", "users"))])
+def read_matches(
+    skip: int = 0,
+    limit: int = 500,
+    match_type: Optional[str] = Query(None, description="Filter by match type: casual or tournament"),
+    status: Optional[str] = Query(None, description="Filter by status: pending_verification, verified, or rejected"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    authorize(current_user, db, ["matches_can_view_all"])
+    names = parse_fields(fields, MatchResponse.model_fields)
+    if names is not None:
+        matches = _filtered_matches(db, match_type, status).options(
+            *load_fields(Match, names, NESTED_USERS)
+        ).offset(skip).limit(limit).all()
+        return ORJSONResponse(render_fields(matches, names, NESTED_USERS))
+
+    # Nested users (and their medals) in one query each instead of one per user
+    return _filtered_matches(db, match_type, status).options(
+        *(option for user in NESTED_USERS.values() for option in user.options)
+    ).offset(skip).limit(limit).all()
+
+@router.get("/normalized", response_model=MatchesResponse, dependencies=[Depends(collection_etag("matches", "users"))])
+def read_matches_normalized(
+    skip: int = 0,
+    limit: int = 500,
+    match_type: Optional[str] = Query(None, description="Filter by match type: casual or tournament"),
+    status: Optional[str] = Query(None, description="Filter by status: pending_verification, verified, or rejected"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Matches referencing users by id, with each user listed once in a separate lookup"""
+    authorize(current_user, db, ["matches_can_view_all"])
+    names = parse_fields(fields, MatchSummary.model_fields)
+    query = _filtered_matches(db, match_type, status)
+    if names is not None:
+        query = query.options(*load_fields(Match, names))
+    matches = query.offset(skip).limit(limit).all()
+
+    # Only users the returned fields refer to
+    id_fields = [name for name in USER_ID_FIELDS if names is None or name in names]
+    user_ids = {getattr(match, name) for match in matches for name in id_fields} - {None}
+    # Just the columns the lookup needs: no roles, medals or permissions
+    users = {
+        str(user.id): UserSuggestion.model_validate(user, from_attributes=True)
+        for user in db.query(User.id, User.username, User.full_name, User.profile_picture_url).filter(
+            User.id.in_(user_ids)
+        )
+    } if user_ids else {}
+
+    if names is not None:
+        return ORJSONResponse({
+            "matches": render_fields(matches, names),
+            "users": {user_id: user.model_dump() for user_id, user in users.items()},
+        })
+    return MatchesResponse(
+        matches=[MatchSummary.model_validate(match) for match in matches],
+        users=users,
+    )
 
-@router.get("/{match_id}", response_model=MatchResponse)
+@router.get("/{match_id}", response_model=MatchResponse, dependencies=[Depends(collection_etag("matches", "users", public=True))])
 def read_match(match_id: int, db: Session = Depends(get_db)):
     match = db.query(Match).filter(Match.id == match_id).first()
     if not match:
@@ -160,6 +336,8 @@ def verify_match(
 
     db.commit()
     db.refresh(match)
+    if match.status == MatchStatus.VERIFIED:
+        _publish_match_event(match)
     return match
 
 @router.get("/{match_id}/verification-status", response_model=dict)
@@ -5,13 +5,14 @@ from typing import List
 from app.core.auth import get_current_active_user
 from app.core.database import get_db
 from app.core.authorize import authorize
+from app.core.conditional import collection_etag
 from app.models.models import User
 from app.schemas.schemas import UserMedalCounts
 from app.services.medal_service import award_medals_for_tournament, get_user_medal_counts, get_tournament_medals
 
 router = APIRouter(prefix="/medals", tags=["medals"])
 
-@router.get("/user/{user_id}", response_model=UserMedalCounts)
+@router.get("/user/{user_id}", response_model=UserMedalCounts, dependencies=[Depends(collection_etag("users"))])
 def get_user_medals(
     user_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -21,7 +22,7 @@ def get_user_medals(
     authorize(current_user, db, ["users_can_view_user_list"])
     return get_user_medal_counts(db, user_id)
 
-@router.get("/me", response_model=UserMedalCounts)
+@router.get("/me", response_model=UserMedalCounts, dependencies=[Depends(collection_etag("users", per_user=True))])
 def get_my_medals(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -47,7 +48,7 @@ def award_tournament_medals(
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-@router.get("/tournament/{tournament_id}")
+@router.get("/tournament/{tournament_id}", dependencies=[Depends(collection_etag("users", "tournaments"))])
 def get_tournament_medals(
     tournament_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.file_responses import FileRangeResponse, conditional_range
+from app.core.media import (
+    CHUNK_SIZE, IMMUTABLE_CACHE_CONTROL, KEY_PATTERN, LocalMediaStore, content_type, etag, get_media_store, is_inline,
+)
+
+router = APIRouter(prefix="/media", tags=["media"])
+
+
+@router.head("/{key}", include_in_schema=False)
+@router.get(
+    "/{key}",
+    name="Get media",
+    description=(
+        "Serve a stored upload by its content key. Keys never change content, so responses are cacheable forever. "
+        "Supports Range requests (seeking in video and audio), If-Range, If-None-Match and If-Modified-Since."
+    ),
+)
+def get_media(key: str, request: Request):
+    if not KEY_PATTERN.match(key):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media not found")
+    store = get_media_store()
+    info = store.stat(key)
+    if info is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media not found")
+
+    # Browsers must not sniff blobs into HTML, and anything but media is a download
+    base_headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "X-Content-Type-Options": "nosniff"}
+    if not is_inline(key):
+        base_headers["Content-Disposition"] = "attachment"
+    status_code, headers, start, end = conditional_range(request, info.size, etag(key), info.modified, base_headers)
+    if status_code in (status.HTTP_304_NOT_MODIFIED, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE):
+        return Response(status_code=status_code, headers=headers)
+
+    path = store.local_path(key)
+    if path is not None and settings.media_accel_redirect and isinstance(store, LocalMediaStore):
+        # nginx sends the file itself (sendfile), ranges included
+        headers = {name: value for name, value in headers.items() if name not in ("Content-Length", "Content-Range")}
+        location = settings.media_accel_redirect.rstrip("/") + "/" + path.relative_to(store.root).as_posix()
+        return Response(headers={**headers, "X-Accel-Redirect": location}, media_type=content_type(key))
+    if path is not None:
+        return FileRangeResponse(path, start, end, status_code, headers, content_type(key))
+    if request.method == "HEAD" or end < start:
+        return Response(status_code=status_code, headers=headers, media_type=content_type(key))
+
+    body = store.open_range(key, start, end)
+
+    def chunks():
+        remaining = end - start + 1
+        try:
+            while remaining > 0 and (chunk := body.read(min(CHUNK_SIZE, remaining))):
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            body.close()
+
+    return StreamingResponse(chunks(), status_code=status_code, media_type=content_type(key), headers=headers)
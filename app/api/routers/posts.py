@@ -1,16 +1,22 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Request, status, Query, UploadFile
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.conditional import collection_etag
+from app.core.fields import FIELDS_DESCRIPTION, parse_fields
+from app.core.media import upload_chunks
 from app.models.models import User
 from app.schemas.schemas import (
     PostCreate, PostUpdate, PostResponse, PostsResponse,
     CommentCreate, CommentUpdate, CommentResponse,
     AttachmentCreate, AttachmentResponse,
+    UploadSessionCreate, UploadSessionResponse, UploadComplete,
     PostReactionCreate, CommentReactionCreate
 )
+from app.services import attachment_service
 from app.services.post_service import PostService
 
 router = APIRouter(prefix="/posts", tags=["posts"])
@@ -27,20 +33,23 @@ def create_post(
     return post_service.create_post(post_data, current_user.id)
 
 
-@router.get("/", response_model=List[PostResponse])
+@router.get("/", response_model=List[PostResponse], dependencies=[Depends(collection_etag("posts", "users"))])
 def get_posts(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     user_id: Optional[int] = Query(None),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get posts with pagination, optionally filtered by user"""
     post_service = PostService(db)
-    return post_service.get_posts(skip=skip, limit=limit, user_id=user_id)
+    names = parse_fields(fields, PostResponse.model_fields)
+    posts = post_service.get_posts(skip=skip, limit=limit, user_id=user_id, fields=names)
+    return posts if names is None else ORJSONResponse(posts)
 
 
-@router.get("/normalized", response_model=PostsResponse)
+@router.get("/normalized", response_model=PostsResponse, dependencies=[Depends(collection_etag("posts", "users"))])
 def get_posts_normalized(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
@@ -54,7 +63,7 @@ def get_posts_normalized(
     return PostsResponse(**result)
 
 
-@router.get("/{post_id}", response_model=PostResponse)
+@router.get("/{post_id}", response_model=PostResponse, dependencies=[Depends(collection_etag("posts", "users"))])
 def get_post(
     post_id: int,
     current_user: User = Depends(get_current_user),
@@ -122,6 +131,86 @@ def add_attachment_to_post(
         )
     return attachment
 
+@router.post("/{post_id}/attachments/upload", response_model=AttachmentResponse, status_code=status.HTTP_201_CREATED)
+async def upload_post_attachment(
+    post_id: int,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Upload a file and attach it to a post; metadata and renditions follow in the background"""
+    attachment = await attachment_service.upload_attachment(
+        db, current_user.id, upload_chunks(file), file.filename or "upload", file.content_type, post_id=post_id
+    )
+    return AttachmentResponse.from_orm(attachment)
+
+
+@router.post("/comments/{comment_id}/attachments/upload", response_model=AttachmentResponse, status_code=status.HTTP_201_CREATED)
+async def upload_comment_attachment(
+    comment_id: int,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Upload a file and attach it to a comment; metadata and renditions follow in the background"""
+    attachment = await attachment_service.upload_attachment(
+        db, current_user.id, upload_chunks(file), file.filename or "upload", file.content_type, comment_id=comment_id
+    )
+    return AttachmentResponse.from_orm(attachment)
+
+
+@router.post("/uploads", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+def start_upload(
+    upload_data: UploadSessionCreate,
+    current_user: User = Depends(get_current_user)
+):
+    """Open a resumable upload; send the bytes with PATCH /posts/uploads/{upload_id}"""
+    return attachment_service.start_upload(current_user.id, upload_data.file_name, upload_data.mime_type, upload_data.size)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadSessionResponse)
+def get_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Get a resumable upload's offset, where an interrupted upload continues"""
+    return attachment_service.get_upload(upload_id, current_user.id)
+
+
+@router.patch("/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def append_upload(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., ge=0),
+    current_user: User = Depends(get_current_user)
+):
+    """Append the raw request body to a resumable upload at Upload-Offset"""
+    return await attachment_service.append_upload(upload_id, current_user.id, upload_offset, request.stream())
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=AttachmentResponse, status_code=status.HTTP_201_CREATED)
+async def complete_upload(
+    upload_id: str,
+    target: UploadComplete,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Attach a fully received upload to a post or a comment"""
+    attachment = await attachment_service.complete_upload(
+        db, upload_id, current_user.id, post_id=target.post_id, comment_id=target.comment_id
+    )
+    return AttachmentResponse.from_orm(attachment)
+
+
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Abandon a resumable upload"""
+    attachment_service.cancel_upload(upload_id, current_user.id)
+
+
 @router.delete("/attachments/{attachment_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_attachment(
     attachment_id: int,
@@ -191,7 +280,7 @@ def create_comment(
     return comment
 
 
-@router.get("/{post_id}/comments", response_model=List[CommentResponse])
+@router.get("/{post_id}/comments", response_model=List[CommentResponse], dependencies=[Depends(collection_etag("posts", "users"))])
 def get_comments(
     post_id: int,
     skip: int = Query(0, ge=0),
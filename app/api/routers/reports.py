@@ -1,10 +1,14 @@
+from collections import Counter
+
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
 
 from app.core.auth import get_current_active_user
+from app.core.conditional import collection_etag
 from app.core.database import get_db
+from app.core.fields import FIELDS_DESCRIPTION, Computed, load_fields, parse_fields, render_fields
 from app.models.models import User
 from app.schemas.schemas import (
     ReportCreate, 
@@ -23,6 +27,9 @@ from app.services.report_service import (
     remove_reaction,
     get_reaction_counts
 )
+from app.services.report_search import search_reports
+from app.common.enums import SearchMode
+from app.core.events import EventTypes, publish_event
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
@@ -63,6 +70,8 @@ def create_report_simple(
     db.commit()  # Single commit for both operations
     db.refresh(report)
     
+    publish_event(EventTypes.REPORT_CREATED, {"report_id": report.id, "created_by_id": report.created_by_id})
+    
     return {
         "id": report.id,
         "message": "Report created successfully",
@@ -116,6 +125,8 @@ def create_new_report(
         db.rollback()
         pass
     
+    publish_event(EventTypes.REPORT_CREATED, {"report_id": report.id, "created_by_id": report.created_by_id})
+    
     return {
         "id": report.id,
         "created_by_id": report.created_by_id,
@@ -127,105 +138,119 @@ def create_new_report(
     }
 
 
-@router.get("/")
+REPORT_LIST_FIELDS = (
+    "id", "created_by_id", "event_date", "content", "created_at", "updated_at",
+    "has_seen", "created_by", "reactions", "reaction_counts",
+)
+
+
+def _report_user(user: Optional[User]) -> Optional[dict]:
+    """The author or reacting user as the report list shows them"""
+    if user is None:
+        return None
+    return {"id": user.id, "username": user.username, "full_name": user.full_name, "email": user.email}
+
+
+@router.get("/", dependencies=[Depends(collection_etag("reports", "users", per_user=True))])
 def get_reports_list(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),  # Reduced default limit for better UX
     event_date_from: Optional[date] = Query(None),
     event_date_to: Optional[date] = Query(None),
     search_text: Optional[str] = Query(None),
+    search_mode: SearchMode = Query(SearchMode.FULLTEXT),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get reports with filtering and pagination"""
-    from app.models.reports import Report
-    from app.models.models import User
+    """Get reports with filtering and pagination; text searches return the best matches first"""
+    from app.models.reports import Report, ReportReaction
+    from app.models.report_views import ReportView
     from sqlalchemy.orm import joinedload
-    from sqlalchemy import and_, or_, desc
-    
-    # Build the query with proper filtering and sorting
-    query = db.query(Report).options(
-        joinedload(Report.created_by)
-    )
-    
-    # Apply filters
-    if search_text:
-        query = query.filter(Report.content.ilike(f"%{search_text}%"))
-    if event_date_from:
-        query = query.filter(Report.event_date >= event_date_from)
-    if event_date_to:
-        query = query.filter(Report.event_date <= event_date_to)
-    
-    # Sort by created_at descending (newest first)
-    query = query.order_by(desc(Report.created_at))
-    
-    # Apply pagination
-    reports = query.offset(skip).limit(limit).all()
-    
-    # Convert to response format
-    result = []
-    for report in reports:
-        # Get reactions for this report with user relationships
-        from app.models.reports import ReportReaction
-        reactions = db.query(ReportReaction).options(
-            joinedload(ReportReaction.user)
-        ).filter(ReportReaction.report_id == report.id).all()
-        
-        # Calculate reaction counts
-        reaction_counts = {}
-        for reaction in reactions:
-            reaction_counts[reaction.emoji] = reaction_counts.get(reaction.emoji, 0) + 1
-        
-        # Check if current user has seen this report
-        from app.models.report_views import ReportView
-        has_seen = db.query(ReportView).filter(
-            ReportView.report_id == report.id,
+    from sqlalchemy import desc
+
+    names = parse_fields(fields, REPORT_LIST_FIELDS) or list(REPORT_LIST_FIELDS)
+    # Reactions and views of the whole page, filled in once the page is known
+    reactions_by_report = {}
+    seen_report_ids = set()
+    computed = {
+        "event_date": Computed(lambda report: report.event_date.isoformat(), columns=("event_date",)),
+        "created_at": Computed(lambda report: report.created_at.isoformat(), columns=("created_at",)),
+        "updated_at": Computed(lambda report: report.updated_at.isoformat(), columns=("updated_at",)),
+        "has_seen": Computed(lambda report: report.id in seen_report_ids),
+        "created_by": Computed(
+            lambda report: _report_user(report.created_by),
+            columns=("created_by_id",),
+            options=(joinedload(Report.created_by),),
+        ),
+        "reactions": Computed(lambda report: [
+            {
+                "id": reaction.id,
+                "user_id": reaction.user_id,
+                "emoji": reaction.emoji,
+                "created_at": reaction.created_at.isoformat(),
+                "user": _report_user(reaction.user),
+            } for reaction in reactions_by_report.get(report.id, [])
+        ]),
+        "reaction_counts": Computed(
+            lambda report: dict(Counter(reaction.emoji for reaction in reactions_by_report.get(report.id, [])))
+        ),
+    }
+    options = load_fields(Report, names, computed)
+
+    search_text = search_text.strip() if search_text else None
+    if search_text and search_mode == SearchMode.FULLTEXT:
+        report_ids, total = search_reports(db, search_text, event_date_from, event_date_to, skip, limit)
+        by_id = {
+            report.id: report
+            for report in db.query(Report).options(*options).filter(Report.id.in_(report_ids))
+        }
+        reports = [by_id[report_id] for report_id in report_ids if report_id in by_id]
+    else:
+        # Build the query with proper filtering and sorting
+        query = db.query(Report)
+
+        # Apply filters
+        if search_text:
+            query = query.filter(Report.content.ilike(f"%{search_text}%"))
+        if event_date_from:
+            query = query.filter(Report.event_date >= event_date_from)
+        if event_date_to:
+            query = query.filter(Report.event_date <= event_date_to)
+
+        total = query.count()
+
+        # Sort by created_at descending (newest first)
+        query = query.options(*options).order_by(desc(Report.created_at))
+
+        # Apply pagination
+        reports = query.offset(skip).limit(limit).all()
+
+    # One query each for the page's reactions and the current user's views, only when asked for
+    page_ids = [report.id for report in reports]
+    if page_ids and ("reactions" in names or "reaction_counts" in names):
+        for reaction in db.query(ReportReaction).options(joinedload(ReportReaction.user)).filter(
+            ReportReaction.report_id.in_(page_ids)
+        ).order_by(ReportReaction.id):
+            reactions_by_report.setdefault(reaction.report_id, []).append(reaction)
+    if page_ids and "has_seen" in names:
+        seen_report_ids.update(report_id for (report_id,) in db.query(ReportView.report_id).filter(
+            ReportView.report_id.in_(page_ids),
             ReportView.user_id == current_user.id
-        ).first() is not None
-        
-        result.append({
-            "id": report.id,
-            "created_by_id": report.created_by_id,
-            "event_date": report.event_date.isoformat(),
-            "content": report.content,
-            "created_at": report.created_at.isoformat(),
-            "updated_at": report.updated_at.isoformat(),
-            "has_seen": has_seen,
-            "created_by": {
-                "id": report.created_by.id,
-                "username": report.created_by.username,
-                "full_name": report.created_by.full_name,
-                "email": report.created_by.email
-            } if report.created_by else None,
-            "reactions": [
-                {
-                    "id": reaction.id,
-                    "user_id": reaction.user_id,
-                    "emoji": reaction.emoji,
-                    "created_at": reaction.created_at.isoformat(),
-                    "user": {
-                        "id": reaction.user.id,
-                        "username": reaction.user.username,
-                        "full_name": reaction.user.full_name,
-                        "email": reaction.user.email
-                    } if reaction.user else None
-                } for reaction in reactions
-            ],
-            "reaction_counts": reaction_counts
-        })
-    
+        ))
+
     return {
-        "reports": result,
+        "reports": render_fields(reports, names, computed),
         "pagination": {
             "skip": skip,
             "limit": limit,
-            "total": query.count(),  # Total count for pagination
-            "has_more": skip + limit < query.count()
+            "total": total,  # Total count for pagination
+            "has_more": skip + limit < total
         }
     }
 
 
-@router.get("/unseen-count")
+@router.get("/unseen-count", dependencies=[Depends(collection_etag("reports", per_user=True))])
 def get_unseen_reports_count(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -233,7 +258,6 @@ def get_unseen_reports_count(
     """Get count of unseen reports for current user"""
     from app.models.reports import Report
     from app.models.report_views import ReportView
-    from sqlalchemy import and_
     
     # Count total reports
     total_reports = db.query(Report).count()
@@ -252,7 +276,7 @@ def get_unseen_reports_count(
     }
 
 
-@router.get("/{report_id}")
+@router.get("/{report_id}", dependencies=[Depends(collection_etag("reports", "users", per_user=True))])
 def get_report(
     report_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.core.auth import get_current_active_user
+from app.core.authorize import authorize
+from app.core.database import get_db
+from app.models.models import User
+from app.schemas.schemas import SearchResponse
+from app.services.search_service import SEARCH_TYPES, search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+USER_LIST_PERMISSION = "users_can_view_user_list"
+
+
+@router.get("", response_model=SearchResponse)
+def search_everything(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = Query(None, description="Comma-separated: post, comment, report, user, tournament"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=50),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Search posts, comments, reports, users and tournaments by word prefixes, best matches first"""
+    if types:
+        requested = [kind.strip() for kind in types.split(",") if kind.strip()]
+        unknown = [kind for kind in requested if kind not in SEARCH_TYPES]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown search types: {', '.join(unknown)}"
+            )
+        if "user" in requested:
+            authorize(current_user, db, [USER_LIST_PERMISSION])
+    else:
+        # Users are only listed to those who may see the user list
+        requested = [
+            kind for kind in SEARCH_TYPES
+            if kind != "user" or USER_LIST_PERMISSION in current_user.get_permissions(db)
+        ]
+
+    return search(db, q, requested, skip, limit)
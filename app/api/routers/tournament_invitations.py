@@ -5,15 +5,23 @@ from typing import List
 from app.core.auth import get_current_active_user
 from app.core.database import get_db
 from app.core.authorize import authorize
-from app.models.models import User, Tournament
+from app.core.conditional import collection_etag
+from app.core.events import EventTypes, publish_event
+from app.common.enums import InvitationStatus
+from app.models.models import User
 from app.schemas.schemas import (
+    BulkInvitationCreate,
+    BulkInvitationResponse,
+    InvitationInboxItem,
     TournamentInvitationCreate, 
     TournamentInvitationResponse, 
     TournamentInvitationUpdate,
     TournamentParticipantResponse
 )
 from app.services.tournament_invitation_service import (
+    INVITED,
     create_tournament_invitation,
+    create_tournament_invitations_bulk,
     respond_to_invitation,
     get_tournament_invitations,
     get_user_invitations,
@@ -41,8 +49,44 @@ def invite_user_to_tournament(
         invited_by=current_user.id
     )
     
+    if invitation.status == InvitationStatus.PENDING.value:
+        publish_event(
+            EventTypes.INVITATION_CREATED,
+            {"invitation_id": invitation.id, "tournament_id": tournament_id},
+            user_ids=[user_id],
+            tournament_id=tournament_id
+        )
+    
     return invitation
 
+@router.post("/tournament/{tournament_id}/invite", response_model=BulkInvitationResponse)
+def invite_users_to_tournament(
+    tournament_id: int,
+    invitation_data: BulkInvitationCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Invite several users to a tournament at once (admin only)"""
+    authorize(current_user, db, ["tournaments_can_edit_all"])
+    
+    outcomes = create_tournament_invitations_bulk(
+        db=db,
+        tournament_id=tournament_id,
+        user_ids=invitation_data.user_ids,
+        invited_by=current_user.id
+    )
+    
+    invited = [outcome for outcome in outcomes if outcome["status"] == INVITED]
+    for outcome in invited:
+        publish_event(
+            EventTypes.INVITATION_CREATED,
+            {"invitation_id": outcome["invitation_id"], "tournament_id": tournament_id},
+            user_ids=[outcome["user_id"]],
+            tournament_id=tournament_id
+        )
+    
+    return {"tournament_id": tournament_id, "invited_count": len(invited), "outcomes": outcomes}
+
 @router.post("/{invitation_id}/respond", response_model=TournamentInvitationResponse)
 def respond_to_tournament_invitation(
     invitation_id: int,
@@ -58,9 +102,17 @@ def respond_to_tournament_invitation(
         response=response.status
     )
     
+    # A new participant shows up on the leaderboard
+    if invitation.status == InvitationStatus.ACCEPTED.value:
+        publish_event(EventTypes.STANDINGS_CHANGED, {}, tournament_id=invitation.tournament_id)
+    
     return invitation
 
-@router.get("/tournament/{tournament_id}", response_model=List[TournamentInvitationResponse])
+@router.get(
+    "/tournament/{tournament_id}",
+    response_model=List[TournamentInvitationResponse],
+    dependencies=[Depends(collection_etag("invitations", "tournaments", "users"))],
+)
 def get_tournament_invitations_list(
     tournament_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -72,54 +124,23 @@ def get_tournament_invitations_list(
     invitations = get_tournament_invitations(db=db, tournament_id=tournament_id)
     return invitations
 
-@router.get("/my-invitations")
+@router.get(
+    "/my-invitations",
+    response_model=List[InvitationInboxItem],
+    dependencies=[Depends(collection_etag("invitations", "tournaments", "users", per_user=True))],
+)
 def get_my_invitations(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get current user's tournament invitations"""
-    invitations = get_user_invitations(db=db, user_id=current_user.id)
-    
-    # Manually construct response with tournament data
-    result = []
-    for invitation in invitations:
-        tournament = db.query(Tournament).filter(Tournament.id == invitation.tournament_id).first()
-        
-        invitation_data = {
-            "id": invitation.id,
-            "tournament_id": invitation.tournament_id,
-            "user_id": invitation.user_id,
-            "invited_by": invitation.invited_by,
-            "status": invitation.status,
-            "invited_at": invitation.invited_at,
-            "responded_at": invitation.responded_at,
-            "expires_at": invitation.expires_at,
-            "tournament": {
-                "id": tournament.id,
-                "name": tournament.name,
-                "description": tournament.description,
-                "is_active": tournament.is_active,
-                "status": tournament.status,
-                "created_at": tournament.created_at
-            } if tournament else None,
-            "user": {
-                "id": invitation.user.id,
-                "username": invitation.user.username,
-                "full_name": invitation.user.full_name,
-                "email": invitation.user.email
-            } if invitation.user else None,
-            "inviter": {
-                "id": invitation.inviter.id,
-                "username": invitation.inviter.username,
-                "full_name": invitation.inviter.full_name,
-                "email": invitation.inviter.email
-            } if invitation.inviter else None
-        }
-        result.append(invitation_data)
-    
-    return result
+    return get_user_invitations(db=db, user_id=current_user.id)
 
-@router.get("/tournament/{tournament_id}/participants", response_model=List[TournamentParticipantResponse])
+@router.get(
+    "/tournament/{tournament_id}/participants",
+    response_model=List[TournamentParticipantResponse],
+    dependencies=[Depends(collection_etag("tournaments", "users"))],
+)
 def get_tournament_participants_list(
     tournament_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -1,18 +1,42 @@
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, case
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from app.core.auth import get_current_active_user
 from app.core.database import get_db
 from app.core.authorize import authorize
+from app.core.conditional import collection_etag
+from app.core.fields import FIELDS_DESCRIPTION, Computed, load_fields, parse_fields, render_fields
 from app.models.models import Tournament, User, Match
 from app.schemas.schemas import TournamentCreate, TournamentResponse
 from app.common.enums import MatchStatus, TournamentStatus
+from app.services.tournament_invitation_service import get_tournament_counts
 
 router = APIRouter(prefix="/tournaments", tags=["tournaments"])
 
+def _with_counts(db: Session, tournaments: List[Tournament]) -> List[TournamentResponse]:
+    """Tournament responses with participant and invitation counts, in one extra query"""
+    counts = get_tournament_counts(db, [tournament.id for tournament in tournaments])
+    return [
+        TournamentResponse.model_validate(tournament).model_copy(update=counts.get(tournament.id, {}))
+        for tournament in tournaments
+    ]
+
+def _sparse_tournaments(db: Session, query, names: List[str]) -> ORJSONResponse:
+    """Just the requested fields of a page of tournaments; counted only when counts are asked for"""
+    counts: Dict[int, Dict[str, int]] = {}
+    computed = {
+        name: Computed(lambda tournament, name=name: counts.get(tournament.id, {}).get(name, 0))
+        for name in ("participant_count", "invitation_count")
+    }
+    tournaments = query.options(*load_fields(Tournament, names, computed)).all()
+    if set(computed) & set(names):
+        counts.update(get_tournament_counts(db, [tournament.id for tournament in tournaments]))
+    return ORJSONResponse(render_fields(tournaments, names, computed))
+
 @router.post("", response_model=TournamentResponse)
 def create_tournament(
     tournament: TournamentCreate,
@@ -25,38 +49,48 @@ def create_tournament(
     db.add(db_tournament)
     db.commit()
     db.refresh(db_tournament)
-    return db_tournament
+    return TournamentResponse.model_validate(db_tournament).model_copy(
+        update={"participant_count": 0, "invitation_count": 0}
+    )
 
-@router.get("", response_model=list[TournamentResponse])
+@router.get("", response_model=list[TournamentResponse], dependencies=[Depends(collection_etag("tournaments", "invitations", public=True))])
 def read_tournaments(
     skip: int = 0,
     limit: int = 100,
     active_only: bool = True,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
+    names = parse_fields(fields, TournamentResponse.model_fields)
     query = db.query(Tournament)
     if active_only:
         query = query.filter(Tournament.is_active.is_(True))
 
+    if names is not None:
+        return _sparse_tournaments(db, query.offset(skip).limit(limit), names)
     tournaments = query.offset(skip).limit(limit).all()
-    return tournaments
+    return _with_counts(db, tournaments)
 
-@router.get("/public", response_model=list[TournamentResponse])
+@router.get("/public", response_model=list[TournamentResponse], dependencies=[Depends(collection_etag("tournaments", "invitations", public=True))])
 def read_public_tournaments(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """Public endpoint to view all tournaments (active and completed)"""
+    names = parse_fields(fields, TournamentResponse.model_fields)
+    if names is not None:
+        return _sparse_tournaments(db, db.query(Tournament).offset(skip).limit(limit), names)
     tournaments = db.query(Tournament).offset(skip).limit(limit).all()
-    return tournaments
+    return _with_counts(db, tournaments)
 
-@router.get("/{tournament_id}", response_model=TournamentResponse)
+@router.get("/{tournament_id}", response_model=TournamentResponse, dependencies=[Depends(collection_etag("tournaments", "invitations", public=True))])
 def read_tournament(tournament_id: int, db: Session = Depends(get_db)):
     tournament = db.query(Tournament).filter(Tournament.id == tournament_id).first()
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
-    return tournament
+    return _with_counts(db, [tournament])[0]
 
 @router.put("/{tournament_id}", response_model=TournamentResponse)
 def update_tournament(
@@ -75,7 +109,7 @@ def update_tournament(
     
     db.commit()
     db.refresh(db_tournament)
-    return db_tournament
+    return _with_counts(db, [db_tournament])[0]
 
 @router.delete("/{tournament_id}")
 def delete_tournament(
@@ -107,7 +141,7 @@ def deactivate_tournament(
     db.commit()
     return {"message": "Tournament deactivated successfully"}
 
-@router.get("/{tournament_id}/stats")
+@router.get("/{tournament_id}/stats", dependencies=[Depends(collection_etag("tournaments", "matches", "users"))])
 def get_tournament_stats(
     tournament_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -202,7 +236,7 @@ def get_tournament_stats(
         "standings": sorted_players
     }
 
-@router.get("/{tournament_id}/leaderboard", response_model=dict)
+@router.get("/{tournament_id}/leaderboard", response_model=dict, dependencies=[Depends(collection_etag("tournaments", "matches", "users", public=True))])
 def get_tournament_leaderboard(
     tournament_id: int,
     db: Session = Depends(get_db)
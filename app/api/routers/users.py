@@ -1,21 +1,23 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, Query
 import logging
 from sqlalchemy.orm import Session
-from datetime import datetime
 from typing import Optional
-import os
-import uuid
 
 from app.core.auth import get_current_active_user
 from app.core.database import get_db
 from app.core.authorize import authorize
+from app.core.conditional import collection_etag
+from app.core.fields import FIELDS_DESCRIPTION, parse_fields
 from app.models.models import User
-from app.schemas.schemas import UserCreate, UserUpdate, UserResponse
+from app.schemas.schemas import UserCreate, UserUpdate, UserResponse, UserSuggestion
 from app.services.user_service import (
-    get_all_users, create_user, get_user_with_id, 
+    USER_LIST_FIELDS, get_all_users, create_user, get_user_with_id, 
     update_user_with_id, get_user_me, delete_user_with_id
 )
+from app.core.media import upload_chunks
+from app.services.profile_picture_service import MAX_PROFILE_PICTURE_BYTES, remove_profile_picture, store_profile_picture
+from app.services.user_autocomplete import DEFAULT_SUGGESTIONS, MAX_SUGGESTIONS, autocomplete_users
 
 router = APIRouter(prefix="/users", tags=["users"])
 logger = logging.getLogger("app.routers.users")
@@ -26,6 +28,7 @@ logger = logging.getLogger("app.routers.users")
     name="Get current user",
     description="Return the authenticated user's own profile.",
     response_model=UserResponse,
+    dependencies=[Depends(collection_etag("users", "roles", per_user=True))],
 )
 async def home(
     db: Session = Depends(get_db),
@@ -48,14 +51,17 @@ async def home(
     name="List users",
     description="Return a list of all users.",
     response_model=list[dict],
+    dependencies=[Depends(collection_etag("users", "roles"))],
 )
 def users_get(
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_active_user),
 ):
     authorize(user, db, ["users_can_view_user_list"])
+    names = parse_fields(fields, USER_LIST_FIELDS)
     try:
-        return get_all_users(db=db)
+        return get_all_users(db=db, fields=names)
     except Exception:
         logger.exception("Unexpected error in list users")
         raise HTTPException(
@@ -92,6 +98,22 @@ def users_post(
         )
 
 
+@router.get(
+    "/autocomplete",
+    name="Autocomplete users",
+    description="Return the active users whose username or a word of whose name starts with each typed word.",
+    response_model=list[UserSuggestion],
+)
+def users_autocomplete(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(DEFAULT_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_active_user),
+):
+    authorize(user, db, ["users_can_view_user_list"])
+    return autocomplete_users(db, q, limit)
+
+
 @router.get(
     "/{user_id}",
     name="Get user by ID",
@@ -205,7 +227,7 @@ def users_delete(
 @router.post(
     "/me/profile-picture",
     name="Upload profile picture",
-    description="Upload a profile picture for the current user.",
+    description="Upload a profile picture for the current user as multipart form data.",
 )
 async def upload_profile_picture(
     file: UploadFile = File(...),
@@ -220,45 +242,59 @@ async def upload_profile_picture(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="File must be an image"
             )
-        
-        # Validate file size (max 5MB)
-        file_content = await file.read()
-        if len(file_content) > 5 * 1024 * 1024:  # 5MB
+
+        profile_picture_url = await store_profile_picture(db, user, upload_chunks(file))
+        return {
+            "message": "Profile picture uploaded successfully",
+            "profile_picture_url": profile_picture_url
+        }
+
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Unexpected error in upload profile picture")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to upload profile picture at this time."
+        )
+
+
+@router.put(
+    "/me/profile-picture",
+    name="Stream profile picture",
+    description="Upload a profile picture as the raw request body (Content-Type: image/*), streamed to disk as it arrives.",
+)
+async def stream_profile_picture(
+    request: Request,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_active_user),
+):
+    """Upload a profile picture from the raw request body."""
+    try:
+        content_type = request.headers.get("content-type", "")
+        if not content_type.startswith("image/"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File must be an image"
+            )
+        # Refuse before reading anything when the client says up front it is too big
+        content_length = request.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > MAX_PROFILE_PICTURE_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                 detail="File size must be less than 5MB"
             )
-        
-        # Create uploads directory if it doesn't exist
-        upload_dir = "uploads/profile_pictures"
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Generate unique filename
-        file_extension = file.filename.split('.')[-1] if '.' in file.filename else 'jpg'
-        unique_filename = f"{user.id}_{uuid.uuid4().hex}.{file_extension}"
-        file_path = os.path.join(upload_dir, unique_filename)
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            buffer.write(file_content)
-        
-        # Update user profile picture URL
-        profile_picture_url = f"/uploads/profile_pictures/{unique_filename}"
-        user.profile_picture_url = profile_picture_url
-        user.profile_picture_updated_at = datetime.utcnow()
-        
-        db.commit()
-        db.refresh(user)
-        
+
+        profile_picture_url = await store_profile_picture(db, user, request.stream())
         return {
             "message": "Profile picture uploaded successfully",
             "profile_picture_url": profile_picture_url
         }
-        
+
     except HTTPException:
         raise
     except Exception:
-        logger.exception("Unexpected error in upload profile picture")
+        logger.exception("Unexpected error in stream profile picture")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Unable to upload profile picture at this time."
@@ -276,26 +312,9 @@ async def delete_profile_picture(
 ):
     """Delete the current user's profile picture."""
     try:
-        if not user.profile_picture_url:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No profile picture found"
-            )
-        
-        # Remove file from filesystem
-        file_path = user.profile_picture_url.lstrip('/')
-        if os.path.exists(file_path):
-            os.remove(file_path)
-        
-        # Update user record
-        user.profile_picture_url = None
-        user.profile_picture_updated_at = None
-        
-        db.commit()
-        db.refresh(user)
-        
+        await remove_profile_picture(db, user)
         return {"message": "Profile picture deleted successfully"}
-        
+
     except HTTPException:
         raise
     except Exception:
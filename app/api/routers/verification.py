@@ -5,6 +5,7 @@ from typing import List
 from app.core.auth import get_current_active_user
 from app.core.database import get_db
 from app.core.authorize import authorize
+from app.core.conditional import collection_etag
 from app.models.models import Match, User
 from app.schemas.schemas import MatchResponse
 from app.common.enums import MatchStatus
@@ -16,7 +17,11 @@ def test_endpoint():
     """Test endpoint to verify router is working"""
     return {"message": "verification router is working"}
 
-@router.get("/pending-verification", response_model=List[MatchResponse])
+@router.get(
+    "/pending-verification",
+    response_model=List[MatchResponse],
+    dependencies=[Depends(collection_etag("matches", "users", per_user=True))],
+)
 def get_pending_verifications(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
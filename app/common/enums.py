@@ -29,3 +29,12 @@ class AttachmentType(Enum):
     LINK = "link"
     GIF = "gif"
     AUDIO = "audio"
+
+class ProcessingStatus(Enum):
+    PENDING = "pending"  # Stored, metadata and renditions not produced yet
+    READY = "ready"
+    FAILED = "failed"
+
+class SearchMode(Enum):
+    FULLTEXT = "fulltext"    # Word-prefix search through the full-text indexes, ranked
+    SUBSTRING = "substring"  # Case-insensitive substring match (sequential scan)
@@ -1,24 +1,71 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Union, Optional
 
 from fastapi import Depends, HTTPException, status, Request
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.metrics import REGISTRY
 from app.models.models import User
 from app.schemas.schemas import TokenData
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], default="pbkdf2_sha256")
 ALGORITHM = "HS256"
 
+# passlib handlers and the jose crypto backends are slow to import, so they are
+# loaded on first use instead of at startup
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["pbkdf2_sha256"], default="pbkdf2_sha256")
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+# Password hashing is CPU-bound (hashlib releases the GIL while it runs). Async routes
+# hash in a dedicated pool so logins neither block the event loop nor take threads
+# from the pool that serves sync routes and holds database connections.
+_hashing_pool: Optional[ThreadPoolExecutor] = None
+_hashing_in_flight = 0
+_hashing_lock = threading.Lock()
+
+def _get_hashing_pool() -> ThreadPoolExecutor:
+    global _hashing_pool
+    with _hashing_lock:
+        if _hashing_pool is None:
+            from app.core.runtime import hashing_pool_size
+            _hashing_pool = ThreadPoolExecutor(max_workers=hashing_pool_size(), thread_name_prefix="password-hash")
+    return _hashing_pool
+
+async def _run_hashing(func, *args):
+    global _hashing_in_flight
+    pool = _get_hashing_pool()
+    with _hashing_lock:
+        _hashing_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    finally:
+        with _hashing_lock:
+            _hashing_in_flight -= 1
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password) -> str:
+    return await _run_hashing(get_password_hash, password)
+
+def _hashing_pool_samples() -> dict:
+    workers = _hashing_pool._max_workers if _hashing_pool else 0
+    return {("in_flight",): _hashing_in_flight, ("queued",): max(_hashing_in_flight - workers, 0), ("workers",): workers}
+
+REGISTRY.callback("password_hash_pool", "Password hashing pool: tasks in flight, queued and workers", _hashing_pool_samples, ("state",))
 
 def get_user(db: Session, username: str):
     return db.query(User).filter(User.username == username).first()
@@ -31,6 +78,17 @@ def authenticate_user(db: Session, username: str, password: str):
         return False
     return user
 
+async def authenticate_user_async(db: Session, username: str, password: str):
+    """authenticate_user for async routes: the lookup runs in the threadpool, the hash check in the hashing pool"""
+    from starlette.concurrency import run_in_threadpool
+
+    user = await run_in_threadpool(get_user, db, username)
+    if not user:
+        return False
+    if not await verify_password_async(password, user.hashed_password):
+        return False
+    return user
+
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
 ) -> str:
@@ -40,11 +98,15 @@ def create_access_token(
         expire = datetime.now(timezone.utc) + timedelta(
             minutes=settings.access_token_expire_minutes
         )
+    from jose import jwt
+
     to_encode = {"exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=ALGORITHM)
     return encoded_jwt
 
 async def get_current_user(request: Request, db: Session = Depends(get_db)):
+    from jose import JWTError, jwt
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -0,0 +1,165 @@
+"""
+Response compression.
+
+JSON lists (matches, the feed, reports) compress five to ten times, and deployments
+without nginx in front (Dockerfile.simple, Railway) would otherwise send them as they
+are. Brotli is used when the client accepts it and the brotli package is installed,
+gzip otherwise.
+
+Bodies under compression_minimum_size are left alone: below about a kilobyte the CPU
+and the Content-Encoding header cost more than the bytes saved. Only text-like types
+are compressed; media, partial content (206) and responses that already carry a
+Content-Encoding pass through. Compressed responses get Vary: Accept-Encoding, and a
+strong ETag becomes weak, since the compressed bytes are a different representation.
+"""
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip only without it
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/javascript", "application/xml", "application/problem+json",
+    "image/svg+xml", "text/",
+)
+# No point compressing an empty or partial body
+PASS_THROUGH_STATUSES = {204, 206, 304}
+
+
+def choose_encoding(accept_encoding: str, brotli_available: bool = brotli is not None) -> Optional[str]:
+    """"br", "gzip" or None for an Accept-Encoding header; q=0 refuses an encoding"""
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, parameters = item.strip().partition(";")
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            key, _, value = parameter.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip()] = quality
+    wildcard = accepted.get("*", 0.0)
+    if brotli_available and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def _compressible(headers: Headers) -> bool:
+    return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES) and "content-encoding" not in headers
+
+
+class _Compressor:
+    """Incremental gzip or brotli encoder"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        if encoding == "br":
+            self._encoder = brotli.Compressor(mode=brotli.MODE_TEXT, quality=brotli_quality)
+            self.compress, self.flush, self.finish = self._encoder.process, self._encoder.flush, self._encoder.finish
+        else:
+            # wbits 31: the gzip container rather than a raw zlib stream
+            self._encoder = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self.compress = self._encoder.compress
+            self.flush = lambda: self._encoder.flush(zlib.Z_SYNC_FLUSH)
+            self.finish = self._encoder.flush
+
+
+class CompressionMiddleware:
+    """Compress text responses of at least minimum_size bytes with brotli or gzip"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self, encoding, send))
+
+
+class _CompressingSend:
+    """The send callable for one response; decides on the first body message"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passing_through = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if self.passing_through or self.start is None:
+            await self.send(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not self._should_compress(message):
+                self.passing_through = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            headers = self._compressed_headers()
+            if not more_body:
+                compressed = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            await self.send(self.start)
+
+        if more_body:
+            # Flushed per chunk, so a streamed response keeps arriving as it is produced
+            await self.send({
+                "type": "http.response.body",
+                "body": self.compressor.compress(body) + self.compressor.flush(),
+                "more_body": True,
+            })
+        else:
+            await self.send({"type": "http.response.body", "body": self.compressor.compress(body) + self.compressor.finish()})
+
+    def _should_compress(self, message: Message) -> bool:
+        if message["type"] != "http.response.body" or self.start["status"] in PASS_THROUGH_STATUSES:
+            return False
+        if not _compressible(Headers(raw=self.start["headers"])):
+            return False
+        # A streamed body is compressed whatever its size; a single one only when large enough
+        return message.get("more_body", False) or len(message.get("body", b"")) >= self.middleware.minimum_size
+
+    def _compressed_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if "content-length" in headers:
+            del headers["content-length"]
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+        return headers
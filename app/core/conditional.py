@@ -0,0 +1,72 @@
+"""
+Conditional GETs for read endpoints.
+
+Most pull-to-refresh requests get back exactly what the screen already shows. A route
+that declares the collections it reads,
+
+    @router.get("/", dependencies=[Depends(collection_etag("reports", "users", per_user=True))])
+
+gets an ETag derived from their versions (app/core/versions.py), the path and query
+string, the user for per-user responses, and a fingerprint of the application code
+(a deploy that changes a response must not be answered with 304). A request whose
+If-None-Match matches is answered 304 by the dependency before the endpoint runs, so
+the endpoint's queries never execute; the check itself is one primary-key read.
+Otherwise ETagMiddleware (app/core/etag.py) adds the ETag to the endpoint's 200 response, with
+Cache-Control: private, no-cache so clients revalidate and shared caches keep out.
+
+Authentication still runs first; permission checks inside the endpoint do not, which
+only lets a client keep a copy it already had.
+"""
+import hashlib
+from typing import Callable, Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.core.database import get_db
+from app.core.etag import CACHE_CONTROL, code_fingerprint
+from app.core.file_responses import etag_matches
+from app.core.versions import get_versions
+from app.models.models import User
+
+
+def compute_etag(request: Request, db: Session, namespaces: tuple, user_id: Optional[int] = None) -> str:
+    """Strong ETag for this request given the current versions of namespaces"""
+    digest = hashlib.sha256(code_fingerprint().encode())
+    digest.update(request.url.path.encode())
+    digest.update(repr(sorted(request.query_params.multi_items())).encode())
+    digest.update(repr(sorted(get_versions(db, namespaces).items())).encode())
+    digest.update(repr(user_id).encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def _check(request: Request, db: Session, namespaces: tuple, user_id: Optional[int]) -> None:
+    etag = compute_etag(request, db, namespaces, user_id)
+    if etag_matches(request, etag):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+        )
+    request.state.etag = etag
+
+
+def collection_etag(*namespaces: str, per_user: bool = False, public: bool = False) -> Callable:
+    """Dependency answering 304 while none of namespaces changed since the client's copy
+
+    per_user: the response differs between users (has_seen, "my" lists).
+    public: the route does not authenticate, so neither does the check.
+    """
+    if public:
+        def check_public(request: Request, db: Session = Depends(get_db)) -> None:
+            _check(request, db, namespaces, None)
+        return check_public
+
+    def check(
+        request: Request,
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db),
+    ) -> None:
+        _check(request, db, namespaces, current_user.id if per_user else None)
+    return check
+
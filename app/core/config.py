@@ -21,6 +21,19 @@ class Settings(BaseSettings):
         else:
             return self.database_url
     
+    # Connection pool (per worker process)
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
+    db_pool_timeout: int = 30
+    db_max_connections: int = 100  # Server-side max_connections shared by all workers
+    
+    # Process model
+    web_concurrency: Optional[int] = None  # Worker processes; defaults to 2 * CPUs + 1 within the DB budget
+    threadpool_size: Optional[int] = None  # Sync route threads per worker; defaults to the pool size
+    run_db_init: bool = False              # Run init_db once in the gunicorn master before forking
+    hashing_pool_size: Optional[int] = None  # Password hashing threads per worker; defaults to CPUs
+    lazy_routers: bool = False             # Import each router on its first request (scale-to-zero hosts)
+    
     # Security
     secret_key: str = ""
     algorithm: str = "HS256"
@@ -35,10 +48,54 @@ class Settings(BaseSettings):
     # File uploads
     max_upload_size: int = 10485760  # 10MB
     upload_path: str = "uploads"
+    image_workers: int = 2  # Threads rendering avatars (app/services/profile_picture_service.py)
+    
+    # Media store (app/core/media.py): "local" (files under media_path) or "s3" (S3-compatible bucket)
+    media_backend: str = "local"
+    media_path: str = ""                 # Defaults to <upload_path>/media
+    media_s3_bucket: str = ""
+    media_s3_prefix: str = ""            # Key prefix inside the bucket, e.g. "media/"
+    media_s3_endpoint_url: str = ""      # MinIO, R2, ...; empty for AWS
+    media_s3_region: str = ""
+    media_accel_redirect: str = ""       # nginx internal location serving media_path, e.g. "/internal-media/"
+    
+    # Idempotency keys (retry-safe writes)
+    idempotency_key_ttl_hours: int = 24
+    
+    # Live update events: "memory" (single process) or "postgres" (LISTEN/NOTIFY across workers)
+    event_backend: str = "memory"
+    
+    # Cache invalidation bus: "memory" (single process) or "postgres" (LISTEN/NOTIFY across workers)
+    invalidation_backend: str = "memory"
+    
+    # Background jobs (app/core/scheduler.py, app/services/housekeeping.py)
+    scheduler_enabled: bool = True          # One worker leads through a Postgres advisory lock
+    soft_delete_retention_days: int = 30    # Soft-deleted posts and comments are purged after this
+    housekeeping_batch_size: int = 1000     # Rows per housekeeping statement and transaction
     
     # Logging
     log_level: str = "INFO"
     
+    # Response compression (app/core/compression.py); turn off where nginx compresses
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024   # Smaller bodies are sent as they are
+    gzip_level: int = 6
+    brotli_quality: int = 4                # 0-11; above ~5 costs more CPU than it saves bytes on the fly
+    
+    # Request SQL statistics (app/core/query_stats.py)
+    query_stats_enabled: bool = True
+    server_timing: Optional[bool] = None   # Server-Timing header; defaults to on outside production
+    slow_request_ms: float = 500           # Log requests slower than this
+    slow_query_ms: float = 100             # Log requests with a statement slower than this
+    max_queries_per_request: int = 30      # Log requests with more statements than this
+    metrics_token: Optional[str] = None    # Bearer token required by /metrics when set
+    
+    # Readiness checks (app/core/health.py)
+    health_cache_seconds: float = 2.0        # Reuse a readiness result for this long
+    health_db_timeout_seconds: float = 2.0   # Database probe fails after this
+    health_db_slow_ms: float = 250           # Slower round trips report "degraded"
+    health_pool_degraded_ratio: float = 0.8  # Pool usage that reports "degraded"; a full pool fails
+    
     # Email (optional)
     smtp_host: Optional[str] = None
     smtp_port: int = 587
@@ -1,14 +1,78 @@
-from sqlalchemy import create_engine
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.invalidation import install_session_hooks
+from app.core.metrics import REGISTRY
+from app.core.versions import install_version_hooks
+
+def _engine_options(url: str) -> dict:
+    # SQLite pools do not take sizing arguments
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": True,
+    }
+
+# Postgres schemas used by the models; SQLite emulates them with attached databases
+SCHEMAS = ("badminton", "access_control")
+
+def attach_sqlite_schemas(sqlite_engine) -> None:
+    """Attach one database per schema so schema-qualified tables work on SQLite"""
+    database = make_url(str(sqlite_engine.url)).database
+    in_memory = not database or database == ":memory:"
 
-engine = create_engine(settings.full_database_url)
+    @event.listens_for(sqlite_engine, "connect")
+    def _attach(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for schema in SCHEMAS:
+            path = ":memory:" if in_memory else f"{database.rsplit('.', 1)[0]}.{schema}.db"
+            cursor.execute(f"ATTACH DATABASE '{path}' AS {schema}")
+        cursor.close()
+
+engine = create_engine(settings.full_database_url, **_engine_options(settings.full_database_url))
+if engine.url.get_backend_name() == "sqlite":
+    attach_sqlite_schemas(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+def pool_status() -> Optional[dict]:
+    """Connection counts of this worker's pool; None for pools that do not track them (SQLite)"""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    return {
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        # QueuePool has no public accessor for max_overflow
+        "capacity": pool.size() + max(getattr(pool, "_max_overflow", 0), 0),
+    }
+
+REGISTRY.callback(
+    "db_pool_connections",
+    "Connections in this worker's pool by state",
+    lambda: {(state,): value for state, value in (pool_status() or {}).items() if state != "capacity"},
+    labelnames=("state",),
+)
+REGISTRY.callback(
+    "db_pool_capacity",
+    "Maximum connections this worker's pool can open (pool size + max overflow)",
+    lambda: {(): status["capacity"]} if (status := pool_status()) else {},
+)
+
+# Publish committed changes to the cache invalidation bus and bump collection versions
+install_session_hooks()
+install_version_hooks()
+
 def get_db():
     db = SessionLocal()
     try:
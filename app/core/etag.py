@@ -0,0 +1,48 @@
+"""
+ETag plumbing for read endpoints, kept free of auth and model imports so that main.py
+can install the middleware without loading them (lazy routers, see
+app/api/routers/__init__.py). The collection_etag dependency that computes the ETags
+lives in app/core/conditional.py.
+"""
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from starlette.datastructures import MutableHeaders
+from starlette.status import HTTP_200_OK
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CACHE_CONTROL = "private, no-cache"
+
+
+@lru_cache(maxsize=1)
+def code_fingerprint() -> str:
+    """Digest of the application's source; the same in every worker of one deploy"""
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).resolve().parents[1].rglob("*.py")):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ETagMiddleware:
+    """Adds the ETag a collection_etag dependency computed to the route's 200 response"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == HTTP_200_OK:
+                # request.state lives in scope["state"]
+                etag = scope.get("state", {}).get("etag")
+                if etag:
+                    headers = MutableHeaders(scope=message)
+                    headers.setdefault("ETag", etag)
+                    headers.setdefault("Cache-Control", CACHE_CONTROL)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,222 @@
+"""
+In-process publish/subscribe for live update events.
+
+Routers publish small delta events after they commit (match verified, new report, ...)
+and the /events stream fans them out to connected clients. The backend is pluggable:
+"memory" delivers within the current process only, "postgres" relays every event through
+LISTEN/NOTIFY so subscribers on all workers receive it.
+"""
+import json
+import logging
+import select
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from itertools import count
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.core.events")
+
+EventCallback = Callable[[Dict[str, Any]], None]
+
+# Postgres NOTIFY payloads are limited to 8000 bytes
+MAX_NOTIFY_PAYLOAD = 7900
+
+
+class EventTypes:
+    MATCH_CREATED = "match.created"
+    MATCH_VERIFIED = "match.verified"
+    STANDINGS_CHANGED = "standings.changed"
+    REPORT_CREATED = "report.created"
+    INVITATION_CREATED = "invitation.created"
+
+
+class EventBackend(ABC):
+    """Delivers published messages to every subscriber of a channel"""
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[str, List[EventCallback]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel: str, callback: EventCallback) -> Callable[[], None]:
+        """Register a callback and return a function that unregisters it"""
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                callbacks = self._subscribers.get(channel, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+
+        return unsubscribe
+
+    def _dispatch(self, channel: str, message: Dict[str, Any]) -> None:
+        """Call local subscribers; callbacks must be cheap and never block"""
+        with self._lock:
+            callbacks = list(self._subscribers.get(channel, []))
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception:
+                logger.exception(f"Event subscriber failed on channel {channel}")
+
+    @abstractmethod
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        ...
+
+    def start(self) -> None:
+        """Start background resources; backends without any keep this no-op"""
+        return None
+
+    def stop(self) -> None:
+        """Release background resources; backends without any keep this no-op"""
+        return None
+
+
+class InMemoryEventBackend(EventBackend):
+    """Single-process backend; the default and the one used in tests"""
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        self._dispatch(channel, message)
+
+
+class PostgresEventBackend(EventBackend):
+    """
+    Cross-process backend using Postgres LISTEN/NOTIFY.
+
+    Publishing issues pg_notify on a short-lived autocommit connection; a daemon thread
+    holds one dedicated LISTEN connection and dispatches notifications to local subscribers.
+    """
+
+    def __init__(self, channels: Iterable[str], dsn: Optional[str] = None, poll_interval: float = 5.0) -> None:
+        super().__init__()
+        self.channels = list(channels)
+        self.dsn = dsn or settings.full_database_url
+        self.poll_interval = poll_interval
+        self._engine = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def _get_engine(self):
+        if self._engine is None:
+            from app.core.database import engine
+            self._engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+        return self._engine
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        if channel not in self.channels:
+            raise ValueError(f"Channel {channel} is not configured for this backend")
+        payload = json.dumps(message, default=str, separators=(",", ":"))
+        if len(payload.encode("utf-8")) > MAX_NOTIFY_PAYLOAD:
+            logger.warning(f"Dropping oversized event on channel {channel} ({len(payload)} bytes)")
+            return
+        with self._get_engine().connect() as connection:
+            connection.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._listen_forever, name="pg-event-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+    def _listen_forever(self) -> None:
+        # Reconnect with a pause if the listening connection drops
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Postgres event listener failed, reconnecting")
+                self._stopped.wait(self.poll_interval)
+
+    def _listen(self) -> None:
+        import psycopg2
+        import psycopg2.extensions
+
+        connection = psycopg2.connect(self.dsn)
+        try:
+            connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with connection.cursor() as cursor:
+                for channel in self.channels:
+                    cursor.execute(f'LISTEN "{channel}"')
+            logger.info(f"Listening for events on {', '.join(self.channels)}")
+
+            while not self._stopped.is_set():
+                if select.select([connection], [], [], self.poll_interval) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    notify = connection.notifies.pop(0)
+                    try:
+                        message = json.loads(notify.payload)
+                    except ValueError:
+                        logger.warning(f"Ignoring malformed event payload on {notify.channel}")
+                        continue
+                    self._dispatch(notify.channel, message)
+        finally:
+            connection.close()
+
+
+def create_backend(kind: str, channels: Iterable[str]) -> EventBackend:
+    """Build a backend from its configured name ("memory" or "postgres")"""
+    if kind == "postgres":
+        return PostgresEventBackend(channels)
+    if kind == "memory":
+        return InMemoryEventBackend()
+    raise ValueError(f"Unknown event backend: {kind}")
+
+
+# Live update events for connected clients
+EVENTS_CHANNEL = "badminton_events"
+
+_event_backend: Optional[EventBackend] = None
+_event_ids = count(1)
+
+
+def get_event_backend() -> EventBackend:
+    global _event_backend
+    if _event_backend is None:
+        _event_backend = create_backend(settings.event_backend, [EVENTS_CHANNEL])
+    return _event_backend
+
+
+def set_event_backend(backend: EventBackend) -> None:
+    """Replace the active backend (used by tests)"""
+    global _event_backend
+    _event_backend = backend
+
+
+def publish_event(
+    event_type: str,
+    data: Dict[str, Any],
+    user_ids: Optional[Iterable[int]] = None,
+    tournament_id: Optional[int] = None
+) -> None:
+    """
+    Publish a live update event. Never raises: a failed notification must not fail
+    the request that already committed its write.
+
+    user_ids restricts delivery to those users; None broadcasts to everyone.
+    """
+    event = {
+        "id": f"{datetime.now(timezone.utc).timestamp():.6f}-{next(_event_ids)}",
+        "type": event_type,
+        "data": data,
+        "user_ids": sorted(set(user_ids)) if user_ids is not None else None,
+        "tournament_id": tournament_id,
+    }
+    try:
+        get_event_backend().publish(EVENTS_CHANNEL, event)
+    except Exception:
+        logger.exception(f"Failed to publish event {event_type}")
@@ -0,0 +1,175 @@
+"""
+File responses with byte ranges and conditional requests.
+
+Video and audio players seek by asking for byte ranges ("Range: bytes=1048576-");
+answering with 206 and just those bytes lets playback start, and jump, without the
+whole file going through the worker first. Revalidation (If-None-Match,
+If-Modified-Since) is answered with 304 and no body, and If-Range keeps a player from
+stitching together ranges of two different files.
+
+Local files are sent with the ASGI zero-copy extension (http.response.zerocopysend,
+sendfile under the hood) when the server offers it, and read in CHUNK_SIZE blocks off
+the event loop otherwise. Behind nginx, settings.media_accel_redirect hands /media
+files to nginx instead (app/api/routers/media.py).
+"""
+import os
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+import anyio
+from fastapi import Request, Response, status
+from fastapi.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from app.core.media import CHUNK_SIZE, content_type
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """First and last byte of a single-range Range header, None to send everything
+
+    Raises ValueError when the range starts past the end of the file.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    first, dash, last = spec.strip().partition("-")
+    # Other units, several ranges and malformed headers may be ignored (RFC 9110, 14.2)
+    if unit.strip().lower() != "bytes" or not dash or not (first + last).isdigit():
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError("unsatisfiable range")
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError("unsatisfiable range")
+    return start, end
+
+
+def _http_date(header: Optional[str]) -> Optional[datetime]:
+    try:
+        return parsedate_to_datetime(header) if header else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _seconds(moment: datetime) -> datetime:
+    # HTTP dates have whole seconds
+    return moment.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match names etag; weak comparison, since compression weakens ETags"""
+    tags = {value.strip().removeprefix("W/") for value in request.headers.get("if-none-match", "").split(",")}
+    return "*" in tags or etag in tags
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """Whether the client's copy is current; If-None-Match wins over If-Modified-Since"""
+    if request.headers.get("if-none-match") is not None:
+        return etag_matches(request, etag)
+    since = _http_date(request.headers.get("if-modified-since"))
+    return since is not None and _seconds(last_modified) <= since
+
+
+def _range_applies(request: Request, etag: str, last_modified: datetime) -> bool:
+    """If-Range: honour Range only while the client's partial copy is still current"""
+    if_range = request.headers.get("if-range")
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return _http_date(if_range) == _seconds(last_modified)
+
+
+def conditional_range(
+    request: Request,
+    size: int,
+    etag: str,
+    last_modified: datetime,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Tuple[int, Dict[str, str], int, int]:
+    """Status code, headers and first and last byte to send for a file of size bytes
+
+    The status is 200, 206 (a range), 304 (not modified) or 416 (range past the end);
+    the last two have no body.
+    """
+    headers = {
+        **(headers or {}),
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified.timestamp(), usegmt=True),
+    }
+    if is_not_modified(request, etag, last_modified):
+        return status.HTTP_304_NOT_MODIFIED, headers, 0, -1
+    try:
+        byte_range = parse_range(request.headers.get("range"), size) if _range_applies(request, etag, last_modified) else None
+    except ValueError:
+        return status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, {**headers, "Content-Range": f"bytes */{size}"}, 0, -1
+    if byte_range is None:
+        return status.HTTP_200_OK, {**headers, "Content-Length": str(size)}, 0, size - 1
+    start, end = byte_range
+    return status.HTTP_206_PARTIAL_CONTENT, {
+        **headers, "Content-Length": str(end - start + 1), "Content-Range": f"bytes {start}-{end}/{size}",
+    }, start, end
+
+
+class FileRangeResponse(Response):
+    """Bytes start to end of a local file"""
+
+    def __init__(
+        self,
+        path: os.PathLike,
+        start: int,
+        end: int,
+        status_code: int = status.HTTP_200_OK,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+    ) -> None:
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.path = path
+        self.start = start
+        self.end = end
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        remaining = self.end - self.start + 1
+        if scope["method"] == "HEAD" or remaining <= 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+            file = await anyio.to_thread.run_sync(open, self.path, "rb")
+            try:
+                await send({"type": ZEROCOPY_EXTENSION, "file": file, "offset": self.start, "count": remaining})
+            finally:
+                file.close()
+            return
+        async with await anyio.open_file(self.path, "rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_SIZE, remaining))
+                # A file truncated underneath us ends the body early rather than hanging
+                remaining = remaining - len(chunk) if chunk else 0
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+
+
+class RangeStaticFiles(StaticFiles):
+    """StaticFiles answering Range, If-Range and If-Modified-Since as well"""
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        if status_code != status.HTTP_200_OK:
+            return super().file_response(full_path, stat_result, scope, status_code)
+        request = Request(scope)
+        modified = datetime.fromtimestamp(stat_result.st_mtime, timezone.utc)
+        etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+        status_code, headers, start, end = conditional_range(request, stat_result.st_size, etag, modified)
+        if status_code in (status.HTTP_304_NOT_MODIFIED, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE):
+            return Response(status_code=status_code, headers=headers)
+        return FileRangeResponse(full_path, start, end, status_code, headers, content_type(str(full_path)))
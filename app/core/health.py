@@ -0,0 +1,118 @@
+"""
+Readiness checks for load balancers.
+
+Liveness (/health, /health/live) only says the event loop answers. Readiness
+(/health/ready) checks what a request needs: a database round trip within a timeout,
+a free connection in this worker's pool, and a writable upload directory.
+
+Each check reports "ok", "degraded" (still serving, but slow or nearly full) or "fail"
+(take this worker out of rotation). Results are cached briefly so frequent probes from
+several balancers cost one database round trip per interval. The database probe runs
+in its own thread, so it still answers when the request threadpool is exhausted.
+"""
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+OK = "ok"
+DEGRADED = "degraded"
+FAIL = "fail"
+_SEVERITY = {OK: 0, DEGRADED: 1, FAIL: 2}
+
+# One thread is enough: at most one probe runs at a time
+_probe_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="health-probe")
+_cached: Optional[Dict[str, Any]] = None
+_cached_at = 0.0
+_lock: Optional[asyncio.Lock] = None
+_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _check_result(status: str, **details: Any) -> Dict[str, Any]:
+    return {"status": status, **details}
+
+
+def _database_round_trip() -> float:
+    from app.core.database import engine
+
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return (time.perf_counter() - started) * 1000
+
+
+async def check_database() -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    try:
+        latency_ms = await asyncio.wait_for(
+            loop.run_in_executor(_probe_pool, _database_round_trip),
+            timeout=settings.health_db_timeout_seconds,
+        )
+    except asyncio.TimeoutError:
+        return _check_result(FAIL, error=f"no response within {settings.health_db_timeout_seconds}s")
+    except Exception as e:
+        return _check_result(FAIL, error=type(e).__name__)
+
+    status = DEGRADED if latency_ms >= settings.health_db_slow_ms else OK
+    return _check_result(status, latency_ms=round(latency_ms, 1))
+
+
+def check_pool() -> Dict[str, Any]:
+    from app.core.database import pool_status
+
+    pool = pool_status()
+    if pool is None:
+        return _check_result(OK, tracked=False)
+
+    usage = pool["checked_out"] / pool["capacity"] if pool["capacity"] else 0.0
+    if pool["checked_out"] >= pool["capacity"]:
+        status = FAIL
+    elif usage >= settings.health_pool_degraded_ratio:
+        status = DEGRADED
+    else:
+        status = OK
+    return _check_result(status, checked_out=pool["checked_out"], capacity=pool["capacity"], usage=round(usage, 2))
+
+
+def check_upload_dir() -> Dict[str, Any]:
+    path = settings.upload_path
+    try:
+        # os.access ignores read-only mounts and full disks; write a real file
+        with tempfile.NamedTemporaryFile(dir=path, prefix=".health-"):
+            pass
+    except OSError as e:
+        return _check_result(FAIL, path=path, error=e.strerror or type(e).__name__)
+    return _check_result(OK, path=path)
+
+
+async def _run_checks() -> Dict[str, Any]:
+    checks = {
+        "database": await check_database(),
+        "pool": check_pool(),
+        # Not on the probe thread, which may still be stuck on a dead database
+        "uploads": await asyncio.get_running_loop().run_in_executor(None, check_upload_dir),
+    }
+    status = max((check["status"] for check in checks.values()), key=_SEVERITY.__getitem__)
+    return {"status": status, "pid": os.getpid(), "checks": checks}
+
+
+async def readiness(force: bool = False) -> Dict[str, Any]:
+    """Run the readiness checks, or return the result from the last interval"""
+    global _cached, _cached_at, _lock, _lock_loop
+    loop = asyncio.get_running_loop()
+    if _lock is None or _lock_loop is not loop:
+        _lock, _lock_loop = asyncio.Lock(), loop
+
+    async with _lock:
+        # Probes arriving while a check runs wait for it and share its result
+        now = time.monotonic()
+        if force or _cached is None or now - _cached_at >= settings.health_cache_seconds:
+            _cached = await _run_checks()
+            _cached_at = time.monotonic()
+        return {**_cached, "age_seconds": round(time.monotonic() - _cached_at, 2)}
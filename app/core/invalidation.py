@@ -0,0 +1,301 @@
+"""
+Cache invalidation bus for multi-worker deployments.
+
+Every committed write publishes the namespaces it touched (users, roles, matches, ...)
+together with the primary keys of the changed rows. Each worker applies its own changes
+immediately and receives the other workers' changes through the configured backend
+(Postgres LISTEN/NOTIFY in production, in-memory for a single process and tests).
+
+Writes are picked up by SQLAlchemy session hooks, so services and routers do not need
+to call the bus themselves. Core statements run through a session can call
+mark_changed() before committing; they are then published with the ORM changes (and
+bump the collection versions, app/core/versions.py). Code without a session can call
+get_invalidation_bus().invalidate() directly.
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import EventBackend, create_backend
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger("app.core.invalidation")
+
+INVALIDATION_CHANNEL = "badminton_invalidation"
+
+# More changed keys than this are sent as "drop the whole namespace"
+MAX_KEYS_PER_NAMESPACE = 50
+
+# Table name -> cache namespace. Tables not listed here never invalidate anything.
+TABLE_NAMESPACES = {
+    "User": "users",
+    "medals": "users",
+    "Role": "roles",
+    "Permission": "roles",
+    "PermissionGroup": "roles",
+    "RolesPermissions": "roles",
+    "Match": "matches",
+    "Tournament": "tournaments",
+    "tournament_participants": "tournaments",
+    "tournament_invitations": "invitations",
+    "reports": "reports",
+    "report_reactions": "reports",
+    "report_views": "reports",
+    "Post": "posts",
+    "Comment": "posts",
+    "Attachment": "posts",
+    "PostReaction": "posts",
+    "CommentReaction": "posts",
+}
+
+# None means "every key in the namespace"
+Changes = Dict[str, Optional[List[Hashable]]]
+InvalidationHandler = Callable[[Optional[List[Hashable]]], None]
+
+
+class InvalidationBus:
+    """Fans out namespace invalidations to local handlers and to the other workers"""
+
+    def __init__(self, backend: EventBackend) -> None:
+        self.backend = backend
+        self._token = uuid.uuid4().hex[:8]
+        self._handlers: Dict[str, List[InvalidationHandler]] = {}
+        self._lock = threading.Lock()
+        self._unsubscribe = backend.subscribe(INVALIDATION_CHANNEL, self._on_message)
+
+    @property
+    def origin(self) -> str:
+        # Includes the pid so workers forked from a preloaded master stay distinct
+        return f"{os.getpid()}-{self._token}"
+
+    def register(self, namespace: str, handler: InvalidationHandler) -> None:
+        """Call handler(keys) whenever namespace changes; keys is None when everything is stale"""
+        with self._lock:
+            self._handlers.setdefault(namespace, []).append(handler)
+
+    def invalidate(self, namespace: str, keys: Optional[Iterable[Hashable]] = None) -> None:
+        self.invalidate_many({namespace: list(keys) if keys is not None else None})
+
+    def invalidate_many(self, changes: Changes) -> None:
+        """Apply locally right away, then tell the other workers"""
+        if not changes:
+            return
+        self._apply(changes)
+        try:
+            self.backend.publish(INVALIDATION_CHANNEL, {"origin": self.origin, "changes": changes})
+        except Exception:
+            logger.exception("Failed to publish cache invalidation")
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        # Our own changes were already applied in invalidate_many
+        if message.get("origin") == self.origin:
+            return
+        self._apply(message.get("changes") or {})
+
+    def _apply(self, changes: Changes) -> None:
+        for namespace, keys in changes.items():
+            with self._lock:
+                handlers = list(self._handlers.get(namespace, []))
+            for handler in handlers:
+                try:
+                    handler(keys)
+                except Exception:
+                    logger.exception(f"Invalidation handler failed for namespace {namespace}")
+
+    def start(self) -> None:
+        self.backend.start()
+
+    def stop(self) -> None:
+        self.backend.stop()
+
+
+_caches: List["LocalCache"] = []
+
+
+class LocalCache:
+    """
+    Small thread-safe per-worker TTL cache that drops entries when its namespace
+    is invalidated. The TTL bounds staleness for changes made outside the ORM.
+
+    If cache keys are not the primary keys of the namespace's rows, pass
+    by_primary_key=False so any change clears the whole cache.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: float = 60, maxsize: int = 1024, by_primary_key: bool = True) -> None:
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self.by_primary_key = by_primary_key
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        get_invalidation_bus().register(namespace, self._invalidate)
+        _caches.append(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _invalidate(self, keys: Optional[List[Hashable]]) -> None:
+        if keys is None or not self.by_primary_key:
+            self.clear()
+            return
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+
+def _cache_samples(value: Callable[["LocalCache"], float]) -> Dict[tuple, float]:
+    # Caches sharing a namespace are reported together
+    samples: Dict[tuple, float] = {}
+    for cache in list(_caches):
+        key = (cache.namespace,)
+        samples[key] = samples.get(key, 0) + value(cache)
+    return samples
+
+
+def _cache_hit_ratio() -> Dict[tuple, float]:
+    hits = _cache_samples(lambda cache: cache.hits)
+    lookups = _cache_samples(lambda cache: cache.hits + cache.misses)
+    return {key: hits[key] / lookups[key] for key in lookups if lookups[key]}
+
+
+REGISTRY.callback("cache_hits_total", "Local cache hits", lambda: _cache_samples(lambda cache: cache.hits), ("cache",), kind="counter")
+REGISTRY.callback("cache_misses_total", "Local cache misses", lambda: _cache_samples(lambda cache: cache.misses), ("cache",), kind="counter")
+REGISTRY.callback("cache_hit_ratio", "Hits / lookups since the worker started", _cache_hit_ratio, ("cache",))
+REGISTRY.callback("cache_entries", "Entries currently cached", lambda: _cache_samples(len), ("cache",))
+
+
+_invalidation_bus: Optional[InvalidationBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    global _invalidation_bus
+    if _invalidation_bus is None:
+        with _bus_lock:
+            if _invalidation_bus is None:
+                _invalidation_bus = InvalidationBus(
+                    create_backend(settings.invalidation_backend, [INVALIDATION_CHANNEL])
+                )
+    return _invalidation_bus
+
+
+# ---------------------------------------------------------------------------
+# Session hooks: collect what each transaction changed, publish after commit
+# ---------------------------------------------------------------------------
+
+_PENDING_KEY = "pending_invalidations"
+
+
+def _record(session: Session, namespace: str, key: Optional[Hashable]) -> None:
+    pending: Dict[str, Optional[Set[Hashable]]] = session.info.setdefault(_PENDING_KEY, {})
+    if namespace in pending and pending[namespace] is None:
+        return
+    if key is None:
+        pending[namespace] = None
+        return
+    keys = pending.setdefault(namespace, set())
+    keys.add(key)
+    if len(keys) > MAX_KEYS_PER_NAMESPACE:
+        pending[namespace] = None
+
+
+def mark_changed(session: Session, namespace: str, keys: Optional[Iterable[Hashable]] = None) -> None:
+    """Publish namespace (these keys, or all of it) when session commits, as for ORM writes"""
+    if keys is None:
+        _record(session, namespace, None)
+        return
+    for key in keys:
+        _record(session, namespace, key)
+
+
+def pending_namespaces(session: Session) -> List[str]:
+    """Namespaces the session's transaction has changed so far"""
+    return sorted(session.info.get(_PENDING_KEY, {}))
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(instance, "__tablename__", None)
+        namespace = TABLE_NAMESPACES.get(table)
+        if namespace is None:
+            continue
+        state = inspect(instance)
+        if instance in session.dirty and not session.is_modified(instance):
+            continue
+        identity = state.mapper.primary_key_from_instance(instance)
+        # Composite keys do not map onto cache keys; drop the namespace instead
+        key = identity[0] if len(identity) == 1 and identity[0] is not None else None
+        _record(session, namespace, key)
+
+
+def _after_bulk(context) -> None:
+    namespace = TABLE_NAMESPACES.get(context.mapper.local_table.name)
+    if namespace is not None:
+        _record(context.session, namespace, None)
+
+
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    changes: Changes = {
+        namespace: sorted(keys, key=str) if keys is not None else None
+        for namespace, keys in pending.items()
+    }
+    get_invalidation_bus().invalidate_many(changes)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def install_session_hooks() -> None:
+    """Attach the invalidation hooks to every ORM session (idempotent)"""
+    if event.contains(Session, "after_commit", _after_commit):
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_bulk_update", _after_bulk)
+    event.listen(Session, "after_bulk_delete", _after_bulk)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
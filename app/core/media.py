@@ -0,0 +1,386 @@
+"""
+Content-addressed media storage.
+
+A blob's key is the SHA-256 of the uploaded bytes plus an extension ("<hex>.jpg");
+renditions derived from an upload add a variant ("<hex>_avatar256.jpg"). The same
+file uploaded twice is therefore stored and processed once, and a key's content never
+changes: /media/{key} is served with an immutable Cache-Control and the key as ETag.
+
+Keys only carry extensions of MEDIA_TYPES, image, video and audio formats a browser
+renders harmlessly; anything else is stored as .bin and served as a download, so an
+uploaded HTML or SVG file never runs as a page on the API's origin.
+
+Blobs may be shared by several rows, so nothing deletes them on request. The
+purge_unreferenced_media housekeeping job removes blobs whose digest no row refers to.
+
+Backends: "local" keeps blobs under media_path, fanned out by the first digest bytes;
+"s3" uses any S3-compatible service (AWS, MinIO, R2) through a boto3 S3 client.
+"""
+import hashlib
+import os
+import re
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Iterator, Optional
+
+import anyio
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+MEDIA_URL_PREFIX = "/media"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+CHUNK_SIZE = 64 * 1024
+
+# <sha256 hex>[_<variant>].<extension>
+KEY_PATTERN = re.compile(r"^(?P<digest>[0-9a-f]{64})(?:_(?P<variant>[a-z0-9]{1,16}))?\.(?P<extension>[a-z0-9]{1,5})$")
+
+
+def media_key(digest: str, extension: str, variant: Optional[str] = None) -> str:
+    return f"{digest}_{variant}.{extension}" if variant else f"{digest}.{extension}"
+
+
+def media_url(key: str) -> str:
+    return f"{MEDIA_URL_PREFIX}/{key}"
+
+
+def key_from_url(url: Optional[str]) -> Optional[str]:
+    """The key behind a /media URL, or None for anything else"""
+    if not url or not url.startswith(MEDIA_URL_PREFIX + "/"):
+        return None
+    key = url[len(MEDIA_URL_PREFIX) + 1:]
+    return key if KEY_PATTERN.match(key) else None
+
+
+# Extensions a key may carry and the Content-Type each is served with. No SVG: it can script.
+MEDIA_TYPES = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",  # Served for files from before the allow-list; new keys use jpg
+    "png": "image/png",
+    "gif": "image/gif",
+    "webp": "image/webp",
+    "heic": "image/heic",
+    "heif": "image/heif",
+    "avif": "image/avif",
+    "mp4": "video/mp4",
+    "mov": "video/quicktime",
+    "webm": "video/webm",
+    "3gp": "video/3gpp",
+    "mp3": "audio/mpeg",
+    "m4a": "audio/mp4",
+    "aac": "audio/aac",
+    "ogg": "audio/ogg",
+    "wav": "audio/wav",
+    "flac": "audio/flac",
+}
+_EXTENSIONS = {
+    **{mime_type: extension for extension, mime_type in MEDIA_TYPES.items()},
+    "image/jpeg": "jpg",
+    "image/jpg": "jpg",
+    "image/pjpeg": "jpg",
+    "audio/mp3": "mp3",
+    "audio/x-m4a": "m4a",
+    "audio/x-wav": "wav",
+    "audio/wave": "wav",
+    "audio/x-flac": "flac",
+}
+# Extension of everything else
+OTHER_EXTENSION = "bin"
+# Pillow's image.format for the formats above; phone cameras' multi-picture JPEGs are MPO
+_IMAGE_FORMATS = {"JPEG": "jpg", "MPO": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp", "HEIF": "heic", "AVIF": "avif"}
+
+
+def media_extension(mime_type: Optional[str]) -> str:
+    """Key extension for a MIME type: its own for allowed media, OTHER_EXTENSION otherwise"""
+    return _EXTENSIONS.get((mime_type or "").split(";")[0].strip().lower(), OTHER_EXTENSION)
+
+
+def image_extension(image_format: Optional[str]) -> str:
+    """Key extension for a format Pillow detected (image.format)"""
+    return _IMAGE_FORMATS.get(image_format or "", OTHER_EXTENSION)
+
+
+def is_inline(key: str) -> bool:
+    """Whether a blob may be displayed in the browser rather than downloaded"""
+    return key.rsplit(".", 1)[-1] in MEDIA_TYPES
+
+
+def content_type(key: str) -> str:
+    # Never guessed from other extensions: keys stored before the allow-list may end in .html
+    return MEDIA_TYPES.get(key.rsplit(".", 1)[-1], "application/octet-stream")
+
+
+def etag(key: str) -> str:
+    # Strong: the bytes behind a key never change
+    return f'"{key.rsplit(".", 1)[0]}"'
+
+
+@dataclass
+class BlobInfo:
+    key: str
+    size: int
+    modified: datetime
+
+
+class MediaStore(ABC):
+    """Write-once blob storage addressed by key"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def put(self, key: str, source: Path) -> None:
+        """Store the finished file source under key; source is consumed"""
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        ...
+
+    def open_range(self, key: str, start: int, end: int) -> BinaryIO:
+        """Readable positioned at byte start; the caller reads up to byte end"""
+        body = self.open(key)
+        body.seek(start)
+        return body
+
+    @abstractmethod
+    def stat(self, key: str) -> Optional[BlobInfo]:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def iter_blobs(self) -> Iterator[BlobInfo]:
+        ...
+
+    @abstractmethod
+    def staging_dir(self) -> Path:
+        """Local directory for uploads in progress"""
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Filesystem path of a stored blob, for backends that have one"""
+        return None
+
+    def touch(self, key: str) -> bool:
+        """Mark a blob as just stored, so the purge's grace period covers it; False if missing"""
+        return self.exists(key)
+
+    def save(self, key: str, source: Path) -> bool:
+        """Store source under key unless the key exists; returns True when it was new"""
+        if self.touch(key):
+            source.unlink(missing_ok=True)
+            return False
+        self.put(key, source)
+        return True
+
+
+class LocalMediaStore(MediaStore):
+    """Blobs on the local filesystem: <root>/<ab>/<cd>/<key>"""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key[2:4] / key
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def put(self, key: str, source: Path) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Atomic: readers see the whole blob or none of it. Staging lives under root,
+        # so this is a rename on the same filesystem.
+        os.replace(source, path)
+
+    def touch(self, key: str) -> bool:
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self._path(key), "rb")
+
+    def stat(self, key: str) -> Optional[BlobInfo]:
+        try:
+            result = self._path(key).stat()
+        except FileNotFoundError:
+            return None
+        return BlobInfo(key, result.st_size, datetime.fromtimestamp(result.st_mtime, timezone.utc))
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def iter_blobs(self) -> Iterator[BlobInfo]:
+        for path in self.root.glob("??/??/*"):
+            info = self.stat(path.name) if KEY_PATTERN.match(path.name) else None
+            if info:
+                yield info
+
+    def staging_dir(self) -> Path:
+        return self.root / ".staging"
+
+    def local_path(self, key: str) -> Optional[Path]:
+        path = self._path(key)
+        return path if path.is_file() else None
+
+
+def _is_missing(error: Exception) -> bool:
+    code = getattr(error, "response", {}).get("Error", {}).get("Code")
+    return code in ("404", "NoSuchKey", "NotFound")
+
+
+class S3MediaStore(MediaStore):
+    """Blobs in an S3-compatible bucket; client is a boto3 S3 client or anything with its methods"""
+
+    def __init__(self, client: Any, bucket: str, prefix: str = "", staging: Optional[Path] = None) -> None:
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.staging = staging or Path(settings.upload_path) / ".staging"
+
+    def _object(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def exists(self, key: str) -> bool:
+        return self.stat(key) is not None
+
+    def put(self, key: str, source: Path) -> None:
+        try:
+            # upload_file switches to multipart uploads for large files
+            self.client.upload_file(
+                str(source), self.bucket, self._object(key),
+                ExtraArgs={"ContentType": content_type(key), "CacheControl": IMMUTABLE_CACHE_CONTROL},
+            )
+        finally:
+            source.unlink(missing_ok=True)
+
+    def touch(self, key: str) -> bool:
+        # Copying an object onto itself is how S3 updates LastModified
+        try:
+            self.client.copy_object(
+                Bucket=self.bucket, Key=self._object(key),
+                CopySource={"Bucket": self.bucket, "Key": self._object(key)},
+                MetadataDirective="REPLACE", ContentType=content_type(key), CacheControl=IMMUTABLE_CACHE_CONTROL,
+            )
+        except Exception as error:
+            if _is_missing(error):
+                return False
+            raise
+        return True
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=self._object(key))["Body"]
+
+    def open_range(self, key: str, start: int, end: int) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=self._object(key), Range=f"bytes={start}-{end}")["Body"]
+
+    def stat(self, key: str) -> Optional[BlobInfo]:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._object(key))
+        except Exception as error:
+            if _is_missing(error):
+                return None
+            raise
+        return BlobInfo(key, head["ContentLength"], head["LastModified"])
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._object(key))
+
+    def iter_blobs(self) -> Iterator[BlobInfo]:
+        arguments = {"Bucket": self.bucket, "Prefix": self.prefix}
+        while True:
+            page = self.client.list_objects_v2(**arguments)
+            for item in page.get("Contents", []):
+                key = item["Key"][len(self.prefix):]
+                if KEY_PATTERN.match(key):
+                    yield BlobInfo(key, item["Size"], item["LastModified"])
+            if not page.get("IsTruncated"):
+                return
+            arguments["ContinuationToken"] = page["NextContinuationToken"]
+
+    def staging_dir(self) -> Path:
+        return self.staging
+
+
+def create_media_store(kind: str) -> MediaStore:
+    """Build a store from its configured name ("local" or "s3")"""
+    if kind == "local":
+        return LocalMediaStore(Path(settings.media_path or Path(settings.upload_path) / "media"))
+    if kind == "s3":
+        import boto3
+
+        client = boto3.client("s3", endpoint_url=settings.media_s3_endpoint_url or None, region_name=settings.media_s3_region or None)
+        return S3MediaStore(client, settings.media_s3_bucket, settings.media_s3_prefix)
+    raise ValueError(f"Unknown media backend: {kind}")
+
+
+_media_store: Optional[MediaStore] = None
+_store_lock = threading.Lock()
+
+
+def get_media_store() -> MediaStore:
+    global _media_store
+    if _media_store is None:
+        with _store_lock:
+            if _media_store is None:
+                _media_store = create_media_store(settings.media_backend)
+    return _media_store
+
+
+def set_media_store(store: Optional[MediaStore]) -> None:
+    """Replace the active store (used by tests)"""
+    global _media_store
+    _media_store = store
+
+
+@dataclass
+class StagedUpload:
+    """An upload written to the staging directory, with its digest"""
+    path: Path
+    digest: str
+    size: int
+
+
+def staging_file(store: Optional[MediaStore] = None) -> Path:
+    """A fresh path in the staging directory"""
+    directory = (store or get_media_store()).staging_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / uuid.uuid4().hex
+
+
+async def upload_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    """Read a multipart upload CHUNK_SIZE bytes at a time"""
+    while chunk := await file.read(CHUNK_SIZE):
+        yield chunk
+
+
+async def stage_upload(chunks: AsyncIterator[bytes], max_bytes: int, store: Optional[MediaStore] = None) -> StagedUpload:
+    """Write chunks to a staging file while hashing them; 413 as soon as more than max_bytes arrive"""
+    path = await run_in_threadpool(staging_file, store)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with await anyio.open_file(path, "wb") as handle:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File size must be less than {max_bytes // (1024 * 1024)}MB",
+                    )
+                digest.update(chunk)
+                await handle.write(chunk)
+    except BaseException:
+        await run_in_threadpool(path.unlink, missing_ok=True)
+        raise
+    return StagedUpload(path, digest.hexdigest(), size)
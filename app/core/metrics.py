@@ -0,0 +1,260 @@
+"""
+In-process metrics and their text exposition.
+
+Counters and histograms keep one shard per thread: a thread only ever writes its own
+shard, so the hot path takes no lock, and readers merge the shards when they collect.
+Gauges that describe other objects (pool sizes, cache hit counts) are read through
+callbacks at scrape time, so they cost nothing between scrapes.
+Values are per worker process.
+"""
+import logging
+import math
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("app.core.metrics")
+
+LabelValues = Tuple[str, ...]
+
+
+class _Sharded:
+    """Per-thread storage merged on read"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            # Taken once per thread, never on the hot path
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _snapshots(self) -> List[dict]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        # Copy each shard so a writer adding a new label set cannot break iteration
+        return [dict(shard) for shard in shards]
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labelvalues] = shard.get(labelvalues, 0) + amount
+
+    def collect(self) -> Dict[LabelValues, float]:
+        totals: Dict[LabelValues, float] = {}
+        for shard in self._snapshots():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+
+class Histogram(_Sharded):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        shard = self._shard()
+        series = shard.get(labelvalues)
+        if series is None:
+            # Non-cumulative bucket counts, then +Inf, sum and count
+            series = shard[labelvalues] = [0] * (len(self.buckets) + 3)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+                break
+        else:
+            series[len(self.buckets)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def collect(self) -> Dict[LabelValues, dict]:
+        """Cumulative bucket counts, sum and count for every label set"""
+        merged: Dict[LabelValues, List[float]] = {}
+        for shard in self._snapshots():
+            for labels, series in shard.items():
+                values = list(series)
+                total = merged.get(labels)
+                merged[labels] = values if total is None else [a + b for a, b in zip(total, values)]
+
+        result: Dict[LabelValues, dict] = {}
+        for labels, values in merged.items():
+            cumulative, running = [], 0
+            for count in values[:len(self.buckets) + 1]:
+                running += count
+                cumulative.append(running)
+            result[labels] = {
+                "buckets": list(zip(self.buckets + (float("inf"),), cumulative)),
+                "sum": values[-2],
+                "count": values[-1],
+            }
+        return result
+
+
+class Gauge:
+    """Last value wins; a plain dict assignment needs no lock"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        self._values[labelvalues] = value
+
+    def collect(self) -> Dict[LabelValues, float]:
+        return dict(self._values)
+
+
+class CallbackMetric:
+    """Gauge or counter whose values are read from a callback at collection time"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge"
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self.kind = kind
+
+    def collect(self) -> Dict[LabelValues, float]:
+        try:
+            return self.callback()
+        except Exception:
+            # A broken collector must not take the whole scrape down
+            logger.exception(f"Metric callback {self.name} failed")
+            return {}
+
+
+class Registry:
+    """Named collection of metrics"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float], labelnames: Sequence[str] = ()) -> Histogram:
+        return self.register(Histogram(name, documentation, buckets, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge"
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, callback, labelnames, kind))
+
+    def metrics(self) -> list:
+        with self._lock:
+            return list(self._metrics.values())
+
+
+REGISTRY = Registry()
+
+BACKGROUND_JOB_LAG = REGISTRY.gauge(
+    "background_job_lag_seconds",
+    "Delay between when a background job was due and when it started, last run",
+    labelnames=("job",),
+)
+BACKGROUND_JOB_DURATION = REGISTRY.histogram(
+    "background_job_duration_seconds",
+    "Background job run time",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60),
+    labelnames=("job", "outcome"),
+)
+BACKGROUND_JOB_LAST_SUCCESS = REGISTRY.gauge(
+    "background_job_last_success_timestamp_seconds",
+    "Unix time of the last successful run",
+    labelnames=("job",),
+)
+
+
+def observe_job_run(job: str, lag_seconds: float, duration_seconds: float, succeeded: bool, finished_at: float) -> None:
+    """Record one background job run"""
+    BACKGROUND_JOB_LAG.set(max(lag_seconds, 0.0), job)
+    BACKGROUND_JOB_DURATION.observe(duration_seconds, job, "success" if succeeded else "failure")
+    if succeeded:
+        BACKGROUND_JOB_LAST_SUCCESS.set(finished_at, job)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render(registry: Optional[Registry] = None) -> str:
+    """Prometheus text exposition format (version 0.0.4)"""
+    registry = registry or REGISTRY
+    lines = [
+        "# HELP app_worker_info Worker process that produced this scrape",
+        "# TYPE app_worker_info gauge",
+        f'app_worker_info{{pid="{os.getpid()}"}} 1',
+    ]
+    for metric in registry.metrics():
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        samples = metric.collect()
+        for labelvalues in sorted(samples, key=lambda labels: tuple(str(value) for value in labels)):
+            sample = samples[labelvalues]
+            if metric.kind == "histogram":
+                for bound, count in sample["buckets"]:
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{metric.name}_bucket{_labels(metric.labelnames, labelvalues, le)} {_format_value(count)}")
+                lines.append(f"{metric.name}_sum{_labels(metric.labelnames, labelvalues)} {_format_value(sample['sum'])}")
+                lines.append(f"{metric.name}_count{_labels(metric.labelnames, labelvalues)} {_format_value(sample['count'])}")
+            else:
+                lines.append(f"{metric.name}{_labels(metric.labelnames, labelvalues)} {_format_value(sample)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,102 @@
+"""
+Helpers for online schema changes, used by the revisions in alembic/versions.
+
+A plain CREATE INDEX blocks writes to the table until the index is built, and one
+UPDATE over a whole table locks every row it touches until it commits. On Postgres
+these helpers build and drop indexes CONCURRENTLY and fill new columns in short
+transactions over windows of primary keys, so the app keeps serving while a revision
+runs. On SQLite they run the plain statements.
+"""
+from typing import Any, Mapping, Optional, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# Applied to every migration connection on Postgres (alembic/env.py): a DDL statement
+# waiting for a lock queues every query behind it, so give up instead and retry later
+LOCK_TIMEOUT = "5s"
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _dialect_name() -> str:
+    return op.get_context().dialect.name
+
+
+def _is_invalid_index(name: str, schema: Optional[str]) -> bool:
+    """True for an index left INVALID by a failed or cancelled concurrent build"""
+    if _dialect_name() != "postgresql" or op.get_context().as_sql:
+        return False
+    return bool(op.get_bind().execute(
+        sa.text(
+            "SELECT NOT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = :name AND n.nspname = :schema"
+        ),
+        {"name": name, "schema": schema or "public"},
+    ).scalar())
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[Union[str, sa.TextClause]],
+    schema: Optional[str] = "badminton",
+    **kwargs: Any,
+) -> None:
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS, rebuilding an INVALID leftover first"""
+    # CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        if _is_invalid_index(name, schema):
+            op.drop_index(name, table_name=table, schema=schema, if_exists=True, postgresql_concurrently=True)
+        op.create_index(
+            name, table, list(columns), schema=schema,
+            if_not_exists=True, postgresql_concurrently=True, **kwargs,
+        )
+
+
+def drop_index_concurrently(name: str, table: str, schema: Optional[str] = "badminton") -> None:
+    """DROP INDEX CONCURRENTLY IF EXISTS"""
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, schema=schema, if_exists=True, postgresql_concurrently=True)
+
+
+def backfill_in_batches(
+    table: sa.TableClause,
+    values: Mapping[str, Any],
+    where: Optional[sa.ColumnElement] = None,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    key: str = "id",
+) -> int:
+    """UPDATE table SET values, committing once per window of batch_size keys; returns the rows updated
+
+    values may be correlated subqueries, e.g. a counter column set to the count of its
+    child rows. Rows written by the app while the backfill runs must already get the
+    right value from the app itself, so deploy the code that maintains the column first.
+    """
+    key_column = table.c[key]
+
+    def statement(lower=None, upper=None):
+        update = sa.update(table).values(dict(values))
+        if where is not None:
+            update = update.where(where)
+        if lower is not None:
+            update = update.where(key_column > lower, key_column <= upper)
+        return update
+
+    if op.get_context().as_sql:
+        # No rows to look at when only printing SQL; the DBA batches it by hand
+        op.execute(statement())
+        return 0
+
+    updated = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        first, last = bind.execute(sa.select(sa.func.min(key_column), sa.func.max(key_column))).one()
+        if first is None:
+            return 0
+        # Windows of keys rather than LIMIT: each UPDATE is a short range scan on the key
+        for lower in range(first - 1, last, batch_size):
+            updated += bind.execute(statement(lower, lower + batch_size)).rowcount
+    return updated
@@ -0,0 +1,168 @@
+"""
+Per-request SQL statistics.
+
+SQLAlchemy cursor events add every statement's duration to the stats object of the
+request that is running it (found through a context variable, which Starlette copies
+into the threadpool that runs sync endpoints). The middleware then:
+
+- adds a Server-Timing header outside production (visible in browser dev tools),
+- logs requests that exceed the configured duration, query-count or slow-query limits,
+- feeds per-route request counts and histograms of latency, query count and database time.
+
+The overhead is two perf_counter() calls per statement and a few dict updates per request.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger("app.core.query_stats")
+
+SLOW_STATEMENT_LOG_LENGTH = 300
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS = REGISTRY.counter(
+    "http_requests_total",
+    "Requests handled",
+    labelnames=("method", "route", "status"),
+)
+REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the end of the response",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    labelnames=("method", "route"),
+)
+QUERIES_PER_REQUEST = REGISTRY.histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request",
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+    labelnames=("method", "route"),
+)
+DB_TIME_PER_REQUEST = REGISTRY.histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL statements per request",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+    labelnames=("method", "route"),
+)
+
+
+class RequestQueryStats:
+    """SQL statements run while handling one request"""
+
+    __slots__ = ("count", "total_ms", "slowest_ms", "slowest_statement")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        if duration_ms > self.slowest_ms:
+            self.slowest_ms = duration_ms
+            self.slowest_statement = statement
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    """Stats of the request being handled, or None outside a request"""
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and _current_stats.get() is not None:
+        context._query_stats_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    started = getattr(context, "_query_stats_start", None)
+    if stats is None or started is None:
+        return
+    stats.record(statement, (time.perf_counter() - started) * 1000)
+
+
+def install_query_hooks() -> None:
+    """Time statements on every engine (idempotent)"""
+    if event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def route_label(scope) -> str:
+    """Route template (e.g. /matches/{match_id}) so histograms do not grow per id"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware that collects per-request SQL statistics"""
+
+    def __init__(self, app, server_timing: Optional[bool] = None) -> None:
+        self.app = app
+        self.server_timing = (not settings.is_production) if server_timing is None else server_timing
+        install_query_hooks()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        streaming = False
+
+        async def send_with_timing(message) -> None:
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                streaming = headers.get("content-type", "").startswith("text/event-stream")
+                if self.server_timing:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", app;dur={elapsed_ms:.1f}'
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._finish(scope, stats, status_code, (time.perf_counter() - started) * 1000, streaming)
+
+    def _finish(self, scope, stats: RequestQueryStats, status_code: int, elapsed_ms: float, streaming: bool) -> None:
+        method, route = scope["method"], route_label(scope)
+        REQUESTS.inc(method, route, str(status_code))
+        if not streaming:
+            REQUEST_DURATION.observe(elapsed_ms / 1000, method, route)
+        QUERIES_PER_REQUEST.observe(stats.count, method, route)
+        DB_TIME_PER_REQUEST.observe(stats.total_ms / 1000, method, route)
+
+        # Event streams stay open for minutes by design
+        if (
+            (elapsed_ms >= settings.slow_request_ms and not streaming)
+            or stats.count > settings.max_queries_per_request
+            or stats.slowest_ms >= settings.slow_query_ms
+        ):
+            statement = " ".join((stats.slowest_statement or "").split())[:SLOW_STATEMENT_LOG_LENGTH]
+            logger.warning(
+                f"Slow request {method} {route} -> {status_code}: {elapsed_ms:.0f}ms, "
+                f"{stats.count} queries, {stats.total_ms:.0f}ms in db, "
+                f"slowest {stats.slowest_ms:.0f}ms: {statement}"
+            )
@@ -0,0 +1,60 @@
+"""
+Process and thread sizing for production.
+
+Every worker has its own SQLAlchemy pool (db_pool_size + db_max_overflow connections)
+plus one dedicated LISTEN connection per Postgres pub/sub backend and one for the
+scheduler's leader lock. The worker count is capped so all workers together stay within
+db_max_connections, and the threadpool that runs sync routes is sized to the pool so
+threads never queue on a pool checkout.
+"""
+import os
+from typing import Optional
+
+from app.core.config import settings
+
+# Connections kept free for migrations, psql sessions and monitoring
+RESERVED_DB_CONNECTIONS = 5
+
+
+def cpu_count() -> int:
+    """CPUs available to this process (respects affinity/cgroup cpusets on Linux)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def connections_per_worker() -> int:
+    listeners = sum(1 for backend in (settings.event_backend, settings.invalidation_backend) if backend == "postgres")
+    # The scheduler leader holds its advisory lock on a connection of its own
+    scheduler = 1 if settings.scheduler_enabled and settings.full_database_url.startswith("postgres") else 0
+    return settings.db_pool_size + settings.db_max_overflow + listeners + scheduler
+
+
+def worker_count(cpus: Optional[int] = None) -> int:
+    """
+    Number of worker processes: WEB_CONCURRENCY if set, otherwise 2 * CPUs + 1,
+    capped by the database connection budget.
+    """
+    cpus = cpus or cpu_count()
+    requested = settings.web_concurrency or (2 * cpus + 1)
+    budget = max(settings.db_max_connections - RESERVED_DB_CONNECTIONS, 1)
+    by_database = max(budget // connections_per_worker(), 1)
+    return max(min(requested, by_database), 1)
+
+
+def threadpool_size() -> int:
+    """Threads for sync routes; more threads than pooled connections would only wait on the pool"""
+    return settings.threadpool_size or (settings.db_pool_size + settings.db_max_overflow)
+
+
+def hashing_pool_size() -> int:
+    """Password hashing is CPU-bound, so one thread per CPU"""
+    return settings.hashing_pool_size or cpu_count()
+
+
+def configure_threadpool() -> None:
+    """Apply threadpool_size to the threadpool Starlette runs sync endpoints in"""
+    import anyio.to_thread
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threadpool_size()
@@ -0,0 +1,175 @@
+"""
+In-process scheduler for periodic background jobs.
+
+Every worker runs the scheduler loop, but only the leader runs jobs. On Postgres the
+leader is the worker holding a session-level advisory lock on a dedicated connection;
+when it exits or its connection drops the lock is released and another worker takes
+over at its next attempt. Other databases mean a single process, which always leads.
+
+Jobs are plain functions taking a Session. They run one at a time on the scheduler's
+own thread, so they never block the event loop or take a request thread, and every
+run is reported through observe_job_run.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import observe_job_run
+
+logger = logging.getLogger("app.core.scheduler")
+
+# Application-wide key for pg_try_advisory_lock
+LEADER_LOCK_KEY = 7_316_117_301
+
+# How often the loop looks for due jobs and a follower retries the lock
+TICK_SECONDS = 15.0
+
+JobFunction = Callable[[Session], Any]
+
+
+class Job:
+    """A function run every interval_seconds"""
+
+    def __init__(self, name: str, interval_seconds: float, function: JobFunction, initial_delay_seconds: Optional[float] = None) -> None:
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.function = function
+        # Monotonic time the next run is due; workers start staggered rather than all at once
+        self.due_at = time.monotonic() + (interval_seconds if initial_delay_seconds is None else initial_delay_seconds)
+
+
+class LeaderLock:
+    """Postgres advisory lock held on its own connection for as long as this worker leads"""
+
+    def __init__(self, dsn: Optional[str] = None, key: int = LEADER_LOCK_KEY) -> None:
+        self.dsn = dsn or settings.full_database_url
+        self.key = key
+        self._connection = None
+
+    @property
+    def needed(self) -> bool:
+        return self.dsn.startswith("postgres")
+
+    def acquire(self) -> bool:
+        """True if this worker leads; tries to take the lock when it does not"""
+        if not self.needed:
+            return True
+        if self._connection is not None:
+            try:
+                with self._connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                return True
+            except Exception:
+                logger.warning("Scheduler leader connection lost")
+                self.release()
+
+        import psycopg2
+
+        try:
+            connection = psycopg2.connect(self.dsn)
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", (self.key,))
+                locked = cursor.fetchone()[0]
+        except Exception as e:
+            logger.warning(f"Scheduler could not try the leader lock: {type(e).__name__}")
+            return False
+        if not locked:
+            connection.close()
+            return False
+        self._connection = connection
+        logger.info("This worker now runs the background jobs")
+        return True
+
+    def release(self) -> None:
+        # Closing the session releases the advisory lock
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+
+class Scheduler:
+    """Runs due jobs on the leader worker"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        leader_lock: Optional[LeaderLock] = None,
+        tick_seconds: float = TICK_SECONDS
+    ) -> None:
+        self.jobs: List[Job] = []
+        self.tick_seconds = tick_seconds
+        self._session_factory = session_factory
+        self._leader_lock = leader_lock or LeaderLock()
+        # One thread: jobs never overlap, and the lock connection is only used from it
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scheduler")
+        self._task: Optional[asyncio.Task] = None
+
+    def add_job(self, name: str, interval_seconds: float, function: JobFunction, initial_delay_seconds: Optional[float] = None) -> Job:
+        job = Job(name, interval_seconds, function, initial_delay_seconds)
+        self.jobs.append(job)
+        return job
+
+    def run_job(self, job: Job) -> bool:
+        """Run one job now in the calling thread and schedule its next run"""
+        if self._session_factory is None:
+            from app.core.database import SessionLocal
+            self._session_factory = SessionLocal
+
+        started = time.monotonic()
+        lag = started - job.due_at
+        succeeded = False
+        try:
+            with self._session_factory() as db:
+                result = job.function(db)
+            succeeded = True
+            logger.info(f"Job {job.name} finished in {time.monotonic() - started:.2f}s: {result}")
+        except Exception:
+            logger.exception(f"Job {job.name} failed")
+        finally:
+            observe_job_run(job.name, lag, time.monotonic() - started, succeeded, time.time())
+            # A late or slow run does not make the following runs catch up back to back
+            job.due_at = max(job.due_at + job.interval_seconds, time.monotonic())
+        return succeeded
+
+    def _run_due_jobs(self) -> int:
+        if not self._leader_lock.acquire():
+            return 0
+        due = [job for job in self.jobs if job.due_at <= time.monotonic()]
+        for job in due:
+            self.run_job(job)
+        return len(due)
+
+    async def _run_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            try:
+                await loop.run_in_executor(self._executor, self._run_due_jobs)
+            except Exception:
+                logger.exception("Scheduler tick failed")
+
+    def start(self) -> None:
+        """Start the loop on the running event loop (call from the app lifespan)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Queued behind a job that is still running, so the lock is held until it ends
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._leader_lock.release)
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,66 @@
+"""
+Collection versions for conditional GETs.
+
+Every cache namespace (matches, reports, invitations, ... see TABLE_NAMESPACES in
+app/core/invalidation.py) has a counter in badminton.collection_versions. A transaction
+that changes a namespace bumps its counter just before it commits, in the same
+transaction, so the counter moves exactly when the committed data does; it is shared
+by all workers and survives restarts. app/core/conditional.py derives ETags from it.
+
+The bump is one upsert for all the namespaces of the transaction. Its row locks are
+held only from the bump to the commit, and rows are locked in namespace order so two
+transactions never wait on each other in opposite orders.
+"""
+from typing import Dict, Iterable
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import pending_namespaces
+
+
+def bump_versions(connection: Connection, namespaces: Iterable[str]) -> None:
+    """Increment the version of each namespace, creating rows for new ones"""
+    from app.models.collection_versions import CollectionVersion
+
+    rows = [{"namespace": namespace, "version": 1} for namespace in sorted(set(namespaces))]
+    if not rows:
+        return
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    table = CollectionVersion.__table__
+    statement = insert(table).values(rows)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.namespace],
+        set_={"version": table.c.version + 1, "updated_at": func.now()},
+    ))
+
+
+def get_versions(db: Session, namespaces: Iterable[str]) -> Dict[str, int]:
+    """Current version of each namespace; 0 for one that has never changed"""
+    from app.models.collection_versions import CollectionVersion
+
+    namespaces = sorted(set(namespaces))
+    versions = dict.fromkeys(namespaces, 0)
+    versions.update(db.execute(
+        select(CollectionVersion.namespace, CollectionVersion.version).where(CollectionVersion.namespace.in_(namespaces))
+    ).all())
+    return versions
+
+
+def _before_commit(session: Session) -> None:
+    # The commit flushes after this hook runs; flush first so those changes count too
+    session.flush()
+    namespaces = pending_namespaces(session)
+    if namespaces:
+        bump_versions(session.connection(), namespaces)
+
+
+def install_version_hooks() -> None:
+    """Bump collection versions in every ORM transaction that changes them (idempotent)"""
+    if event.contains(Session, "before_commit", _before_commit):
+        return
+    event.listen(Session, "before_commit", _before_commit)
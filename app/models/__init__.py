@@ -3,6 +3,8 @@ from .access_control import Role, PermissionGroup, Permission, AccessControlUser
 from .reports import Report, ReportReaction
 from .report_views import ReportView
 from .posts import Post, Comment, Attachment, PostReaction, CommentReaction
+from .idempotency import IdempotencyKey
+from .collection_versions import CollectionVersion
 
 __all__ = [
     "User",
@@ -20,6 +22,8 @@ __all__ = [
     "Comment",
     "Attachment",
     "PostReaction",
-    "CommentReaction"
+    "CommentReaction",
+    "IdempotencyKey",
+    "CollectionVersion"
 ]
 
@@ -2,6 +2,7 @@ from sqlalchemy import (
     Boolean,
     Column,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -15,7 +16,7 @@ class Role(Base):
     __tablename__ = "Role"
     __table_args__ = {"schema": "access_control"}
 
-    role_id = Column(Integer, primary_key=True, index=True)
+    role_id = Column(Integer, primary_key=True)
     role_name = Column(Text, nullable=False, default="Neuer Benutzertyp")
     locked = Column(Boolean, nullable=False, default=True)
 
@@ -29,7 +30,7 @@ class PermissionGroup(Base):
     __tablename__ = "PermissionGroup"
     __table_args__ = {"schema": "access_control"}
 
-    permission_group_id = Column(Integer, primary_key=True, index=True)
+    permission_group_id = Column(Integer, primary_key=True)
     permission_group_name = Column(Text, nullable=False, unique=True, default="permission_group_x")
 
     # Relationships
@@ -40,7 +41,7 @@ class Permission(Base):
     __tablename__ = "Permission"
     __table_args__ = {"schema": "access_control"}
 
-    permission_id = Column(Integer, primary_key=True, index=True)
+    permission_id = Column(Integer, primary_key=True)
     permission_key = Column(Text, nullable=False, unique=True, default="can_do_x")
     permission_group_id = Column(Integer, ForeignKey("access_control.PermissionGroup.permission_group_id"), nullable=True)
 
@@ -53,7 +54,7 @@ class AccessControlUser(Base):
     __tablename__ = "User"
     __table_args__ = {"schema": "access_control"}
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     username = Column(String(255), unique=True, nullable=False)
     email = Column(String(255), nullable=False)
     first_name = Column(String(255), nullable=True)
@@ -71,7 +72,11 @@ class AccessControlUser(Base):
 
 class RolesPermissions(Base):
     __tablename__ = "RolesPermissions"
-    __table_args__ = {"schema": "access_control"}
+    __table_args__ = (
+        Index("idx_roles_permissions_role_id", "role_id"),
+        Index("idx_roles_permissions_permission_id", "permission_id"),
+        {"schema": "access_control"}
+    )
 
     role_id = Column(Integer, ForeignKey("access_control.Role.role_id"), primary_key=True)
     permission_id = Column(Integer, ForeignKey("access_control.Permission.permission_id"), primary_key=True)
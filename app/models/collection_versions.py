@@ -0,0 +1,12 @@
+from sqlalchemy import BigInteger, Column, DateTime, String
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class CollectionVersion(Base):
+    __tablename__ = "collection_versions"
+    __table_args__ = {"schema": "badminton"}
+
+    namespace = Column(String(32), primary_key=True)    # Cache namespace, e.g. "matches" (app/core/invalidation.py)
+    version = Column(BigInteger, nullable=False, default=0)  # Bumped by every transaction that changes the collection
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
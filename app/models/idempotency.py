@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint('user_id', 'scope', 'key', name='unique_user_scope_idempotency_key'),
+        Index('idx_idempotency_keys_expires_at', 'expires_at'),
+        {"schema": "badminton"}
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("badminton.User.id", ondelete="CASCADE"), nullable=False)
+    scope = Column(String(100), nullable=False)         # Endpoint the key was used on, e.g. "POST /matches"
+    key = Column(String(255), nullable=False)           # Client-supplied Idempotency-Key header
+    request_hash = Column(String(64), nullable=False)   # SHA-256 of the canonical request body
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
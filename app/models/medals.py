@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, CheckConstraint, UniqueConstraint, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, CheckConstraint, UniqueConstraint, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -8,10 +8,13 @@ class Medal(Base):
     __table_args__ = (
         CheckConstraint("medal_type IN ('gold', 'silver', 'bronze', 'wood')", name='check_medal_type'),
         UniqueConstraint('user_id', 'tournament_id', name='unique_user_tournament_medal'),
+        Index('idx_medals_user_id', 'user_id'),
+        Index('idx_medals_tournament_id', 'tournament_id'),
+        Index('idx_medals_medal_type', 'medal_type'),
         {"schema": "badminton"}
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("badminton.User.id", ondelete="CASCADE"), nullable=False)
     tournament_id = Column(Integer, ForeignKey("badminton.Tournament.id", ondelete="CASCADE"), nullable=False)
     position = Column(Integer, nullable=False)
@@ -4,28 +4,48 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    text,
 )
 from sqlalchemy.orm import relationship, Session
 from sqlalchemy.sql import func
 
 from app.common.enums import MatchStatus, MatchType, TournamentStatus
 from app.core.database import Base
+from app.core.invalidation import LocalCache
 
 # Import Medal to ensure it's registered with SQLAlchemy
 from app.models.medals import Medal
 from app.models.tournament_invitations import TournamentParticipant, TournamentInvitation
 
 
+# role_id -> permission keys; any role/permission change clears it on every worker
+_role_permissions_cache = LocalCache("roles", ttl_seconds=60, by_primary_key=False)
+
+
 class User(Base):
     __tablename__ = "User"
-    __table_args__ = {"schema": "badminton"}
-
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String(50), unique=True, index=True, nullable=False)
-    email = Column(String(100), unique=True, index=True, nullable=False)
+    __table_args__ = (
+        Index("idx_user_username", "username"),
+        Index("idx_user_email", "email"),
+        Index("idx_user_role_id", "role_id"),
+        Index("idx_user_profile_picture", "profile_picture_url"),
+        # Autocomplete and name search; pg_trgm and tsvector exist on Postgres only
+        Index("idx_user_username_trgm", text("lower(username) gin_trgm_ops"), postgresql_using="gin").ddl_if(dialect="postgresql"),
+        Index("idx_user_full_name_trgm", text("lower(full_name) gin_trgm_ops"), postgresql_using="gin").ddl_if(dialect="postgresql"),
+        Index(
+            "idx_user_name_search", text("to_tsvector('simple', (coalesce(full_name, '') || ' ') || username)"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        {"schema": "badminton"}
+    )
+
+    id = Column(Integer, primary_key=True)
+    username = Column(String(50), unique=True, nullable=False)
+    email = Column(String(100), unique=True, nullable=False)
     full_name = Column(String(100), nullable=False)
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
@@ -66,30 +86,22 @@ class User(Base):
 
     def has_permission(self, db: Session, permission_key: str) -> bool:
         """Check if user has a specific permission"""
-        if not self.role_id:
-            return False
-        
-        from app.models.access_control import Role, Permission, RolesPermissions
-        
-        permission = db.query(Permission).join(RolesPermissions).join(Role).filter(
-            Role.role_id == self.role_id,
-            Permission.permission_key == permission_key
-        ).first()
-        
-        return permission is not None
+        return permission_key in self.get_permissions(db)
 
     def get_permissions(self, db: Session) -> list[str]:
-        """Get all permissions for the user"""
+        """Get all permissions for the user (cached per role)"""
         if not self.role_id:
             return []
         
         from app.models.access_control import Role, Permission, RolesPermissions
         
-        permissions = db.query(Permission.permission_key).join(RolesPermissions).join(Role).filter(
-            Role.role_id == self.role_id
-        ).all()
+        def load_permissions() -> tuple:
+            permissions = db.query(Permission.permission_key).join(RolesPermissions).join(Role).filter(
+                Role.role_id == self.role_id
+            ).all()
+            return tuple(perm[0] for perm in permissions)
         
-        return [perm[0] for perm in permissions]
+        return list(_role_permissions_cache.get_or_set(self.role_id, load_permissions))
 
     def is_admin(self, db: Session) -> bool:
         """Check if user is admin"""
@@ -106,9 +118,20 @@ class User(Base):
 
 class Match(Base):
     __tablename__ = "Match"
-    __table_args__ = {"schema": "badminton"}
-
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        Index("idx_match_player1_id", "player1_id"),
+        Index("idx_match_player2_id", "player2_id"),
+        Index("idx_match_status", "status"),
+        Index("idx_match_type", "match_type"),
+        # Standings and leaderboards: verified matches of one tournament
+        Index("idx_match_tournament_status", "tournament_id", "status"),
+        Index("idx_match_player1_verified", "player1_verified"),
+        Index("idx_match_player2_verified", "player2_verified"),
+        Index("idx_match_verification_status", "player1_verified", "player2_verified"),
+        {"schema": "badminton"}
+    )
+
+    id = Column(Integer, primary_key=True)
     player1_id = Column(Integer, ForeignKey("badminton.User.id"), nullable=False)
     player2_id = Column(Integer, ForeignKey("badminton.User.id"), nullable=False)
     player1_score = Column(Integer, nullable=False)
@@ -207,9 +230,13 @@ class Match(Base):
 
 class Tournament(Base):
     __tablename__ = "Tournament"
-    __table_args__ = {"schema": "badminton"}
+    __table_args__ = (
+        Index("idx_tournament_is_active", "is_active"),
+        Index("idx_tournament_name_search", text("to_tsvector('simple', name)"), postgresql_using="gin").ddl_if(dialect="postgresql"),
+        {"schema": "badminton"}
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     start_date = Column(DateTime(timezone=True), nullable=False)
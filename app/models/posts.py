@@ -4,16 +4,18 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    text,
     BigInteger,
     JSON,
     UniqueConstraint,
     CheckConstraint
 )
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import false, func
 
 from app.common.enums import AttachmentType
 from app.core.database import Base
@@ -21,9 +23,14 @@ from app.core.database import Base
 
 class Post(Base):
     __tablename__ = "Post"
-    __table_args__ = {"schema": "badminton"}
+    __table_args__ = (
+        Index("idx_post_user_id", "user_id"),
+        Index("idx_post_is_deleted", "is_deleted"),
+        Index("idx_post_content_search", text("to_tsvector('english', content)"), postgresql_using="gin").ddl_if(dialect="postgresql"),
+        {"schema": "badminton"}
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("badminton.User.id", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -38,11 +45,31 @@ class Post(Base):
     reactions = relationship("PostReaction", back_populates="post", cascade="all, delete-orphan")
 
 
+# Descending indexes name the column, so they follow the class
+Index("idx_post_created_at", Post.created_at.desc())
+
+# Feed: newest live posts first. Partial, so deleted posts cost nothing to skip; the
+# predicate is written like the feed's filter so both Postgres and SQLite match it.
+Index(
+    "idx_post_feed",
+    Post.created_at.desc(),
+    postgresql_where=Post.is_deleted == false(),
+    sqlite_where=Post.is_deleted == false(),
+)
+
+
 class Comment(Base):
     __tablename__ = "Comment"
-    __table_args__ = {"schema": "badminton"}
+    __table_args__ = (
+        Index("idx_comment_post_id", "post_id"),
+        Index("idx_comment_user_id", "user_id"),
+        Index("idx_comment_parent_comment_id", "parent_comment_id"),
+        Index("idx_comment_is_deleted", "is_deleted"),
+        Index("idx_comment_content_search", text("to_tsvector('english', content)"), postgresql_using="gin").ddl_if(dialect="postgresql"),
+        {"schema": "badminton"}
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     post_id = Column(Integer, ForeignKey("badminton.Post.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("badminton.User.id", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
@@ -60,6 +87,19 @@ class Comment(Base):
     reactions = relationship("CommentReaction", back_populates="comment", cascade="all, delete-orphan")
 
 
+Index("idx_comment_created_at", Comment.created_at.desc())
+
+# Threads: live top-level comments of a post in posting order
+Index(
+    "idx_comment_thread",
+    Comment.post_id,
+    Comment.parent_comment_id,
+    Comment.created_at,
+    postgresql_where=Comment.is_deleted == false(),
+    sqlite_where=Comment.is_deleted == false(),
+)
+
+
 class Attachment(Base):
     __tablename__ = "Attachment"
     __table_args__ = (
@@ -67,10 +107,20 @@ class Attachment(Base):
             "(post_id IS NOT NULL AND comment_id IS NULL) OR (post_id IS NULL AND comment_id IS NOT NULL)",
             name="attachment_either_post_or_comment"
         ),
+        Index("idx_attachment_post_id", "post_id"),
+        Index("idx_attachment_comment_id", "comment_id"),
+        Index("idx_attachment_file_type", "file_type"),
+        # Uploads whose metadata and renditions are still to be produced
+        Index(
+            "idx_attachment_pending",
+            "created_at",
+            postgresql_where=text("processing_status = 'pending'"),
+            sqlite_where=text("processing_status = 'pending'"),
+        ),
         {"schema": "badminton"}
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     post_id = Column(Integer, ForeignKey("badminton.Post.id", ondelete="CASCADE"), nullable=True)
     comment_id = Column(Integer, ForeignKey("badminton.Comment.id", ondelete="CASCADE"), nullable=True)
     file_type = Column(Enum(AttachmentType), nullable=False)
@@ -79,6 +129,7 @@ class Attachment(Base):
     file_size = Column(BigInteger, nullable=True)
     mime_type = Column(String(100), nullable=True)
     file_metadata = Column(JSON, nullable=True)  # For storing additional file metadata
+    processing_status = Column(String(20), nullable=True)  # Server uploads: pending, ready or failed
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -90,10 +141,12 @@ class PostReaction(Base):
     __tablename__ = "PostReaction"
     __table_args__ = (
         UniqueConstraint('post_id', 'user_id', 'emoji', name='unique_user_emoji_per_post'),
+        Index('idx_post_reaction_post_id', 'post_id'),
+        Index('idx_post_reaction_user_id', 'user_id'),
         {"schema": "badminton"}
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     post_id = Column(Integer, ForeignKey("badminton.Post.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("badminton.User.id", ondelete="CASCADE"), nullable=False)
     emoji = Column(String(10), nullable=False)
@@ -108,10 +161,12 @@ class CommentReaction(Base):
     __tablename__ = "CommentReaction"
     __table_args__ = (
         UniqueConstraint('comment_id', 'user_id', 'emoji', name='unique_user_emoji_per_comment'),
+        Index('idx_comment_reaction_comment_id', 'comment_id'),
+        Index('idx_comment_reaction_user_id', 'user_id'),
         {"schema": "badminton"}
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     comment_id = Column(Integer, ForeignKey("badminton.Comment.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("badminton.User.id", ondelete="CASCADE"), nullable=False)
     emoji = Column(String(10), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -7,10 +7,13 @@ class ReportView(Base):
     __tablename__ = "report_views"
     __table_args__ = (
         UniqueConstraint('report_id', 'user_id', name='unique_report_view'),
+        Index('idx_report_views_report_id', 'report_id'),
+        Index('idx_report_views_user_id', 'user_id'),
+        Index('idx_report_views_viewed_at', 'viewed_at'),
         {"schema": "badminton"}
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     report_id = Column(Integer, ForeignKey("badminton.reports.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("badminton.User.id", ondelete="CASCADE"), nullable=False)
     viewed_at = Column(DateTime(timezone=True), server_default=func.now())
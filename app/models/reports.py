@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -6,9 +6,15 @@ from app.core.database import Base
 
 class Report(Base):
     __tablename__ = "reports"
-    __table_args__ = {"schema": "badminton"}
+    __table_args__ = (
+        Index('idx_reports_created_by', 'created_by_id'),
+        Index('idx_reports_event_date', 'event_date'),
+        Index('idx_reports_created_at', 'created_at'),
+        Index('idx_reports_content_search', text("to_tsvector('english', content)"), postgresql_using='gin').ddl_if(dialect='postgresql'),
+        {"schema": "badminton"}
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     created_by_id = Column(Integer, ForeignKey("badminton.User.id", ondelete="CASCADE"), nullable=False)
     event_date = Column(Date, nullable=False)  # Date when the event happened
     content = Column(Text, nullable=False)     # Free text description
@@ -25,10 +31,12 @@ class ReportReaction(Base):
     __tablename__ = "report_reactions"
     __table_args__ = (
         UniqueConstraint('report_id', 'user_id', 'emoji', name='unique_user_emoji_per_report'),
+        Index('idx_report_reactions_report_id', 'report_id'),
+        Index('idx_report_reactions_user_id', 'user_id'),
         {"schema": "badminton"}
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     report_id = Column(Integer, ForeignKey("badminton.reports.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("badminton.User.id", ondelete="CASCADE"), nullable=False)
     emoji = Column(String(10), nullable=False)  # Store emoji as string
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, CheckConstraint, UniqueConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, CheckConstraint, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -8,10 +8,12 @@ class TournamentParticipant(Base):
     __tablename__ = "tournament_participants"
     __table_args__ = (
         UniqueConstraint('tournament_id', 'user_id', name='unique_tournament_participant'),
+        Index('idx_tournament_participants_tournament_id', 'tournament_id'),
+        Index('idx_tournament_participants_user_id', 'user_id'),
         {"schema": "badminton"}
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     tournament_id = Column(Integer, ForeignKey("badminton.Tournament.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("badminton.User.id", ondelete="CASCADE"), nullable=False)
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -26,10 +28,13 @@ class TournamentInvitation(Base):
     __table_args__ = (
         CheckConstraint("status IN ('pending', 'accepted', 'declined', 'expired')", name='check_invitation_status'),
         UniqueConstraint('tournament_id', 'user_id', name='unique_tournament_invitation'),
+        Index('idx_tournament_invitations_tournament_id', 'tournament_id'),
+        Index('idx_tournament_invitations_user_id', 'user_id'),
+        Index('idx_tournament_invitations_status', 'status'),
         {"schema": "badminton"}
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     tournament_id = Column(Integer, ForeignKey("badminton.Tournament.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("badminton.User.id", ondelete="CASCADE"), nullable=False)
     invited_by = Column(Integer, ForeignKey("badminton.User.id", ondelete="CASCADE"), nullable=False)
@@ -1,7 +1,7 @@
 from datetime import datetime, date
 from typing import Optional, List, Dict
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 from app.common.enums import MatchStatus, MatchType, TournamentStatus, InvitationStatus, AttachmentType
 
@@ -42,6 +42,13 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+class UserSuggestion(BaseModel):
+    """Typeahead entry for user pickers"""
+    id: int
+    username: str
+    full_name: str
+    profile_picture_url: Optional[str] = None
+
 class UserLogin(BaseModel):
     username: str
     password: str
@@ -59,7 +66,8 @@ class MatchBase(BaseModel):
 class MatchCreate(MatchBase):
     pass
 
-class MatchResponse(MatchBase):
+class MatchSummary(MatchBase):
+    """Match data without nested user objects"""
     id: int
     status: MatchStatus
     submitted_by_id: int
@@ -71,13 +79,20 @@ class MatchResponse(MatchBase):
     player2_verified: bool
     player1_verified_by_id: Optional[int]
     player2_verified_by_id: Optional[int]
+
+    class Config:
+        from_attributes = True
+
+class MatchResponse(MatchSummary):
     # Player relationship fields
     player1: Optional[UserResponse] = None
     player2: Optional[UserResponse] = None
     submitted_by: Optional[UserResponse] = None
 
-    class Config:
-        from_attributes = True
+class MatchesResponse(BaseModel):
+    """Normalized match list with a separate users lookup"""
+    matches: List[MatchSummary]
+    users: Dict[str, UserSuggestion]  # user_id as string key
 
 class MatchVerification(BaseModel):
     verified: bool
@@ -220,6 +235,45 @@ class TournamentInvitationResponse(TournamentInvitationBase):
     class Config:
         from_attributes = True
 
+class BulkInvitationCreate(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1, max_length=200)  # One club per request
+
+class BulkInvitationOutcome(BaseModel):
+    user_id: int
+    status: str  # invited, joined, already_invited, already_participant or user_not_found
+    invitation_id: Optional[int] = None
+
+class BulkInvitationResponse(BaseModel):
+    tournament_id: int
+    invited_count: int
+    outcomes: List[BulkInvitationOutcome]
+
+class InvitationTournamentSummary(BaseModel):
+    """What the invitation inbox shows of a tournament"""
+    id: int
+    name: str
+    description: Optional[str] = None
+    start_date: datetime
+    is_active: bool
+    status: str
+    created_at: datetime
+    participant_count: int
+    invitation_count: int
+
+class InvitationInboxItem(BaseModel):
+    """One entry of the current user's invitation inbox"""
+    id: int
+    tournament_id: int
+    user_id: int
+    invited_by: int
+    status: str
+    invited_at: datetime
+    responded_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    tournament: Optional[InvitationTournamentSummary] = None
+    user: Optional[UserSuggestion] = None
+    inviter: Optional[UserSuggestion] = None
+
 class TournamentInvitationUpdate(BaseModel):
     status: str
 
@@ -287,11 +341,28 @@ class AttachmentCreate(AttachmentBase):
 
 class AttachmentResponse(AttachmentBase):
     id: int
+    processing_status: Optional[str] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+class UploadSessionCreate(BaseModel):
+    file_name: str = Field(..., min_length=1, max_length=255)
+    mime_type: Optional[str] = None
+    size: int = Field(..., gt=0)
+
+class UploadSessionResponse(BaseModel):
+    id: str
+    file_name: str
+    mime_type: Optional[str] = None
+    size: int
+    offset: int  # Bytes received; the next PATCH starts here
+
+class UploadComplete(BaseModel):
+    post_id: Optional[int] = None
+    comment_id: Optional[int] = None
+
 class PostReactionBase(BaseModel):
     emoji: str
 
@@ -387,5 +458,27 @@ class PostsResponse(BaseModel):
     users: Dict[str, UserResponse]  # user_id as string key
     total_count: Optional[int] = None
 
+# Unified search
+class SearchHit(BaseModel):
+    """One search result with just enough to render a result row"""
+    type: str  # post, comment, report, user or tournament
+    id: int
+    score: float
+    title: str
+    snippet: Optional[str] = None
+    created_at: Optional[datetime] = None
+    user_id: Optional[int] = None  # Author for posts, comments and reports
+    user_full_name: Optional[str] = None
+    post_id: Optional[int] = None  # Parent post of a comment
+    profile_picture_url: Optional[str] = None
+    status: Optional[str] = None  # Tournament status
+
+class SearchResponse(BaseModel):
+    hits: List[SearchHit]
+    counts: Dict[str, int]  # Matches per type
+    total_count: int
+    skip: int
+    limit: int
+
 # Update forward reference for nested comments
 CommentResponse.model_rebuild()
@@ -0,0 +1,503 @@
+"""
+Attachment uploads for posts and comments.
+
+Files are streamed into the media store (app/core/media.py) either in one multipart
+request or through a resumable upload: the client opens a session, sends the bytes
+with PATCH requests carrying Upload-Offset, and after a dropped connection asks for
+the offset the server has and continues from there. Sessions live in the store's
+staging directory as upload-<id>.part plus a JSON sidecar.
+
+The Attachment row is written as soon as the original is stored, with
+processing_status "pending", and a worker then fills file_metadata:
+
+- images: width and height, a DISPLAY_SIZE JPEG for the feed and a THUMBNAIL_SIZE one
+  for previews; GIFs keep their animated original and only get the thumbnail
+- video: duration, dimensions and codecs, an H.264 MP4 at most VIDEO_HEIGHT lines high
+  with faststart so playback starts before the download ends, and a poster frame
+- audio: duration and codec
+
+Video and audio need ffmpeg and ffprobe on PATH; without them the original is served
+as is. Renditions are keyed by the original's digest, so the same file uploaded again
+renders nothing, and file_metadata["renditions"] maps each to its /media URL.
+"""
+import contextlib
+import fcntl
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import shutil
+import subprocess
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+import anyio
+from fastapi import HTTPException, status
+from PIL import Image, UnidentifiedImageError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.common.enums import AttachmentType, ProcessingStatus
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.media import (
+    CHUNK_SIZE, KEY_PATTERN, MediaStore, StagedUpload, get_media_store, key_from_url, media_extension,
+    media_key, media_url, stage_upload, staging_file,
+)
+from app.models.posts import Attachment, Comment, Post
+from app.services.profile_picture_service import MAX_PIXELS, to_rgb
+
+logger = logging.getLogger("app.services.attachments")
+
+DISPLAY_SIZE = 1280
+THUMBNAIL_SIZE = 320
+RENDITION_QUALITY = 82
+VIDEO_HEIGHT = 720
+FFMPEG_TIMEOUT = 30 * 60
+
+# Sessions untouched for this long are abandoned; purge_stale_uploads removes them
+UPLOAD_SESSION_TTL = timedelta(days=1)
+# Pending rows older than this lost their worker (e.g. to a restart) and are retried
+PROCESSING_RETRY_AFTER = timedelta(minutes=10)
+
+UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# Probing, transcoding and resizing run here, off the request path
+_processing_pool = ThreadPoolExecutor(max_workers=settings.image_workers, thread_name_prefix="attachments")
+
+
+def attachment_type(mime_type: str) -> AttachmentType:
+    if mime_type == "image/gif":
+        return AttachmentType.GIF
+    for prefix, file_type in (("image/", AttachmentType.IMAGE), ("video/", AttachmentType.VIDEO), ("audio/", AttachmentType.AUDIO)):
+        if mime_type.startswith(prefix):
+            return file_type
+    return AttachmentType.DOCUMENT
+
+
+def _mime_type(declared: Optional[str], file_name: str) -> str:
+    """The client's Content-Type, or a guess from the file name when it sent none"""
+    declared = (declared or "").split(";")[0].strip().lower()
+    if declared and declared != "application/octet-stream":
+        return declared
+    return mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+
+
+def _check_target(db: Session, user_id: int, post_id: Optional[int], comment_id: Optional[int]) -> None:
+    """404 unless exactly one of post_id and comment_id is given and the user wrote it"""
+    if (post_id is None) == (comment_id is None):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Give either post_id or comment_id")
+    if post_id is not None:
+        found = db.query(Post.id).filter(Post.id == post_id, Post.user_id == user_id, Post.is_deleted.is_(False)).first()
+        detail = "Post not found or you don't have permission to add attachments to it"
+    else:
+        found = db.query(Comment.id).filter(Comment.id == comment_id, Comment.user_id == user_id, Comment.is_deleted.is_(False)).first()
+        detail = "Comment not found or you don't have permission to add attachments to it"
+    if not found:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+def _save(db: Session, attachment: Attachment) -> Attachment:
+    db.add(attachment)
+    db.commit()
+    db.refresh(attachment)
+    return attachment
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File size must be less than {settings.max_upload_size // (1024 * 1024)}MB",
+    )
+
+
+async def _create_attachment(
+    db: Session,
+    store: MediaStore,
+    staged: StagedUpload,
+    file_name: str,
+    mime_type: Optional[str],
+    post_id: Optional[int],
+    comment_id: Optional[int],
+) -> Attachment:
+    """Move a staged upload into the store, record it and queue its processing"""
+    mime_type = _mime_type(mime_type, file_name)
+    # The extension decides how /media serves the blob, so it never comes from the file name
+    key = media_key(staged.digest, media_extension(mime_type))
+    try:
+        await run_in_threadpool(store.save, key, staged.path)
+    finally:
+        await run_in_threadpool(staged.path.unlink, missing_ok=True)
+
+    attachment = Attachment(
+        post_id=post_id,
+        comment_id=comment_id,
+        file_type=attachment_type(mime_type),
+        file_path=media_url(key),
+        file_name=file_name[:255],
+        file_size=staged.size,
+        mime_type=mime_type[:100],
+        processing_status=ProcessingStatus.PENDING.value,
+    )
+    await run_in_threadpool(_save, db, attachment)
+    enqueue_processing(attachment.id)
+    return attachment
+
+
+async def upload_attachment(
+    db: Session,
+    user_id: int,
+    chunks: AsyncIterator[bytes],
+    file_name: str,
+    mime_type: Optional[str],
+    post_id: Optional[int] = None,
+    comment_id: Optional[int] = None,
+) -> Attachment:
+    """Stream a whole file into the store and attach it to the user's post or comment"""
+    await run_in_threadpool(_check_target, db, user_id, post_id, comment_id)
+    store = get_media_store()
+    staged = await stage_upload(chunks, settings.max_upload_size, store)
+    return await _create_attachment(db, store, staged, file_name, mime_type, post_id, comment_id)
+
+
+# Resumable uploads
+
+@dataclass
+class UploadSession:
+    id: str
+    user_id: int
+    file_name: str
+    mime_type: Optional[str]
+    size: int
+    offset: int = 0
+
+
+def _session_paths(upload_id: str, store: MediaStore):
+    directory = store.staging_dir()
+    return directory / f"upload-{upload_id}.json", directory / f"upload-{upload_id}.part"
+
+
+def start_upload(user_id: int, file_name: str, mime_type: Optional[str], size: int) -> UploadSession:
+    """Open a resumable upload of size bytes"""
+    if size > settings.max_upload_size:
+        raise _too_large()
+    store = get_media_store()
+    session = UploadSession(uuid.uuid4().hex, user_id, file_name, mime_type, size)
+    info_path, part_path = _session_paths(session.id, store)
+    info_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path.touch()
+    info_path.write_text(json.dumps(asdict(session)))
+    return session
+
+
+def get_upload(upload_id: str, user_id: int) -> UploadSession:
+    """The user's upload session with the number of bytes received so far"""
+    session = None
+    if UPLOAD_ID_PATTERN.match(upload_id):
+        info_path, part_path = _session_paths(upload_id, get_media_store())
+        try:
+            session = UploadSession(**json.loads(info_path.read_text()))
+            session.offset = part_path.stat().st_size
+        except FileNotFoundError:
+            session = None
+    if session is None or session.user_id != user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    return session
+
+
+@contextlib.contextmanager
+def _locked(handle) -> Iterator[None]:
+    """Exclusive hold on a session's part file; 409 while another request has it"""
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Another request is writing this upload") from None
+    yield
+
+
+async def append_upload(upload_id: str, user_id: int, offset: int, chunks: AsyncIterator[bytes]) -> UploadSession:
+    """Append chunks at offset, which must be the number of bytes received so far"""
+    session = await run_in_threadpool(get_upload, upload_id, user_id)
+    info_path, part_path = _session_paths(upload_id, get_media_store())
+    async with await anyio.open_file(part_path, "ab") as handle:
+        with _locked(handle.wrapped):
+            position = os.fstat(handle.wrapped.fileno()).st_size
+            if offset != position:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT, detail=f"Upload-Offset must be {position}"
+                )
+            try:
+                async for chunk in chunks:
+                    if position + len(chunk) > session.size:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"The upload was opened for {session.size} bytes",
+                        )
+                    await handle.write(chunk)
+                    position += len(chunk)
+            finally:
+                # Whatever arrived before a dropped connection is kept for the retry
+                await handle.flush()
+                await run_in_threadpool(os.utime, info_path)
+    session.offset = position
+    return session
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        while chunk := source.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def complete_upload(
+    db: Session,
+    upload_id: str,
+    user_id: int,
+    post_id: Optional[int] = None,
+    comment_id: Optional[int] = None,
+) -> Attachment:
+    """Attach a fully received upload to the user's post or comment"""
+    session = await run_in_threadpool(get_upload, upload_id, user_id)
+    await run_in_threadpool(_check_target, db, user_id, post_id, comment_id)
+    if session.offset != session.size:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload incomplete: {session.offset} of {session.size} bytes received",
+        )
+    store = get_media_store()
+    info_path, part_path = _session_paths(upload_id, store)
+    # Take the part file away from the session first, so a concurrent complete finds nothing
+    staged_path = await run_in_threadpool(staging_file, store)
+    try:
+        await run_in_threadpool(os.replace, part_path, staged_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found") from None
+    await run_in_threadpool(info_path.unlink, missing_ok=True)
+    try:
+        digest = await run_in_threadpool(_hash_file, staged_path)
+    except BaseException:
+        await run_in_threadpool(staged_path.unlink, missing_ok=True)
+        raise
+    staged = StagedUpload(staged_path, digest, session.size)
+    return await _create_attachment(db, store, staged, session.file_name, session.mime_type, post_id, comment_id)
+
+
+def cancel_upload(upload_id: str, user_id: int) -> None:
+    get_upload(upload_id, user_id)
+    for path in _session_paths(upload_id, get_media_store()):
+        path.unlink(missing_ok=True)
+
+
+def purge_stale_uploads(db: Optional[Session] = None, store: Optional[MediaStore] = None) -> int:
+    """Delete upload sessions and staging files untouched for UPLOAD_SESSION_TTL"""
+    store = store or get_media_store()
+    cutoff = (datetime.now(timezone.utc) - UPLOAD_SESSION_TTL).timestamp()
+    removed = 0
+    directory = store.staging_dir()
+    if not directory.is_dir():
+        return 0
+    for path in directory.iterdir():
+        try:
+            if path.stat().st_mtime > cutoff:
+                continue
+            # A session is as old as its sidecar, which every PATCH touches
+            if path.suffix == ".part" and path.with_suffix(".json").exists() and path.with_suffix(".json").stat().st_mtime > cutoff:
+                continue
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        removed += 1
+    return removed
+
+
+# Processing
+
+def render_rendition(source: Path, destination: Path, size: int) -> None:
+    """JPEG of source scaled down to fit a size x size box"""
+    with Image.open(source) as image:
+        if image.width * image.height > MAX_PIXELS:
+            raise UnidentifiedImageError("image too large")
+        image.draft("RGB", (size, size))
+        image = to_rgb(image)
+    # Never enlarged; EXIF (location included) is not copied
+    image.thumbnail((size, size), Image.LANCZOS)
+    image.save(destination, "JPEG", quality=RENDITION_QUALITY, optimize=True, progressive=True)
+
+
+def _rendition(store: MediaStore, source: Path, digest: str, variant: str, size: int) -> str:
+    key = media_key(digest, "jpg", variant=variant)
+    if not store.exists(key):
+        destination = staging_file(store)
+        try:
+            render_rendition(source, destination, size)
+            store.save(key, destination)
+        finally:
+            destination.unlink(missing_ok=True)
+    return media_url(key)
+
+
+def _process_image(store: MediaStore, source: Path, digest: str, animated: bool) -> Dict:
+    with Image.open(source) as image:
+        width, height = image.size
+        # Orientations 5 to 8 are rotated a quarter turn
+        if image.getexif().get(0x0112, 1) in (5, 6, 7, 8):
+            width, height = height, width
+        metadata = {"width": width, "height": height, "format": image.format}
+        if getattr(image, "n_frames", 1) > 1:
+            metadata["frames"] = image.n_frames
+    renditions = {"thumbnail": _rendition(store, source, digest, f"thumb{THUMBNAIL_SIZE}", THUMBNAIL_SIZE)}
+    if not animated:
+        renditions["display"] = _rendition(store, source, digest, f"display{DISPLAY_SIZE}", DISPLAY_SIZE)
+    return {**metadata, "renditions": renditions}
+
+
+def _probe(ffprobe: str, source: Path) -> Dict:
+    result = subprocess.run(
+        [ffprobe, "-v", "error", "-print_format", "json", "-show_format", "-show_streams", str(source)],
+        capture_output=True, check=True, timeout=FFMPEG_TIMEOUT,
+    )
+    info = json.loads(result.stdout)
+    metadata = {}
+    if info.get("format", {}).get("duration"):
+        metadata["duration"] = round(float(info["format"]["duration"]), 3)
+    streams = info.get("streams", [])
+    video = next((stream for stream in streams if stream.get("codec_type") == "video"), None)
+    audio = next((stream for stream in streams if stream.get("codec_type") == "audio"), None)
+    if video:
+        metadata.update(width=video.get("width"), height=video.get("height"), video_codec=video.get("codec_name"))
+    if audio:
+        metadata["audio_codec"] = audio.get("codec_name")
+    return metadata
+
+
+def _ffmpeg(*arguments: str) -> None:
+    subprocess.run(
+        [shutil.which("ffmpeg"), "-nostdin", "-v", "error", "-y", *arguments],
+        capture_output=True, check=True, timeout=FFMPEG_TIMEOUT,
+    )
+
+
+def _process_video(store: MediaStore, source: Path, digest: str) -> Dict:
+    ffprobe = shutil.which("ffprobe")
+    if not ffprobe:
+        return {}
+    metadata = _probe(ffprobe, source)
+    if not shutil.which("ffmpeg") or not metadata.get("width"):
+        return metadata
+
+    renditions = {}
+    frame = staging_file(store)
+    try:
+        # A second in, past fade-ins and black first frames
+        position = min(1.0, metadata.get("duration", 0) / 2)
+        _ffmpeg("-ss", str(position), "-i", str(source), "-frames:v", "1", "-f", "image2", "-c:v", "mjpeg", str(frame))
+        renditions["poster"] = _rendition(store, frame, digest, f"poster{DISPLAY_SIZE}", DISPLAY_SIZE)
+        renditions["thumbnail"] = _rendition(store, frame, digest, f"thumb{THUMBNAIL_SIZE}", THUMBNAIL_SIZE)
+    finally:
+        frame.unlink(missing_ok=True)
+
+    key = media_key(digest, "mp4", variant=f"video{VIDEO_HEIGHT}")
+    if not store.exists(key):
+        encoded = staging_file(store)
+        try:
+            _ffmpeg(
+                "-i", str(source), "-map", "0:v:0", "-map", "0:a:0?",
+                "-c:v", "libx264", "-preset", "veryfast", "-crf", "23", "-pix_fmt", "yuv420p",
+                "-vf", f"scale=-2:'min({VIDEO_HEIGHT},ih)'",
+                "-c:a", "aac", "-b:a", "128k", "-movflags", "+faststart", "-f", "mp4", str(encoded),
+            )
+            store.save(key, encoded)
+        finally:
+            encoded.unlink(missing_ok=True)
+    renditions["video"] = media_url(key)
+    return {**metadata, "renditions": renditions}
+
+
+def _process_audio(source: Path) -> Dict:
+    ffprobe = shutil.which("ffprobe")
+    return _probe(ffprobe, source) if ffprobe else {}
+
+
+@contextlib.contextmanager
+def _local_copy(store: MediaStore, key: str) -> Iterator[Path]:
+    """A filesystem path holding the blob, downloaded to staging for remote stores"""
+    path = store.local_path(key)
+    if path is not None:
+        yield path
+        return
+    path = staging_file(store)
+    try:
+        with store.open(key) as body, open(path, "wb") as copy:
+            shutil.copyfileobj(body, copy, CHUNK_SIZE)
+        yield path
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def process_attachment(db: Session, attachment_id: int, store: Optional[MediaStore] = None) -> Optional[str]:
+    """Extract a pending attachment's metadata and render its renditions; returns the new status"""
+    attachment = db.get(Attachment, attachment_id)
+    if attachment is None or attachment.processing_status != ProcessingStatus.PENDING.value:
+        return None
+    store = store or get_media_store()
+    key = key_from_url(attachment.file_path)
+    digest = KEY_PATTERN.match(key)["digest"]
+
+    try:
+        with _local_copy(store, key) as source:
+            if attachment.file_type in (AttachmentType.IMAGE, AttachmentType.GIF):
+                metadata = _process_image(store, source, digest, animated=attachment.file_type == AttachmentType.GIF)
+            elif attachment.file_type == AttachmentType.VIDEO:
+                metadata = _process_video(store, source, digest)
+            elif attachment.file_type == AttachmentType.AUDIO:
+                metadata = _process_audio(source)
+            else:
+                metadata = {}
+        attachment.processing_status = ProcessingStatus.READY.value
+    except (OSError, ValueError, Image.DecompressionBombError, subprocess.SubprocessError):
+        # Pillow raises OSError for anything it cannot decode, ffmpeg exits non-zero
+        logger.warning("Could not process attachment %s", attachment_id, exc_info=True)
+        metadata = {"error": "The file could not be processed"}
+        attachment.processing_status = ProcessingStatus.FAILED.value
+    attachment.file_metadata = {**(attachment.file_metadata or {}), **metadata}
+    db.commit()
+    return attachment.processing_status
+
+
+def _process_in_new_session(attachment_id: int) -> None:
+    db = SessionLocal()
+    try:
+        process_attachment(db, attachment_id)
+    except Exception:
+        logger.exception("Processing attachment %s failed", attachment_id)
+    finally:
+        db.close()
+
+
+def enqueue_processing(attachment_id: int) -> None:
+    """Process an attachment in the worker pool"""
+    _processing_pool.submit(_process_in_new_session, attachment_id)
+
+
+def process_pending_attachments(db: Session, batch_size: Optional[int] = None) -> int:
+    """Process attachments left pending by a worker that never finished; returns how many"""
+    cutoff = datetime.now(timezone.utc) - PROCESSING_RETRY_AFTER
+    ids = db.execute(
+        select(Attachment.id)
+        .where(Attachment.processing_status == ProcessingStatus.PENDING.value, Attachment.created_at <= cutoff)
+        .order_by(Attachment.created_at)
+        .limit(batch_size or settings.housekeeping_batch_size)
+    ).scalars().all()
+    db.commit()
+    for attachment_id in ids:
+        process_attachment(db, attachment_id)
+    return len(ids)
@@ -0,0 +1,188 @@
+"""
+Periodic housekeeping, run by the scheduler off the request path.
+
+Each job works in set-based batches: one statement touches up to
+housekeeping_batch_size rows and is committed on its own, so no job holds locks on a
+large part of a table or keeps one long transaction open. The statements go through
+Core tables and return the ids they changed, which are marked on the session and
+published on the invalidation bus when the batch commits; the ORM session hooks would
+drop whole namespaces instead.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, exists, func, select, update
+from sqlalchemy.orm import Session, aliased
+
+from app.common.enums import InvitationStatus
+from app.core.config import settings
+from app.core.invalidation import mark_changed
+from app.core.media import KEY_PATTERN, MEDIA_URL_PREFIX, MediaStore, get_media_store, key_from_url
+from app.core.scheduler import Scheduler
+from app.models.models import User
+from app.models.posts import Attachment, Comment, Post
+from app.models.tournament_invitations import TournamentInvitation
+from app.services.attachment_service import process_pending_attachments, purge_stale_uploads
+from app.services.idempotency_service import purge_expired_idempotency_keys
+
+# Seconds between runs
+EXPIRE_INVITATIONS_INTERVAL = 5 * 60
+REFRESH_COMMENT_COUNTS_INTERVAL = 15 * 60
+PURGE_DELETED_CONTENT_INTERVAL = 60 * 60
+PURGE_IDEMPOTENCY_KEYS_INTERVAL = 60 * 60
+PURGE_UNREFERENCED_MEDIA_INTERVAL = 24 * 60 * 60
+PROCESS_PENDING_ATTACHMENTS_INTERVAL = 10 * 60
+PURGE_STALE_UPLOADS_INTERVAL = 60 * 60
+
+# Blobs younger than this are kept even when unreferenced: the upload that stored one
+# may not have committed the row pointing at it yet
+MEDIA_GRACE_PERIOD = timedelta(days=1)
+
+
+def _batch_size(batch_size: Optional[int]) -> int:
+    return batch_size or settings.housekeeping_batch_size
+
+
+def _run_batches(db: Session, namespace: str, statement_for_batch) -> int:
+    """Execute and commit batches until one comes back short; returns the rows changed"""
+    total = 0
+    while True:
+        statement, batch_size = statement_for_batch()
+        ids = db.execute(statement).scalars().all()
+        mark_changed(db, namespace, ids)
+        db.commit()
+        total += len(ids)
+        if len(ids) < batch_size:
+            return total
+
+
+def expire_invitations(db: Session, batch_size: Optional[int] = None) -> int:
+    """Mark pending invitations past expires_at as expired"""
+    batch_size = _batch_size(batch_size)
+    invitations = TournamentInvitation.__table__
+    now = datetime.now(timezone.utc)
+
+    def statement():
+        batch = (
+            select(invitations.c.id)
+            .where(invitations.c.status == InvitationStatus.PENDING.value, invitations.c.expires_at <= now)
+            .limit(batch_size)
+        )
+        return (
+            update(invitations)
+            .where(invitations.c.id.in_(batch.scalar_subquery()))
+            .values(status=InvitationStatus.EXPIRED.value)
+            .returning(invitations.c.id)
+        ), batch_size
+
+    return _run_batches(db, "invitations", statement)
+
+
+def purge_deleted_content(db: Session, retention_days: Optional[int] = None, batch_size: Optional[int] = None) -> int:
+    """Hard-delete posts and comments soft-deleted more than retention_days ago"""
+    batch_size = _batch_size(batch_size)
+    retention_days = settings.soft_delete_retention_days if retention_days is None else retention_days
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    comments = Comment.__table__
+    posts = Post.__table__
+    replies = aliased(comments)
+
+    def comment_statement():
+        batch = (
+            select(comments.c.id)
+            .where(
+                comments.c.is_deleted.is_(True),
+                comments.c.updated_at <= cutoff,
+                # Deleting a comment cascades to its replies; wait until they are gone
+                ~exists().where(replies.c.parent_comment_id == comments.c.id),
+            )
+            .limit(batch_size)
+        )
+        return delete(comments).where(comments.c.id.in_(batch.scalar_subquery())).returning(comments.c.id), batch_size
+
+    def post_statement():
+        batch = (
+            select(posts.c.id)
+            .where(posts.c.is_deleted.is_(True), posts.c.updated_at <= cutoff)
+            .limit(batch_size)
+        )
+        return delete(posts).where(posts.c.id.in_(batch.scalar_subquery())).returning(posts.c.id), batch_size
+
+    return _run_batches(db, "posts", comment_statement) + _run_batches(db, "posts", post_statement)
+
+
+def refresh_comment_counts(db: Session, batch_size: Optional[int] = None) -> int:
+    """Correct Post.comment_count wherever it drifted from the live comments"""
+    batch_size = _batch_size(batch_size)
+    posts = Post.__table__
+    comments = Comment.__table__
+    live_comments = (
+        select(func.count(comments.c.id))
+        .where(comments.c.post_id == posts.c.id, comments.c.is_deleted.is_(False))
+        .scalar_subquery()
+    )
+    last_id = db.execute(select(func.max(posts.c.id))).scalar() or 0
+    db.commit()
+
+    corrected = 0
+    # Windows of post ids rather than LIMIT: most posts are already correct
+    for window_start in range(0, last_id, batch_size):
+        ids = db.execute(
+            update(posts)
+            .where(posts.c.id > window_start, posts.c.id <= window_start + batch_size, posts.c.comment_count != live_comments)
+            # Keep updated_at: it is the edit time clients show and the purge cutoff
+            .values(comment_count=live_comments, updated_at=posts.c.updated_at)
+            .returning(posts.c.id)
+        ).scalars().all()
+        mark_changed(db, "posts", ids)
+        db.commit()
+        corrected += len(ids)
+    return corrected
+
+
+def _referenced_media_digests(db: Session) -> set:
+    digests = set()
+    for column in (User.profile_picture_url, Attachment.file_path):
+        rows = db.execute(
+            select(column).where(column.like(f"{MEDIA_URL_PREFIX}/%")).execution_options(yield_per=_batch_size(None))
+        )
+        for (url,) in rows:
+            key = key_from_url(url)
+            if key:
+                digests.add(KEY_PATTERN.match(key)["digest"])
+    return digests
+
+
+def purge_unreferenced_media(db: Session, store: Optional[MediaStore] = None) -> int:
+    """Delete media blobs whose digest no user or attachment refers to"""
+    store = store or get_media_store()
+    cutoff = datetime.now(timezone.utc) - MEDIA_GRACE_PERIOD
+    # Listed before the references are read, so a blob stored meanwhile is not a candidate
+    candidates = [blob.key for blob in store.iter_blobs() if blob.modified <= cutoff]
+    referenced = _referenced_media_digests(db)
+    db.commit()
+
+    removed = 0
+    for key in candidates:
+        if KEY_PATTERN.match(key)["digest"] in referenced:
+            continue
+        # A re-upload of the same bytes touches the blob; it is in use again
+        info = store.stat(key)
+        if info is None or info.modified > cutoff:
+            continue
+        store.delete(key)
+        removed += 1
+    return removed
+
+
+def create_scheduler() -> Scheduler:
+    """Scheduler with every housekeeping job"""
+    scheduler = Scheduler()
+    scheduler.add_job("expire_invitations", EXPIRE_INVITATIONS_INTERVAL, expire_invitations, initial_delay_seconds=60)
+    scheduler.add_job("refresh_comment_counts", REFRESH_COMMENT_COUNTS_INTERVAL, refresh_comment_counts)
+    scheduler.add_job("purge_deleted_content", PURGE_DELETED_CONTENT_INTERVAL, purge_deleted_content)
+    scheduler.add_job("purge_expired_idempotency_keys", PURGE_IDEMPOTENCY_KEYS_INTERVAL, purge_expired_idempotency_keys)
+    scheduler.add_job("purge_unreferenced_media", PURGE_UNREFERENCED_MEDIA_INTERVAL, purge_unreferenced_media)
+    scheduler.add_job("process_pending_attachments", PROCESS_PENDING_ATTACHMENTS_INTERVAL, process_pending_attachments)
+    scheduler.add_job("purge_stale_uploads", PURGE_STALE_UPLOADS_INTERVAL, purge_stale_uploads)
+    return scheduler
@@ -0,0 +1,107 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.idempotency import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def hash_request(payload: Any) -> str:
+    """Return a stable SHA-256 fingerprint of a request body"""
+    canonical = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def validate_idempotency_key(key: str) -> None:
+    """Reject keys that cannot be stored"""
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{IDEMPOTENCY_HEADER} must be between 1 and {MAX_KEY_LENGTH} characters"
+        )
+
+
+def get_idempotent_response(
+    db: Session,
+    user_id: int,
+    scope: str,
+    key: str,
+    request_hash: str
+) -> Optional[JSONResponse]:
+    """Return the stored response for a previously completed request, if any"""
+    record = db.query(IdempotencyKey).filter(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.scope == scope,
+        IdempotencyKey.key == key,
+        IdempotencyKey.expires_at > datetime.now(timezone.utc)
+    ).first()
+
+    if not record:
+        return None
+
+    if record.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{IDEMPOTENCY_HEADER} has already been used with a different request body"
+        )
+
+    return JSONResponse(
+        content=record.response_body,
+        status_code=record.status_code,
+        headers={REPLAYED_HEADER: "true"}
+    )
+
+
+def save_idempotent_response(
+    db: Session,
+    user_id: int,
+    scope: str,
+    key: str,
+    request_hash: str,
+    response_body: Any,
+    status_code: int = status.HTTP_200_OK
+) -> IdempotencyKey:
+    """
+    Record the response for an idempotency key.
+    Does not commit, so the key is stored in the same transaction as the write it guards.
+    """
+    now = datetime.now(timezone.utc)
+
+    # An expired key may be reused; drop the stale record first
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.scope == scope,
+        IdempotencyKey.key == key,
+        IdempotencyKey.expires_at <= now
+    ).delete(synchronize_session=False)
+
+    record = IdempotencyKey(
+        user_id=user_id,
+        scope=scope,
+        key=key,
+        request_hash=request_hash,
+        status_code=status_code,
+        response_body=jsonable_encoder(response_body),
+        expires_at=now + timedelta(hours=settings.idempotency_key_ttl_hours)
+    )
+    db.add(record)
+    return record
+
+
+def purge_expired_idempotency_keys(db: Session) -> int:
+    """Delete all expired idempotency records in a single statement"""
+    deleted = db.query(IdempotencyKey).filter(
+        IdempotencyKey.expires_at <= datetime.now(timezone.utc)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
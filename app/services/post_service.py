@@ -1,8 +1,9 @@
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import desc, asc, func, and_, or_
 
 from app.models.posts import Post, Comment, Attachment, PostReaction, CommentReaction
+from app.core.fields import Computed, load_fields, render_fields
 from app.models.models import User
 from app.schemas.schemas import (
     PostCreate, PostUpdate, PostResponse,
@@ -28,13 +29,22 @@ class PostService:
         self.db.refresh(db_post)
         return self._format_post_response(db_post)
 
-    def get_posts(self, skip: int = 0, limit: int = 20, user_id: Optional[int] = None) -> List[PostResponse]:
-        """Get posts with pagination, optionally filtered by user"""
+    def get_posts(
+        self, skip: int = 0, limit: int = 20, user_id: Optional[int] = None, fields: Optional[List[str]] = None
+    ) -> List[PostResponse]:
+        """Get posts with pagination, optionally filtered by user; with fields, dicts of just those"""
         query = self.db.query(Post).filter(Post.is_deleted == False)
         
         if user_id:
             query = query.filter(Post.user_id == user_id)
         
+        if fields is not None:
+            computed = self._post_list_computed()
+            posts = query.options(*load_fields(Post, fields, computed)).order_by(
+                desc(Post.created_at)
+            ).offset(skip).limit(limit).all()
+            return render_fields(posts, fields, computed)
+
         # Only load essential data to avoid N+1 queries
         posts = query.options(
             joinedload(Post.user),
@@ -155,11 +165,15 @@ class PostService:
 
     def delete_attachment(self, attachment_id: int, user_id: int) -> bool:
         """Delete an attachment (only by the author)"""
-        # Find the attachment and check if user owns the post
-        attachment = self.db.query(Attachment).join(Post).filter(
+        # Find the attachment and check if user owns the post or comment it belongs to
+        attachment = self.db.query(Attachment).outerjoin(Post, Attachment.post_id == Post.id).outerjoin(
+            Comment, Attachment.comment_id == Comment.id
+        ).filter(
             Attachment.id == attachment_id,
-            Post.user_id == user_id,
-            Post.is_deleted == False
+            or_(
+                and_(Post.user_id == user_id, Post.is_deleted == False),
+                and_(Comment.user_id == user_id, Comment.is_deleted == False),
+            )
         ).first()
         
         if not attachment:
@@ -338,11 +352,7 @@ class PostService:
 
     def _format_post_response(self, post: Post) -> PostResponse:
         """Format a post with all related data"""
-        # Count reactions by emoji
-        reaction_counts = {}
-        for reaction in post.reactions:
-            emoji = reaction.emoji
-            reaction_counts[emoji] = reaction_counts.get(emoji, 0) + 1
+        reaction_counts = self._count_reactions(post)
         
         # Use the database comment_count for performance
         comment_count = post.comment_count
@@ -368,30 +378,7 @@ class PostService:
                 "profile_picture_updated_at": post.user.profile_picture_updated_at
             }
 
-        # Format reactions with proper user data
-        formatted_reactions = []
-        for react in post.reactions:
-            reaction_user_data = None
-            if react.user:
-                reaction_user_data = {
-                    "id": react.user.id,
-                    "username": react.user.username,
-                    "email": react.user.email,
-                    "full_name": react.user.full_name,
-                    "is_active": react.user.is_active,
-                    "created_at": react.user.created_at,
-                    "role_id": react.user.role_id,
-                    "permissions": getattr(react.user, 'permissions', None),
-                    "medals": react.user.get_medal_counts() if hasattr(react.user, 'get_medal_counts') else {"gold": 0, "silver": 0, "bronze": 0, "wood": 0}
-                }
-            
-            formatted_reactions.append({
-                "id": react.id,
-                "user_id": react.user_id,
-                "emoji": react.emoji,
-                "created_at": react.created_at,
-                "user": reaction_user_data
-            })
+        formatted_reactions = self._format_reactions(post)
 
         return PostResponse(
             id=post.id,
@@ -455,13 +442,65 @@ class PostService:
             replies=formatted_replies
         )
 
-    def _format_post_summary(self, post: Post) -> Dict:
-        """Format a post without nested user object for normalized response"""
-        # Count reactions by emoji
+    def _post_list_computed(self) -> Dict[str, Computed]:
+        """Post list fields that are not plain columns"""
+        return {
+            "user": Computed(
+                lambda post: self._format_user_response(post.user) if post.user else None,
+                columns=("user_id",),
+                options=(selectinload(Post.user).selectinload(User.medals),),
+            ),
+            "attachments": Computed(
+                lambda post: [AttachmentResponse.from_orm(att).model_dump() for att in post.attachments],
+                options=(selectinload(Post.attachments),),
+            ),
+            # Comments are loaded via the get_comments endpoint
+            "comments": Computed(lambda post: []),
+            "reactions": Computed(
+                self._format_reactions,
+                options=(selectinload(Post.reactions).selectinload(PostReaction.user).selectinload(User.medals),),
+            ),
+            "reaction_counts": Computed(self._count_reactions, options=(selectinload(Post.reactions),)),
+        }
+
+    def _count_reactions(self, post: Post) -> Dict[str, int]:
+        """Count a post's reactions by emoji"""
         reaction_counts = {}
         for reaction in post.reactions:
             emoji = reaction.emoji
             reaction_counts[emoji] = reaction_counts.get(emoji, 0) + 1
+        return reaction_counts
+
+    def _format_reactions(self, post: Post) -> List[Dict]:
+        """Format a post's reactions with proper user data"""
+        formatted_reactions = []
+        for react in post.reactions:
+            reaction_user_data = None
+            if react.user:
+                reaction_user_data = {
+                    "id": react.user.id,
+                    "username": react.user.username,
+                    "email": react.user.email,
+                    "full_name": react.user.full_name,
+                    "is_active": react.user.is_active,
+                    "created_at": react.user.created_at,
+                    "role_id": react.user.role_id,
+                    "permissions": getattr(react.user, 'permissions', None),
+                    "medals": react.user.get_medal_counts() if hasattr(react.user, 'get_medal_counts') else {"gold": 0, "silver": 0, "bronze": 0, "wood": 0}
+                }
+            
+            formatted_reactions.append({
+                "id": react.id,
+                "user_id": react.user_id,
+                "emoji": react.emoji,
+                "created_at": react.created_at,
+                "user": reaction_user_data
+            })
+        return formatted_reactions
+
+    def _format_post_summary(self, post: Post) -> Dict:
+        """Format a post without nested user object for normalized response"""
+        reaction_counts = self._count_reactions(post)
         
         # Use the database comment_count for performance
         comment_count = post.comment_count
@@ -0,0 +1,128 @@
+"""
+Profile pictures.
+
+Uploads are streamed into the media store (app/core/media.py) chunk by chunk, so a
+request never holds the whole image in memory and the size limit stops the copy as
+soon as it is crossed. A square AVATAR_SIZE JPEG is rendered from the original in the
+image worker pool and becomes profile_picture_url: feeds, user lists and profiles load
+a ~10 KB avatar that clients cache for good. Both are keyed by the upload's digest, so
+uploading the same image again stores and renders nothing. The original's extension is
+the format Pillow detects, never the client's file name or Content-Type.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, status
+from PIL import Image, ImageOps, UnidentifiedImageError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.media import get_media_store, image_extension, media_key, media_url, stage_upload, staging_file
+from app.models.models import User
+
+MAX_PROFILE_PICTURE_BYTES = 5 * 1024 * 1024
+AVATAR_SIZE = 256
+AVATAR_QUALITY = 80
+# Refuse decompression bombs before decoding: 40 megapixels is beyond any phone camera
+MAX_PIXELS = 40_000_000
+
+# Pictures uploaded before the media store
+LEGACY_URL_PREFIX = "/uploads/profile_pictures"
+
+# Decoding and resizing are CPU-bound; Pillow releases the GIL while doing them
+_image_pool = ThreadPoolExecutor(max_workers=settings.image_workers, thread_name_prefix="images")
+
+
+def to_rgb(image: Image.Image) -> Image.Image:
+    """image upright and in RGB, ready for JPEG; transparency becomes white"""
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    return image.convert("RGB")
+
+
+def image_format(source: Path) -> str:
+    """Format Pillow detects in source ("PNG", "JPEG"...); reads the header only"""
+    with Image.open(source) as image:
+        return image.format
+
+
+def render_avatar(source: Path, destination: Path) -> str:
+    """Center-cropped AVATAR_SIZE square JPEG of source; returns source's format"""
+    with Image.open(source) as image:
+        if image.width * image.height > MAX_PIXELS:
+            raise UnidentifiedImageError("image too large")
+        image_format = image.format
+        # JPEGs decode straight at a reduced scale, much faster than decoding in full
+        image.draft("RGB", (AVATAR_SIZE, AVATAR_SIZE))
+        avatar = ImageOps.fit(to_rgb(image), (AVATAR_SIZE, AVATAR_SIZE), Image.LANCZOS)
+    avatar.save(destination, "JPEG", quality=AVATAR_QUALITY, optimize=True, progressive=True)
+    return image_format
+
+
+def _remove_legacy_files(profile_picture_url: Optional[str]) -> None:
+    """Delete a picture stored under /uploads before the media store existed"""
+    if not profile_picture_url or not profile_picture_url.startswith(LEGACY_URL_PREFIX + "/"):
+        return
+    directory = Path(settings.upload_path) / "profile_pictures"
+    path = directory / profile_picture_url[len(LEGACY_URL_PREFIX) + 1:]
+    if path.resolve().parent == directory.resolve():
+        path.unlink(missing_ok=True)
+
+
+def _save(db: Session, user: User) -> None:
+    db.commit()
+    db.refresh(user)
+
+
+async def store_profile_picture(db: Session, user: User, chunks: AsyncIterator[bytes]) -> str:
+    """Store an upload and its avatar and point the user at the avatar; returns the new URL"""
+    store = get_media_store()
+    staged = await stage_upload(chunks, MAX_PROFILE_PICTURE_BYTES, store)
+    rendered = None
+    try:
+        avatar_key = media_key(staged.digest, "jpg", variant=f"avatar{AVATAR_SIZE}")
+        loop = asyncio.get_running_loop()
+        try:
+            if await run_in_threadpool(store.exists, avatar_key):
+                source_format = await loop.run_in_executor(_image_pool, image_format, staged.path)
+            else:
+                rendered = await run_in_threadpool(staging_file, store)
+                source_format = await loop.run_in_executor(_image_pool, render_avatar, staged.path, rendered)
+        except (OSError, Image.DecompressionBombError):
+            # Pillow raises OSError for anything it cannot decode
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File must be an image") from None
+        if rendered is not None:
+            await run_in_threadpool(store.save, avatar_key, rendered)
+        # The original is kept for renditions added later
+        await run_in_threadpool(store.save, media_key(staged.digest, image_extension(source_format)), staged.path)
+    finally:
+        for path in (staged.path, rendered):
+            if path is not None:
+                await run_in_threadpool(path.unlink, missing_ok=True)
+
+    previous = user.profile_picture_url
+    user.profile_picture_url = media_url(avatar_key)
+    user.profile_picture_updated_at = datetime.utcnow()
+    await run_in_threadpool(_save, db, user)
+
+    await run_in_threadpool(_remove_legacy_files, previous)
+    return user.profile_picture_url
+
+
+async def remove_profile_picture(db: Session, user: User) -> None:
+    """Clear the user's picture; media blobs go once nothing refers to them"""
+    if not user.profile_picture_url:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No profile picture found")
+    previous = user.profile_picture_url
+    user.profile_picture_url = None
+    user.profile_picture_updated_at = None
+    await run_in_threadpool(_save, db, user)
+    await run_in_threadpool(_remove_legacy_files, previous)
@@ -0,0 +1,146 @@
+"""
+Full-text search over reports: their content and their author's name.
+
+On Postgres the content is matched through idx_reports_content_search (the GIN index on
+to_tsvector('english', content)) and author names through idx_user_name_search, and
+results are ranked with ts_rank_cd. Only matching rows are read and ranked, so search
+time follows the number of hits rather than the size of the table.
+
+Other databases (SQLite in tests and local benchmarks) use a per-worker in-memory index
+that the invalidation bus keeps current.
+"""
+import threading
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import case, desc, func, literal_column, select, union
+from sqlalchemy.orm import Session
+
+from app.models.models import User
+from app.models.reports import Report
+from app.services.search_index import InMemoryTextIndex, SyncedTextIndex, prefix_tsquery, query_terms
+
+# Added to the ts_rank_cd content rank when the author's name matches
+AUTHOR_MATCH_RANK = 0.1
+
+
+def _content_vector():
+    # Must match the idx_reports_content_search expression for the planner to use it
+    return func.to_tsvector(literal_column("'english'"), Report.content)
+
+
+def _author_vector():
+    # Must match the idx_user_name_search expression
+    return func.to_tsvector(
+        literal_column("'simple'"),
+        func.coalesce(User.full_name, literal_column("''")).op("||")(literal_column("' '")).op("||")(User.username),
+    )
+
+
+def _date_filters(event_date_from: Optional[date], event_date_to: Optional[date]) -> list:
+    filters = []
+    if event_date_from:
+        filters.append(Report.event_date >= event_date_from)
+    if event_date_to:
+        filters.append(Report.event_date <= event_date_to)
+    return filters
+
+
+def _search_postgres(
+    db: Session,
+    terms: List[str],
+    event_date_from: Optional[date],
+    event_date_to: Optional[date],
+    skip: int,
+    limit: int
+) -> Tuple[List[int], int]:
+    tsquery = prefix_tsquery(terms)
+    content_query = func.to_tsquery(literal_column("'english'"), tsquery)
+    author_query = func.to_tsquery(literal_column("'simple'"), tsquery)
+
+    content_vector = _content_vector()
+    matching_authors = select(User.id).where(_author_vector().op("@@")(author_query))
+    # A UNION rather than OR, so each branch is answered from its own index
+    matching_ids = union(
+        select(Report.id).where(content_vector.op("@@")(content_query)),
+        select(Report.id).where(Report.created_by_id.in_(matching_authors)),
+    ).subquery()
+    conditions = [Report.id.in_(select(matching_ids.c.id)), *_date_filters(event_date_from, event_date_to)]
+
+    by_author = Report.created_by_id.in_(matching_authors)
+    rank = func.ts_rank_cd(content_vector, content_query) + case((by_author, AUTHOR_MATCH_RANK), else_=0)
+    ids = db.execute(
+        select(Report.id)
+        .where(*conditions)
+        .order_by(desc(rank), desc(Report.created_at), desc(Report.id))
+        .offset(skip)
+        .limit(limit)
+    ).scalars().all()
+    total = db.execute(select(func.count()).select_from(Report).where(*conditions)).scalar_one()
+    return list(ids), total
+
+
+def _load_reports(db: Session, ids: Optional[List[int]]):
+    query = (
+        db.query(Report.id, Report.content, Report.event_date, Report.created_at, User.full_name, User.username)
+        .join(User, Report.created_by_id == User.id)
+    )
+    if ids is not None:
+        query = query.filter(Report.id.in_(ids))
+    for report_id, content, event_date, created_at, full_name, username in query:
+        yield report_id, {"content": content, "author": f"{full_name or ''} {username}"}, (event_date, created_at)
+
+
+class ReportSearchIndex(SyncedTextIndex):
+    """In-memory report index for databases without full-text search"""
+
+    def __init__(self) -> None:
+        # Author names are indexed with every report, so a renamed user means a rebuild
+        super().__init__(InMemoryTextIndex({"content": 1.0, "author": 0.5}), _load_reports, "reports", rebuild_on=("users",))
+
+    def search_page(
+        self,
+        db: Session,
+        terms: List[str],
+        event_date_from: Optional[date],
+        event_date_to: Optional[date],
+        skip: int,
+        limit: int
+    ) -> Tuple[List[int], int]:
+        hits = []
+        for report_id, score, (event_date, created_at) in self.search(db, terms):
+            if (event_date_from and event_date < event_date_from) or (event_date_to and event_date > event_date_to):
+                continue
+            hits.append((score, created_at or datetime.min, report_id))
+        hits.sort(reverse=True)
+        return [report_id for _, _, report_id in hits[skip:skip + limit]], len(hits)
+
+
+_memory_index: Optional[ReportSearchIndex] = None
+_memory_index_lock = threading.Lock()
+
+
+def get_memory_index() -> ReportSearchIndex:
+    global _memory_index
+    if _memory_index is None:
+        with _memory_index_lock:
+            if _memory_index is None:
+                _memory_index = ReportSearchIndex()
+    return _memory_index
+
+
+def search_reports(
+    db: Session,
+    search_text: str,
+    event_date_from: Optional[date] = None,
+    event_date_to: Optional[date] = None,
+    skip: int = 0,
+    limit: int = 20
+) -> Tuple[List[int], int]:
+    """Ids of one page of matching reports, best match first, and the total number of matches"""
+    terms = query_terms(search_text)
+    if not terms:
+        return [], 0
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgres(db, terms, event_date_from, event_date_to, skip, limit)
+    return get_memory_index().search_page(db, terms, event_date_from, event_date_to, skip, limit)
@@ -1,10 +1,10 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, func
 from typing import List, Optional
 from datetime import date, datetime, timezone
 from app.models.reports import Report, ReportReaction
-from app.models.models import User
 from app.schemas.schemas import ReportCreate, ReportUpdate, ReportReactionCreate
+from app.services.report_search import search_reports
 from fastapi import HTTPException, status
 
 
@@ -32,25 +32,23 @@ def get_reports(
     event_date_to: Optional[date] = None,
     search_text: Optional[str] = None
 ) -> List[Report]:
-    """Get reports with filtering and pagination"""
+    """Get reports with filtering and pagination; text searches return the best matches first"""
     query = db.query(Report).options(
         joinedload(Report.created_by),
         joinedload(Report.reactions).joinedload(ReportReaction.user)
     )
     
+    if search_text and search_text.strip():
+        # Content and author names, through the full-text indexes
+        report_ids, _ = search_reports(db, search_text, event_date_from, event_date_to, skip, limit)
+        by_id = {report.id: report for report in query.filter(Report.id.in_(report_ids))}
+        return [by_id[report_id] for report_id in report_ids if report_id in by_id]
+    
     # Apply filters
     if event_date_from:
         query = query.filter(Report.event_date >= event_date_from)
     if event_date_to:
         query = query.filter(Report.event_date <= event_date_to)
-    if search_text:
-        # Join with User table for name search
-        query = query.join(User, Report.created_by_id == User.id).filter(
-            or_(
-                Report.content.ilike(f"%{search_text}%"),
-                User.full_name.ilike(f"%{search_text}%")
-            )
-        )
     
     # Order by event date (most recent first), then by created_at
     query = query.order_by(Report.event_date.desc(), Report.created_at.desc())
@@ -0,0 +1,359 @@
+"""
+Text search helpers shared by the Postgres and in-memory search paths.
+
+On Postgres, searches build a prefix tsquery ("smash:* & drop:*") and match it against
+GIN expression indexes; query words are passed unstemmed, since to_tsquery('english')
+stems them the way the indexed documents were. SQLite (tests, local benchmarks) has no equivalent, so
+InMemoryTextIndex keeps a per-worker inverted index with the same semantics: every
+query term must match, each term matches words that start with it, and a
+document matches when all terms appear in one of its fields.
+"""
+import bisect
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Protocol, Sequence, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import get_invalidation_bus
+
+# Longer queries are truncated; every extra term is another index lookup
+MAX_QUERY_TERMS = 8
+
+# Changes made outside the ORM (bulk loads, manual SQL) show up after at most this long
+INDEX_REBUILD_SECONDS = 300
+
+# Dropped from queries, as Postgres' english configuration does
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the "
+    "this to was were will with".split()
+)
+
+_WORD = re.compile(r"\w+")
+_SUFFIXES = ("ing", "es", "ed", "s")
+
+
+def _stem(word: str) -> str:
+    # Just enough for "smashes" and "smashing" to both find "smash", and "winning" "win".
+    # In-memory index only: Postgres stems with its own english dictionary.
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            stem = word[:-len(suffix)]
+            if suffix in ("ing", "ed") and len(stem) > 3 and stem[-1] == stem[-2] and stem[-1] not in "lsz":
+                stem = stem[:-1]
+            return stem
+    return word
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased, lightly stemmed words of text"""
+    return [_stem(word) for word in _WORD.findall((text or "").lower())]
+
+
+def query_terms(text: Optional[str]) -> List[str]:
+    """Distinct lowercased words of a user query, without stopwords; not stemmed"""
+    terms: List[str] = []
+    for word in _WORD.findall((text or "").lower()):
+        if word not in STOPWORDS and word not in terms:
+            terms.append(word)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def prefix_tsquery(terms: Iterable[str]) -> Optional[str]:
+    """to_tsquery() input matching every term as a word prefix, or None without terms"""
+    # Terms are \w+ only, so they cannot contain tsquery operators
+    parts = [f"{term}:*" for term in terms]
+    return " & ".join(parts) if parts else None
+
+
+class InMemoryTextIndex:
+    """Thread-safe inverted index with prefix matching over weighted fields"""
+
+    def __init__(self, weights: Mapping[str, float]) -> None:
+        self.weights = dict(weights)
+        # field -> word -> document -> occurrences
+        self._postings: Dict[str, Dict[str, Dict[Hashable, int]]] = {field: {} for field in self.weights}
+        self._documents: Dict[Hashable, Dict[str, Set[str]]] = {}
+        self._vocabulary: Dict[str, List[str]] = {field: [] for field in self.weights}
+        self._vocabulary_stale: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._documents
+
+    def add(self, key: Hashable, fields: Mapping[str, Optional[str]]) -> None:
+        """Index a document, replacing any earlier version with the same key"""
+        with self._lock:
+            self._remove(key)
+            words_by_field: Dict[str, Set[str]] = {}
+            for field, text in fields.items():
+                postings = self._postings[field]
+                words = tokenize(text)
+                for word in words:
+                    documents = postings.get(word)
+                    if documents is None:
+                        documents = postings[word] = {}
+                        self._vocabulary_stale.add(field)
+                    documents[key] = documents.get(key, 0) + 1
+                words_by_field[field] = set(words)
+            self._documents[key] = words_by_field
+
+    def remove(self, key: Hashable) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for field in self.weights:
+                self._postings[field] = {}
+                self._vocabulary[field] = []
+            self._documents.clear()
+            self._vocabulary_stale.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        words_by_field = self._documents.pop(key, None)
+        if words_by_field is None:
+            return
+        for field, words in words_by_field.items():
+            postings = self._postings[field]
+            for word in words:
+                documents = postings[word]
+                documents.pop(key, None)
+                if not documents:
+                    del postings[word]
+                    self._vocabulary_stale.add(field)
+
+    def _words_starting_with(self, field: str, term: str) -> List[str]:
+        if field in self._vocabulary_stale:
+            self._vocabulary[field] = sorted(self._postings[field])
+            self._vocabulary_stale.discard(field)
+        vocabulary = self._vocabulary[field]
+        start = bisect.bisect_left(vocabulary, term)
+        end = bisect.bisect_left(vocabulary, term + "\U0010ffff")
+        return vocabulary[start:end]
+
+    def search(self, terms: List[str]) -> Dict[Hashable, float]:
+        """Score of every document that matches all terms within one field"""
+        # Stemmed like the indexed words
+        terms = list(dict.fromkeys(_stem(term) for term in terms))
+        if not terms:
+            return {}
+        with self._lock:
+            scores: Dict[Hashable, float] = {}
+            for field, weight in self.weights.items():
+                postings = self._postings[field]
+                field_scores: Optional[Dict[Hashable, float]] = None
+                for term in terms:
+                    term_scores: Dict[Hashable, float] = {}
+                    for word in self._words_starting_with(field, term):
+                        # Whole-word hits rank above prefix hits
+                        boost = 1.0 if word == term else 0.5
+                        for key, count in postings[word].items():
+                            term_scores[key] = term_scores.get(key, 0.0) + count * boost
+                    if field_scores is None:
+                        field_scores = term_scores
+                    else:
+                        field_scores = {
+                            key: score + term_scores[key]
+                            for key, score in field_scores.items()
+                            if key in term_scores
+                        }
+                    if not field_scores:
+                        break
+                for key, score in (field_scores or {}).items():
+                    scores[key] = scores.get(key, 0.0) + score * weight
+            return scores
+
+
+class _TrieNode:
+    __slots__ = ("children", "keys", "ends")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        # key -> field positions of every indexed word passing through this node
+        self.keys: Dict[Hashable, List[int]] = {}
+        # keys with a word ending exactly here
+        self.ends: Dict[Hashable, int] = {}
+
+
+class PrefixTrie:
+    """
+    Thread-safe trie over the whitespace-separated words of a few short fields, for
+    typeahead. Each node lists the keys of every word below it, so a lookup is one walk
+    down the prefix. Fields are given in priority order: a match through the first field
+    scores 1, through the second 1/2, and so on; a whole-word match adds 1/4.
+    """
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+        self._words: Dict[Hashable, List[Tuple[str, int]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def add(self, key: Hashable, fields: Mapping[str, Optional[str]]) -> None:
+        with self._lock:
+            self._remove(key)
+            words = [
+                (word, position)
+                for position, text in enumerate(fields.values())
+                for word in (text or "").lower().split()
+            ]
+            for word, position in words:
+                node = self._root
+                for char in word:
+                    node = node.children.setdefault(char, _TrieNode())
+                    node.keys.setdefault(key, []).append(position)
+                node.ends[key] = node.ends.get(key, 0) + 1
+            self._words[key] = words
+
+    def remove(self, key: Hashable) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._root = _TrieNode()
+            self._words.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        for word, position in self._words.pop(key, []):
+            path = []
+            node = self._root
+            for char in word:
+                path.append((node, char))
+                node = node.children[char]
+                positions = node.keys[key]
+                positions.remove(position)
+                if not positions:
+                    del node.keys[key]
+            node.ends[key] -= 1
+            if not node.ends[key]:
+                del node.ends[key]
+            # Drop the branch once no word uses it
+            for parent, char in reversed(path):
+                if parent.children[char].keys:
+                    break
+                del parent.children[char]
+
+    def search(self, terms: List[str]) -> Dict[Hashable, float]:
+        """Score of every key whose words start with each of the terms"""
+        if not terms:
+            return {}
+        with self._lock:
+            scores: Optional[Dict[Hashable, float]] = None
+            for term in terms:
+                node = self._root
+                for char in term:
+                    node = node.children.get(char)
+                    if node is None:
+                        return {}
+                term_scores = {
+                    key: 1 / (1 + min(positions)) + (0.25 if key in node.ends else 0.0)
+                    for key, positions in node.keys.items()
+                    if scores is None or key in scores
+                }
+                scores = term_scores if scores is None else {key: scores[key] + term_scores[key] for key in term_scores}
+                if not scores:
+                    break
+            return scores or {}
+
+
+class TextIndex(Protocol):
+    def add(self, key: Hashable, fields: Mapping[str, Optional[str]]) -> None: ...
+    def remove(self, key: Hashable) -> None: ...
+    def clear(self) -> None: ...
+    def search(self, terms: List[str]) -> Dict[Hashable, float]: ...
+
+
+# (key, {field: text}, metadata kept next to the index for filtering and ordering)
+IndexedRow = Tuple[Hashable, Mapping[str, Optional[str]], Any]
+# Loads the rows with the given keys, or every row when keys is None
+RowLoader = Callable[[Session, Optional[List[Hashable]]], Iterable[IndexedRow]]
+
+
+class SyncedTextIndex:
+    """
+    In-memory index (InMemoryTextIndex or PrefixTrie) over database rows, kept current
+    through the invalidation bus.
+
+    The first search loads every row; after that only the keys named by invalidations
+    of the namespace are reloaded. Namespaces group several tables (reactions share
+    "reports" with reports), so a key may belong to another table: it is reloaded
+    anyway, which costs a lookup but never drops a live row. Rows the loader no longer
+    returns (deleted, hidden) leave the index. Any change in a rebuild_on namespace,
+    such as "users" for indexes that include author names, reloads everything.
+    """
+
+    def __init__(
+        self,
+        index: "TextIndex",
+        loader: RowLoader,
+        namespace: str,
+        rebuild_on: Sequence[str] = ()
+    ) -> None:
+        self.index = index
+        self.loader = loader
+        self.rows: Dict[Hashable, Any] = {}
+        self._stale_keys: Set[Hashable] = set()
+        self._rebuild = True
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        # Separate from _lock so invalidation handlers never wait on a database load
+        self._refresh_lock = threading.Lock()
+        bus = get_invalidation_bus()
+        bus.register(namespace, self._on_changed)
+        for other in rebuild_on:
+            bus.register(other, lambda keys: self.invalidate())
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._rebuild = True
+
+    def _on_changed(self, keys: Optional[List[Hashable]]) -> None:
+        with self._lock:
+            if keys is None:
+                self._rebuild = True
+            else:
+                self._stale_keys.update(keys)
+
+    def _load(self, db: Session, keys: Optional[List[Hashable]]) -> None:
+        for key, fields, metadata in self.loader(db, keys):
+            self.index.add(key, fields)
+            self.rows[key] = metadata
+
+    def refresh(self, db: Session) -> None:
+        """Bring the index up to date before a search"""
+        with self._refresh_lock:
+            with self._lock:
+                rebuild = self._rebuild or time.monotonic() - self._built_at >= INDEX_REBUILD_SECONDS
+                stale_keys = list(self._stale_keys)
+                self._rebuild = False
+                self._stale_keys.clear()
+                if rebuild:
+                    self._built_at = time.monotonic()
+
+            if rebuild:
+                self.index.clear()
+                self.rows.clear()
+                self._load(db, None)
+            elif stale_keys:
+                for key in stale_keys:
+                    self.index.remove(key)
+                    self.rows.pop(key, None)
+                self._load(db, stale_keys)
+
+    def search(self, db: Session, terms: List[str]) -> List[Tuple[Hashable, float, Any]]:
+        """(key, score, metadata) of every matching row, unordered"""
+        self.refresh(db)
+        hits = []
+        for key, score in self.index.search(terms).items():
+            metadata = self.rows.get(key)
+            if metadata is not None:
+                hits.append((key, score, metadata))
+        return hits
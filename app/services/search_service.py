@@ -0,0 +1,263 @@
+"""
+Unified search over posts, comments, reports, users and tournaments.
+
+Every type is matched with the same word-prefix semantics as report search
+(app/services/report_search.py). On Postgres each type has its own GIN expression
+index and one UNION ALL query ranks the page across types with ts_rank_cd; a second
+query counts matches per type. Other databases use one SyncedTextIndex per type.
+
+Results only carry what a result row shows (title, excerpt, author); the client opens
+the item through the existing endpoints.
+"""
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import desc, func, literal, literal_column, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.models.models import Tournament, User
+from app.models.posts import Comment, Post
+from app.models.reports import Report
+from app.services.search_index import InMemoryTextIndex, SyncedTextIndex, prefix_tsquery, query_terms
+
+SEARCH_TYPES = ("post", "comment", "report", "user", "tournament")
+
+EXCERPT_LENGTH = 160
+
+
+def _vector(config: str, *columns):
+    # Must match the expressions of the *_search indexes in init_database.sql
+    document = columns[0]
+    for column in columns[1:]:
+        document = document.op("||")(literal_column("' '")).op("||")(column)
+    return func.to_tsvector(literal_column(f"'{config}'"), document)
+
+
+def _user_name():
+    return func.coalesce(User.full_name, literal_column("''"))
+
+
+def _postgres_selects(terms: List[str], types: Sequence[str]) -> list:
+    """One (type, id, rank, created_at) select per searched type"""
+    # terms are unstemmed: each to_tsquery stems them with the configuration of its index
+    tsquery = prefix_tsquery(terms)
+    english = func.to_tsquery(literal_column("'english'"), tsquery)
+    simple = func.to_tsquery(literal_column("'simple'"), tsquery)
+
+    def ranked(kind: str, model, vector, query, *conditions):
+        return (
+            select(
+                literal(kind).label("type"),
+                model.id.label("id"),
+                func.ts_rank_cd(vector, query).label("rank"),
+                model.created_at.label("created_at"),
+            )
+            .where(vector.op("@@")(query), *conditions)
+        )
+
+    selects = {
+        "post": lambda: ranked("post", Post, _vector("english", Post.content), english, Post.is_deleted.is_(False)),
+        "comment": lambda: ranked(
+            "comment", Comment, _vector("english", Comment.content), english,
+            Comment.is_deleted.is_(False),
+            Comment.post_id.in_(select(Post.id).where(Post.is_deleted.is_(False))),
+        ),
+        "report": lambda: ranked("report", Report, _vector("english", Report.content), english),
+        "user": lambda: ranked(
+            "user", User, _vector("simple", _user_name(), User.username), simple, User.is_active.is_(True)
+        ),
+        "tournament": lambda: ranked("tournament", Tournament, _vector("simple", Tournament.name), simple),
+    }
+    return [selects[kind]() for kind in types]
+
+
+def _search_postgres(db: Session, terms: List[str], types: Sequence[str], skip: int, limit: int):
+    matches = union_all(*_postgres_selects(terms, types)).subquery()
+    page = db.execute(
+        select(matches.c.type, matches.c.id, matches.c.rank)
+        .order_by(desc(matches.c.rank), matches.c.created_at.desc().nulls_last(), desc(matches.c.id))
+        .offset(skip)
+        .limit(limit)
+    ).all()
+    counts = dict(db.execute(select(matches.c.type, func.count()).group_by(matches.c.type)).all())
+    return [(kind, item_id, float(rank)) for kind, item_id, rank in page], counts
+
+
+# ---------------------------------------------------------------------------
+# In-memory fallback
+# ---------------------------------------------------------------------------
+
+def _load_posts(db: Session, ids):
+    query = db.query(Post.id, Post.content, Post.created_at).filter(Post.is_deleted.is_(False))
+    if ids is not None:
+        query = query.filter(Post.id.in_(ids))
+    for post_id, content, created_at in query:
+        yield post_id, {"content": content}, (created_at, None)
+
+
+def _load_comments(db: Session, ids):
+    query = db.query(Comment.id, Comment.content, Comment.created_at, Comment.post_id).filter(Comment.is_deleted.is_(False))
+    if ids is not None:
+        query = query.filter(Comment.id.in_(ids))
+    for comment_id, content, created_at, post_id in query:
+        yield comment_id, {"content": content}, (created_at, post_id)
+
+
+def _load_reports(db: Session, ids):
+    query = db.query(Report.id, Report.content, Report.created_at)
+    if ids is not None:
+        query = query.filter(Report.id.in_(ids))
+    for report_id, content, created_at in query:
+        yield report_id, {"content": content}, (created_at, None)
+
+
+def _load_users(db: Session, ids):
+    query = db.query(User.id, User.full_name, User.username, User.created_at).filter(User.is_active.is_(True))
+    if ids is not None:
+        query = query.filter(User.id.in_(ids))
+    for user_id, full_name, username, created_at in query:
+        yield user_id, {"name": f"{full_name or ''} {username}"}, (created_at, None)
+
+
+def _load_tournaments(db: Session, ids):
+    query = db.query(Tournament.id, Tournament.name, Tournament.created_at)
+    if ids is not None:
+        query = query.filter(Tournament.id.in_(ids))
+    for tournament_id, name, created_at in query:
+        yield tournament_id, {"name": name}, (created_at, None)
+
+
+_memory_indexes: Optional[Dict[str, SyncedTextIndex]] = None
+_memory_indexes_lock = threading.Lock()
+
+
+def get_memory_indexes() -> Dict[str, SyncedTextIndex]:
+    global _memory_indexes
+    if _memory_indexes is None:
+        with _memory_indexes_lock:
+            if _memory_indexes is None:
+                _memory_indexes = {
+                    "post": SyncedTextIndex(InMemoryTextIndex({"content": 1.0}), _load_posts, "posts"),
+                    "comment": SyncedTextIndex(InMemoryTextIndex({"content": 1.0}), _load_comments, "posts"),
+                    "report": SyncedTextIndex(InMemoryTextIndex({"content": 1.0}), _load_reports, "reports"),
+                    "user": SyncedTextIndex(InMemoryTextIndex({"name": 1.0}), _load_users, "users"),
+                    "tournament": SyncedTextIndex(InMemoryTextIndex({"name": 1.0}), _load_tournaments, "tournaments"),
+                }
+    return _memory_indexes
+
+
+def _search_memory(db: Session, terms: List[str], types: Sequence[str], skip: int, limit: int):
+    indexes = get_memory_indexes()
+    if "comment" in types:
+        # Comments of a deleted post stay in their index; the post index knows it is gone
+        indexes["post"].refresh(db)
+        live_posts = indexes["post"].rows
+
+    hits = []
+    for kind in types:
+        for item_id, score, (created_at, post_id) in indexes[kind].search(db, terms):
+            if kind == "comment" and post_id not in live_posts:
+                continue
+            hits.append((score, created_at.timestamp() if created_at else 0.0, item_id, kind))
+    hits.sort(reverse=True)
+
+    counts: Dict[str, int] = {}
+    for _, _, _, kind in hits:
+        counts[kind] = counts.get(kind, 0) + 1
+    return [(kind, item_id, score) for score, _, item_id, kind in hits[skip:skip + limit]], counts
+
+
+# ---------------------------------------------------------------------------
+# Result rows
+# ---------------------------------------------------------------------------
+
+def excerpt(text: Optional[str], terms: List[str], length: int = EXCERPT_LENGTH) -> Optional[str]:
+    """Part of text around the first matching term"""
+    if not text:
+        return text
+    if len(text) <= length:
+        return text
+    lowered = text.lower()
+    positions = [position for position in (lowered.find(term) for term in terms) if position >= 0]
+    start = max(0, min(positions) - length // 4) if positions else 0
+    end = min(len(text), start + length)
+    start = max(0, end - length)
+    return ("…" if start else "") + text[start:end].strip() + ("…" if end < len(text) else "")
+
+
+def _author(user: Optional[User]) -> Dict[str, Any]:
+    return {"user_id": user.id, "user_full_name": user.full_name} if user else {}
+
+
+def _hydrate(db: Session, kind: str, ids: List[int], terms: List[str]) -> Dict[int, Dict[str, Any]]:
+    """Display fields for one page of results of one type, in a single query"""
+    rows: Dict[int, Dict[str, Any]] = {}
+    if kind in ("post", "comment", "report"):
+        model = {"post": Post, "comment": Comment, "report": Report}[kind]
+        author_column = model.created_by_id if model is Report else model.user_id
+        author = aliased(User)
+        query = db.query(model, author).outerjoin(author, author.id == author_column).filter(model.id.in_(ids))
+        for item, user in query:
+            rows[item.id] = {
+                "title": user.full_name if user else kind.capitalize(),
+                "snippet": excerpt(item.content, terms),
+                "created_at": item.created_at,
+                "post_id": getattr(item, "post_id", None),
+                **_author(user),
+            }
+    elif kind == "user":
+        for user in db.query(User).filter(User.id.in_(ids)):
+            rows[user.id] = {
+                "title": user.full_name or user.username,
+                "snippet": f"@{user.username}",
+                "created_at": user.created_at,
+                "user_id": user.id,
+                "profile_picture_url": user.profile_picture_url,
+            }
+    elif kind == "tournament":
+        for tournament in db.query(Tournament).filter(Tournament.id.in_(ids)):
+            rows[tournament.id] = {
+                "title": tournament.name,
+                "snippet": excerpt(tournament.description, terms),
+                "created_at": tournament.created_at,
+                "status": tournament.status,
+            }
+    return rows
+
+
+def search(
+    db: Session,
+    query_text: str,
+    types: Optional[Sequence[str]] = None,
+    skip: int = 0,
+    limit: int = 20
+) -> Dict[str, Any]:
+    """One page of results across types, best match first, with match counts per type"""
+    types = [kind for kind in SEARCH_TYPES if types is None or kind in types]
+    terms = query_terms(query_text)
+    if not terms or not types:
+        return {"hits": [], "counts": {}, "total_count": 0, "skip": skip, "limit": limit}
+
+    if db.get_bind().dialect.name == "postgresql":
+        page, counts = _search_postgres(db, terms, types, skip, limit)
+    else:
+        page, counts = _search_memory(db, terms, types, skip, limit)
+
+    ids_by_type: Dict[str, List[int]] = {}
+    for kind, item_id, _ in page:
+        ids_by_type.setdefault(kind, []).append(item_id)
+    details = {kind: _hydrate(db, kind, ids, terms) for kind, ids in ids_by_type.items()}
+
+    hits = []
+    for kind, item_id, score in page:
+        row = details[kind].get(item_id)
+        # Deleted between the search and the lookup
+        if row is not None:
+            hits.append({"type": kind, "id": item_id, "score": round(score, 4), **row})
+    return {
+        "hits": hits,
+        "counts": counts,
+        "total_count": sum(counts.values()),
+        "skip": skip,
+        "limit": limit,
+    }
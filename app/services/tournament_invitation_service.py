@@ -1,12 +1,24 @@
-from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 from datetime import datetime, timedelta, timezone
+from app.core.invalidation import mark_changed
 from app.models.models import User, Tournament
 from app.models.tournament_invitations import TournamentParticipant, TournamentInvitation
 from app.common.enums import TournamentStatus, InvitationStatus
 from app.schemas.schemas import TournamentInvitationCreate, TournamentInvitationUpdate
 from fastapi import HTTPException, status
 
+INVITATION_TTL = timedelta(days=7)
+
+# Per-user outcomes of a bulk invite
+INVITED = "invited"
+JOINED = "joined"  # The inviter invited themselves and became a participant
+ALREADY_INVITED = "already_invited"
+ALREADY_PARTICIPANT = "already_participant"
+USER_NOT_FOUND = "user_not_found"
+
 def create_tournament_invitation(
     db: Session, 
     tournament_id: int, 
@@ -80,7 +92,7 @@ def create_tournament_invitation(
         user_id=user_id,
         invited_by=invited_by,
         status=InvitationStatus.PENDING.value,
-        expires_at=datetime.utcnow() + timedelta(days=7)
+        expires_at=datetime.now(timezone.utc) + INVITATION_TTL
     )
     
     db.add(invitation)
@@ -89,6 +101,96 @@ def create_tournament_invitation(
     
     return invitation
 
+def create_tournament_invitations_bulk(
+    db: Session,
+    tournament_id: int,
+    user_ids: List[int],
+    invited_by: int
+) -> List[Dict[str, Any]]:
+    """
+    Invite many users at once with a fixed number of queries: the tournament, then one
+    IN query each for users, invitations and participants, then one multi-row insert.
+    Returns one outcome per distinct user id, in request order.
+    """
+    tournament = db.query(Tournament).filter(Tournament.id == tournament_id).first()
+    if not tournament:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tournament not found")
+    
+    if tournament.status != TournamentStatus.INVITING.value:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, 
+            detail="Tournament is not in inviting status"
+        )
+    
+    user_ids = list(dict.fromkeys(user_ids))
+    existing_users = {
+        user_id for user_id, in db.query(User.id).filter(User.id.in_(user_ids), User.is_active.is_(True))
+    }
+    invited = {
+        user_id: invitation_id
+        for user_id, invitation_id in db.query(TournamentInvitation.user_id, TournamentInvitation.id).filter(
+            TournamentInvitation.tournament_id == tournament_id,
+            TournamentInvitation.user_id.in_(user_ids)
+        )
+    }
+    participants = {
+        user_id for user_id, in db.query(TournamentParticipant.user_id).filter(
+            TournamentParticipant.tournament_id == tournament_id,
+            TournamentParticipant.user_id.in_(user_ids)
+        )
+    }
+    
+    outcomes: Dict[int, Dict[str, Any]] = {}
+    to_invite = []
+    for user_id in user_ids:
+        if user_id not in existing_users:
+            outcomes[user_id] = {"user_id": user_id, "status": USER_NOT_FOUND}
+        elif user_id in participants:
+            outcomes[user_id] = {"user_id": user_id, "status": ALREADY_PARTICIPANT}
+        elif user_id in invited:
+            outcomes[user_id] = {"user_id": user_id, "status": ALREADY_INVITED, "invitation_id": invited[user_id]}
+        elif user_id == invited_by:
+            # Same rule as a single invite: inviting yourself means joining
+            db.add(TournamentParticipant(tournament_id=tournament_id, user_id=user_id, is_active=True))
+            outcomes[user_id] = {"user_id": user_id, "status": JOINED}
+        else:
+            to_invite.append(user_id)
+    
+    now = datetime.now(timezone.utc)
+    created: Dict[int, int] = {}
+    try:
+        if to_invite:
+            # One INSERT ... VALUES (...), (...) RETURNING for the whole batch
+            rows = db.execute(
+                insert(TournamentInvitation).returning(TournamentInvitation.user_id, TournamentInvitation.id),
+                [
+                    {
+                        "tournament_id": tournament_id,
+                        "user_id": user_id,
+                        "invited_by": invited_by,
+                        "status": InvitationStatus.PENDING.value,
+                        "invited_at": now,
+                        "expires_at": now + INVITATION_TTL,
+                    }
+                    for user_id in to_invite
+                ]
+            )
+            created = {user_id: invitation_id for user_id, invitation_id in rows}
+            # Core inserts bypass the session's flush hooks
+            mark_changed(db, "invitations", created.values())
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Invitations for this tournament changed at the same time; please retry"
+        ) from None
+    
+    for user_id in to_invite:
+        outcomes[user_id] = {"user_id": user_id, "status": INVITED, "invitation_id": created.get(user_id)}
+    
+    return [outcomes[user_id] for user_id in user_ids]
+
 def respond_to_invitation(
     db: Session, 
     invitation_id: int, 
@@ -157,25 +259,106 @@ def get_tournament_invitations(
         TournamentInvitation.tournament_id == tournament_id
     ).all()
 
+def _count_subqueries(tournament_ids: List[int]):
+    """Active participants and open invitations per tournament, as joinable subqueries"""
+    participants = (
+        select(TournamentParticipant.tournament_id, func.count().label("count"))
+        .where(TournamentParticipant.tournament_id.in_(tournament_ids), TournamentParticipant.is_active.is_(True))
+        .group_by(TournamentParticipant.tournament_id)
+        .subquery()
+    )
+    invitations = (
+        select(TournamentInvitation.tournament_id, func.count().label("count"))
+        .where(
+            TournamentInvitation.tournament_id.in_(tournament_ids),
+            TournamentInvitation.status == InvitationStatus.PENDING.value,
+            or_(TournamentInvitation.expires_at.is_(None), TournamentInvitation.expires_at > datetime.now(timezone.utc))
+        )
+        .group_by(TournamentInvitation.tournament_id)
+        .subquery()
+    )
+    return participants, invitations
+
+def get_tournament_counts(db: Session, tournament_ids: List[int]) -> Dict[int, Dict[str, int]]:
+    """participant_count and invitation_count for each tournament, in one query"""
+    if not tournament_ids:
+        return {}
+    participants, invitations = _count_subqueries(tournament_ids)
+    rows = db.execute(
+        select(Tournament.id, func.coalesce(participants.c.count, 0), func.coalesce(invitations.c.count, 0))
+        .outerjoin(participants, participants.c.tournament_id == Tournament.id)
+        .outerjoin(invitations, invitations.c.tournament_id == Tournament.id)
+        .where(Tournament.id.in_(tournament_ids))
+    )
+    return {
+        tournament_id: {"participant_count": participant_count, "invitation_count": invitation_count}
+        for tournament_id, participant_count, invitation_count in rows
+    }
+
 def get_user_invitations(
     db: Session, 
     user_id: int
-) -> List[TournamentInvitation]:
-    """Get all invitations for a user"""
-    invitations = db.query(TournamentInvitation).filter(
-        TournamentInvitation.user_id == user_id
-    ).options(
-        selectinload(TournamentInvitation.tournament),
-        selectinload(TournamentInvitation.inviter)
-    ).all()
+) -> List[Dict[str, Any]]:
+    """
+    A user's invitation inbox in three queries: the invitations, their tournaments
+    (with participant and invitation counts) and the invitee and inviters.
+    """
+    invitations = db.execute(
+        select(
+            TournamentInvitation.id,
+            TournamentInvitation.tournament_id,
+            TournamentInvitation.user_id,
+            TournamentInvitation.invited_by,
+            TournamentInvitation.status,
+            TournamentInvitation.invited_at,
+            TournamentInvitation.responded_at,
+            TournamentInvitation.expires_at,
+        )
+        .where(TournamentInvitation.user_id == user_id)
+        .order_by(TournamentInvitation.invited_at.desc(), TournamentInvitation.id.desc())
+    ).mappings().all()
+    if not invitations:
+        return []
     
-    # Manually load tournament information for each invitation
-    for invitation in invitations:
-        if invitation.tournament_id:
-            tournament = db.query(Tournament).filter(Tournament.id == invitation.tournament_id).first()
-            invitation.tournament = tournament
+    tournament_ids = list({invitation["tournament_id"] for invitation in invitations})
+    participants, open_invitations = _count_subqueries(tournament_ids)
+    tournaments = {
+        row["id"]: dict(row)
+        for row in db.execute(
+            select(
+                Tournament.id,
+                Tournament.name,
+                Tournament.description,
+                Tournament.start_date,
+                Tournament.is_active,
+                Tournament.status,
+                Tournament.created_at,
+                func.coalesce(participants.c.count, 0).label("participant_count"),
+                func.coalesce(open_invitations.c.count, 0).label("invitation_count"),
+            )
+            .outerjoin(participants, participants.c.tournament_id == Tournament.id)
+            .outerjoin(open_invitations, open_invitations.c.tournament_id == Tournament.id)
+            .where(Tournament.id.in_(tournament_ids))
+        ).mappings()
+    }
     
-    return invitations
+    user_ids = list({user_id} | {invitation["invited_by"] for invitation in invitations})
+    users = {
+        row["id"]: dict(row)
+        for row in db.execute(
+            select(User.id, User.username, User.full_name, User.profile_picture_url).where(User.id.in_(user_ids))
+        ).mappings()
+    }
+    
+    return [
+        {
+            **invitation,
+            "tournament": tournaments.get(invitation["tournament_id"]),
+            "user": users.get(invitation["user_id"]),
+            "inviter": users.get(invitation["invited_by"]),
+        }
+        for invitation in invitations
+    ]
 
 def get_tournament_participants(
     db: Session, 
@@ -211,14 +394,11 @@ def start_tournament(
             detail="Cannot start tournament without participants"
         )
     
-    # Delete all pending invitations for this tournament
-    pending_invitations = db.query(TournamentInvitation).filter(
+    # Delete all pending invitations for this tournament in one statement
+    db.query(TournamentInvitation).filter(
         TournamentInvitation.tournament_id == tournament_id,
-        TournamentInvitation.status == "pending"
-    ).all()
-    
-    for invitation in pending_invitations:
-        db.delete(invitation)
+        TournamentInvitation.status == InvitationStatus.PENDING.value
+    ).delete(synchronize_session=False)
     
     # Update tournament status
     tournament.status = TournamentStatus.ACTIVE.value
@@ -0,0 +1,119 @@
+"""
+Username and full-name typeahead for invitations and opponent pickers.
+
+Every query word must start the username or a word of the full name. On Postgres the
+LIKE patterns are answered from the pg_trgm GIN indexes on lower(username) and
+lower(full_name); other databases use a per-worker PrefixTrie kept current by the
+invalidation bus. Username matches rank above name matches, then whole words above
+prefixes, then usernames alphabetically.
+
+One- and two-letter prefixes match a large share of all accounts and are what every
+keystroke sends first, so their results are cached per worker until a user changes.
+"""
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import LocalCache
+from app.models.models import User
+from app.services.search_index import PrefixTrie, SyncedTextIndex
+
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 25
+MAX_QUERY_WORDS = 3
+
+# Prefixes up to this many characters are cached
+CACHED_PREFIX_LENGTH = 2
+
+_short_prefix_cache = LocalCache("users", ttl_seconds=300, maxsize=2048, by_primary_key=False)
+
+
+def query_words(query: Optional[str]) -> List[str]:
+    return (query or "").lower().split()[:MAX_QUERY_WORDS]
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _suggestion(user_id: int, username: str, full_name: str, profile_picture_url: Optional[str]) -> Dict:
+    return {"id": user_id, "username": username, "full_name": full_name, "profile_picture_url": profile_picture_url}
+
+
+def _suggest_postgres(db: Session, words: List[str], limit: int) -> List[Dict]:
+    username = func.lower(User.username)
+    full_name = func.lower(User.full_name)
+
+    def like(column, pattern: str):
+        return column.like(pattern, escape="\\")
+
+    conditions = []
+    for word in words:
+        word = _escape_like(word)
+        conditions.append(or_(like(username, f"{word}%"), like(full_name, f"{word}%"), like(full_name, f"% {word}%")))
+
+    # Same order as PrefixTrie scores: username before name, whole word before prefix
+    first = _escape_like(words[0])
+    quality = case(
+        (like(username, first), 0),
+        (like(username, f"{first}%"), 1),
+        (or_(like(full_name, first), like(full_name, f"{first} %"), like(full_name, f"% {first}"), like(full_name, f"% {first} %")), 2),
+        else_=3,
+    )
+    rows = (
+        db.query(User.id, User.username, User.full_name, User.profile_picture_url)
+        .filter(User.is_active.is_(True), *conditions)
+        .order_by(quality, username)
+        .limit(limit)
+    )
+    return [_suggestion(*row) for row in rows]
+
+
+def _load_users(db: Session, ids):
+    query = (
+        db.query(User.id, User.username, User.full_name, User.profile_picture_url)
+        .filter(User.is_active.is_(True))
+    )
+    if ids is not None:
+        query = query.filter(User.id.in_(ids))
+    for row in query:
+        # The suggestion itself is kept with the trie, so lookups never touch the database
+        yield row.id, {"username": row.username, "full_name": row.full_name}, _suggestion(*row)
+
+
+_trie: Optional[SyncedTextIndex] = None
+_trie_lock = threading.Lock()
+
+
+def get_user_trie() -> SyncedTextIndex:
+    global _trie
+    if _trie is None:
+        with _trie_lock:
+            if _trie is None:
+                _trie = SyncedTextIndex(PrefixTrie(), _load_users, "users")
+    return _trie
+
+
+def _suggest_memory(db: Session, words: List[str], limit: int) -> List[Dict]:
+    hits = get_user_trie().search(db, words)
+    hits.sort(key=lambda hit: (-hit[1], hit[2]["username"].lower()))
+    return [suggestion for _, _, suggestion in hits[:limit]]
+
+
+def _suggestions(db: Session, words: List[str], limit: int) -> List[Dict]:
+    if db.get_bind().dialect.name == "postgresql":
+        return _suggest_postgres(db, words, limit)
+    return _suggest_memory(db, words, limit)
+
+
+def autocomplete_users(db: Session, query: str, limit: int = DEFAULT_SUGGESTIONS) -> List[Dict]:
+    """Best matching active users for a typed prefix, at most limit of them"""
+    words = query_words(query)
+    if not words:
+        return []
+    limit = max(1, min(limit, MAX_SUGGESTIONS))
+    if len(words) == 1 and len(words[0]) <= CACHED_PREFIX_LENGTH:
+        return _short_prefix_cache.get_or_set((words[0], limit), lambda: _suggestions(db, words, limit))
+    return _suggestions(db, words, limit)
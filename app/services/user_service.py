@@ -1,13 +1,36 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Dict, Optional
 from app.models.models import User
 from app.models.access_control import Role, Permission, PermissionGroup, RolesPermissions
 from app.schemas.schemas import UserCreate, UserUpdate, RoleCreate, RoleUpdate
 from app.core.auth import get_password_hash
+from app.core.fields import Computed, load_fields, render_fields
 
 
-def get_all_users(db: Session) -> List[Dict]:
-    """Get all users with their roles and medals"""
+USER_LIST_FIELDS = (
+    "id", "username", "email", "full_name", "is_active", "created_at", "role_id", "role_name", "permissions", "medals"
+)
+
+
+def _user_list_computed(db: Session) -> Dict[str, Computed]:
+    """User list fields that are not plain columns"""
+    return {
+        "role_name": Computed(
+            lambda user: user.role.role_name if user.role else None,
+            columns=("role_id",),
+            options=(joinedload(User.role),),
+        ),
+        "permissions": Computed(lambda user: user.get_permissions(db), columns=("role_id",)),
+        "medals": Computed(lambda user: user.get_medal_counts(), options=(selectinload(User.medals),)),
+    }
+
+
+def get_all_users(db: Session, fields: Optional[List[str]] = None) -> List[Dict]:
+    """Get all users with their roles and medals, or just the given fields"""
+    if fields is not None:
+        computed = _user_list_computed(db)
+        return render_fields(db.query(User).options(*load_fields(User, fields, computed)).all(), fields, computed)
+
     users = db.query(User).all()
     result = []
     
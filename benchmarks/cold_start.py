@@ -0,0 +1,76 @@
+"""
+Cold-start benchmark.
+
+Starts a fresh interpreter per run and measures how long it takes to import the
+application and serve the first requests, with routers loaded eagerly and lazily.
+
+    python -m benchmarks.cold_start --runs 10
+
+Results from a reference run are recorded in benchmarks/README.md.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs inside the child interpreter; times are measured from interpreter start-up
+CHILD = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(main.app)
+first = time.perf_counter()
+client.get("/health")
+health = time.perf_counter()
+client.get("/matches/")
+route = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "health_ms": (health - first) * 1000,
+    "first_route_ms": (route - health) * 1000,
+    "total_ms": (route - start) * 1000 - (first - imported) * 1000,
+}))
+"""
+
+
+def run_once(lazy: bool, database_url: str) -> Dict[str, float]:
+    env = dict(os.environ, DATABASE_URL=database_url, LAZY_ROUTERS=str(lazy).lower())
+    env.pop("DATABASE_PASSWORD", None)
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    # main.py prints start-up banners; the measurement is the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{tmp}/cold_start.db"
+        print(f"{'mode':<8}{'import':>10}{'/health':>10}{'1st route':>12}{'total':>10}   (median ms, {args.runs} runs)")
+        for lazy in (False, True):
+            result = summarize([run_once(lazy, database_url) for _ in range(args.runs)])
+            print(
+                f"{'lazy' if lazy else 'eager':<8}{result['import_ms']:>10.0f}{result['health_ms']:>10.0f}"
+                f"{result['first_route_ms']:>12.0f}{result['total_ms']:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
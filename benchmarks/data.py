@@ -0,0 +1,271 @@
+"""
+Synthetic data generator for the benchmark suite.
+
+Builds a realistic club-sized dataset with Core bulk inserts: users, tournaments with
+participants, matches (mostly verified, some waiting for the second player), posts with
+comments and reactions, and reports with reactions and views. The same seed always
+produces the same data, so runs can be compared.
+"""
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.common.enums import MatchStatus, MatchType, TournamentStatus
+from app.core.auth import get_password_hash
+from app.core.database import SCHEMAS, Base
+from app.models import (
+    Comment,
+    Match,
+    Permission,
+    PermissionGroup,
+    Post,
+    PostReaction,
+    Report,
+    ReportReaction,
+    ReportView,
+    Role,
+    RolesPermissions,
+    Tournament,
+    User,
+)
+from app.models.tournament_invitations import TournamentParticipant
+
+BENCHMARK_PASSWORD = "benchmark"
+CHUNK_SIZE = 5000
+
+EMOJIS = ["👍", "❤️", "😂", "🏸", "🔥", "👏"]
+WORDS = (
+    "smash drop clear net rally serve backhand forehand shuttle court doubles singles "
+    "training tournament club season final semi quarter score point game match coach "
+    "footwork jump lift drive push block defence attack great tough close win"
+).split()
+
+# Same keys and role grants as init_db.py
+PERMISSION_KEYS = [
+    "admin", "users_can_view_user_list", "users_can_create_user", "users_can_edit_other_users",
+    "matches_can_view_all", "matches_can_create", "matches_can_verify", "matches_can_edit_all",
+    "tournaments_can_view_all", "tournaments_can_create", "tournaments_can_edit_all", "user",
+]
+USER_PERMISSION_IDS = [2, 5, 6, 7, 9, 12]
+
+
+@dataclass(frozen=True)
+class DatasetSize:
+    users: int = 2000
+    matches: int = 100_000
+    tournaments: int = 40
+    participants_per_tournament: int = 32
+    posts: int = 5000
+    comments_per_post: int = 4
+    reactions_per_post: int = 3
+    reports: int = 2000
+    views_per_report: int = 25
+
+
+SCALES: Dict[str, DatasetSize] = {
+    "full": DatasetSize(),
+    "small": DatasetSize(
+        users=200, matches=5000, tournaments=8, posts=500, reports=200, views_per_report=10
+    ),
+}
+
+
+def username(user_id: int) -> str:
+    return f"bench_user_{user_id}"
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _insert(connection, model, rows: Iterable[dict]) -> None:
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= CHUNK_SIZE:
+            connection.execute(model.__table__.insert(), batch)
+            batch = []
+    if batch:
+        connection.execute(model.__table__.insert(), batch)
+
+
+def reset_schema(engine: Engine) -> None:
+    """Drop and recreate every table"""
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            for schema in SCHEMAS:
+                connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def _reset_sequences(connection, models) -> None:
+    """Explicit ids bypass Postgres sequences; move them past the generated rows"""
+    for model in models:
+        table = f'{model.__table__.schema}."{model.__table__.name}"'
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+        ))
+
+
+def generate(engine: Engine, size: DatasetSize, seed: int = 42) -> None:
+    """Recreate the schema and fill it with deterministic synthetic data"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    reset_schema(engine)
+
+    # One hash for everyone: pbkdf2 is deliberately slow
+    hashed_password = get_password_hash(BENCHMARK_PASSWORD)
+    user_ids = list(range(1, size.users + 1))
+
+    def days_ago(max_days: int) -> datetime:
+        return now - timedelta(days=rng.uniform(0, max_days))
+
+    with engine.begin() as connection:
+        _insert(connection, Role, [
+            {"role_id": 1, "role_name": "admin", "locked": True},
+            {"role_id": 2, "role_name": "user", "locked": True},
+        ])
+        _insert(connection, PermissionGroup, [{"permission_group_id": 1, "permission_group_name": "badminton_app"}])
+        _insert(connection, Permission, [
+            {"permission_id": index, "permission_key": key, "permission_group_id": 1}
+            for index, key in enumerate(PERMISSION_KEYS, start=1)
+        ])
+        _insert(connection, RolesPermissions, (
+            [{"role_id": 1, "permission_id": index} for index in range(1, len(PERMISSION_KEYS) + 1)]
+            + [{"role_id": 2, "permission_id": index} for index in USER_PERMISSION_IDS]
+        ))
+
+        _insert(connection, User, (
+            {
+                "id": user_id,
+                "username": username(user_id),
+                "email": f"{username(user_id)}@example.com",
+                "full_name": f"Player {user_id}",
+                "hashed_password": hashed_password,
+                "is_active": True,
+                "created_at": days_ago(730),
+                "role_id": 1 if user_id == 1 else 2,
+            }
+            for user_id in user_ids
+        ))
+
+        tournament_players: Dict[int, List[int]] = {}
+        tournament_rows = []
+        for tournament_id in range(1, size.tournaments + 1):
+            start = days_ago(365)
+            status = TournamentStatus.ACTIVE if tournament_id % 4 else TournamentStatus.COMPLETED
+            tournament_rows.append({
+                "id": tournament_id,
+                "name": f"Season {tournament_id} Cup",
+                "description": _sentence(rng, 12),
+                "start_date": start,
+                "end_date": start + timedelta(days=60),
+                "is_active": status == TournamentStatus.ACTIVE,
+                "status": status.value,
+                "created_at": start - timedelta(days=14),
+            })
+            tournament_players[tournament_id] = rng.sample(
+                user_ids, min(size.participants_per_tournament, len(user_ids))
+            )
+        _insert(connection, Tournament, tournament_rows)
+        _insert(connection, TournamentParticipant, (
+            {"tournament_id": tournament_id, "user_id": user_id, "is_active": True}
+            for tournament_id, players in tournament_players.items()
+            for user_id in players
+        ))
+
+        def match_row() -> dict:
+            tournament_id = None
+            if tournament_players and rng.random() < 0.3:
+                tournament_id = rng.choice(list(tournament_players))
+                player1, player2 = rng.sample(tournament_players[tournament_id], 2)
+            else:
+                player1, player2 = rng.sample(user_ids, 2)
+            loser_score = rng.randint(5, 19)
+            player1_won = rng.random() < 0.5
+            played = days_ago(365)
+            pending = rng.random() < 0.1
+            return {
+                "player1_id": player1,
+                "player2_id": player2,
+                "player1_score": 21 if player1_won else loser_score,
+                "player2_score": loser_score if player1_won else 21,
+                "match_type": MatchType.TOURNAMENT if tournament_id else MatchType.CASUAL,
+                "status": MatchStatus.PENDING_VERIFICATION if pending else MatchStatus.VERIFIED,
+                "submitted_by_id": player1,
+                "verified_by_id": None if pending else player2,
+                "tournament_id": tournament_id,
+                "notes": None,
+                "match_date": played,
+                "created_at": played,
+                "verified_at": None if pending else played + timedelta(hours=2),
+                "player1_verified": True,
+                "player2_verified": not pending,
+                "player1_verified_by_id": player1,
+                "player2_verified_by_id": None if pending else player2,
+            }
+
+        _insert(connection, Match, (match_row() for _ in range(size.matches)))
+
+        post_rows, comment_rows, post_reaction_rows = [], [], []
+        comment_id = 0
+        for post_id in range(1, size.posts + 1):
+            created = days_ago(180)
+            comments = rng.randint(0, size.comments_per_post * 2)
+            post_rows.append({
+                "id": post_id,
+                "user_id": rng.choice(user_ids),
+                "content": _sentence(rng, rng.randint(8, 40)),
+                "created_at": created,
+                "updated_at": created,
+                "is_deleted": rng.random() < 0.02,
+                "comment_count": comments,
+            })
+            first_comment = comment_id + 1
+            for _ in range(comments):
+                comment_id += 1
+                # About a third of comments reply to an earlier comment on the same post
+                parent = rng.randint(first_comment, comment_id - 1) if comment_id > first_comment and rng.random() < 0.3 else None
+                comment_created = created + timedelta(minutes=rng.randint(1, 600))
+                comment_rows.append({
+                    "id": comment_id,
+                    "post_id": post_id,
+                    "user_id": rng.choice(user_ids),
+                    "content": _sentence(rng, rng.randint(3, 15)),
+                    "parent_comment_id": parent,
+                    "created_at": comment_created,
+                    "updated_at": comment_created,
+                    "is_deleted": False,
+                })
+            for user_id in rng.sample(user_ids, min(rng.randint(0, size.reactions_per_post * 2), len(user_ids))):
+                post_reaction_rows.append({"post_id": post_id, "user_id": user_id, "emoji": rng.choice(EMOJIS)})
+        _insert(connection, Post, post_rows)
+        _insert(connection, Comment, comment_rows)
+        _insert(connection, PostReaction, post_reaction_rows)
+
+        report_rows, report_reaction_rows, report_view_rows = [], [], []
+        for report_id in range(1, size.reports + 1):
+            created = days_ago(365)
+            report_rows.append({
+                "id": report_id,
+                "created_by_id": rng.choice(user_ids),
+                "event_date": date.fromordinal(created.date().toordinal() - rng.randint(0, 3)),
+                "content": _sentence(rng, rng.randint(20, 120)),
+                "created_at": created,
+                "updated_at": created,
+            })
+            for user_id in rng.sample(user_ids, min(rng.randint(0, 4), len(user_ids))):
+                report_reaction_rows.append({"report_id": report_id, "user_id": user_id, "emoji": rng.choice(EMOJIS)})
+            for user_id in rng.sample(user_ids, min(rng.randint(0, size.views_per_report * 2), len(user_ids))):
+                report_view_rows.append({"report_id": report_id, "user_id": user_id, "viewed_at": created + timedelta(hours=1)})
+        _insert(connection, Report, report_rows)
+        _insert(connection, ReportReaction, report_reaction_rows)
+        _insert(connection, ReportView, report_view_rows)
+
+        if engine.dialect.name == "postgresql":
+            _reset_sequences(connection, [User, Tournament, Post, Comment, Report])
@@ -0,0 +1,86 @@
+"""
+Request scenarios mirroring the mobile client's calls (mobile/src/services/api.ts).
+"""
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+from benchmarks.data import WORDS, DatasetSize
+
+# (method, path, extra httpx request arguments)
+RequestSpec = Tuple[str, str, Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    description: str
+    build: Callable[[random.Random, int, DatasetSize], RequestSpec]
+
+
+def _feed(rng: random.Random, user_id: int, size: DatasetSize) -> RequestSpec:
+    # getPostsNormalized: mostly the first page, sometimes scrolled further
+    skip = 0 if rng.random() < 0.7 else rng.randint(1, 10) * 20
+    return "GET", f"/posts/normalized?skip={skip}&limit=20", {}
+
+
+def _comments(rng: random.Random, user_id: int, size: DatasetSize) -> RequestSpec:
+    # getComments: the thread under a post opened from the feed
+    return "GET", f"/posts/{rng.randint(1, size.posts)}/comments", {}
+
+
+def _reports_list(rng: random.Random, user_id: int, size: DatasetSize) -> RequestSpec:
+    skip = 0 if rng.random() < 0.8 else rng.randint(1, 5) * 20
+    return "GET", f"/reports/?skip={skip}&limit=20", {}
+
+
+def _reports_search(rng: random.Random, user_id: int, size: DatasetSize) -> RequestSpec:
+    # Search-as-you-type: one word, sometimes only its first letters
+    word = rng.choice(WORDS)
+    term = word if rng.random() < 0.5 else word[:rng.randint(2, len(word))]
+    return "GET", f"/reports/?search_text={term}&limit=20", {}
+
+
+def _search(rng: random.Random, user_id: int, size: DatasetSize) -> RequestSpec:
+    word = rng.choice(WORDS)
+    return "GET", f"/search?q={word[:rng.randint(3, len(word))]}&limit=20", {}
+
+
+def _leaderboard(rng: random.Random, user_id: int, size: DatasetSize) -> RequestSpec:
+    return "GET", f"/tournaments/{rng.randint(1, size.tournaments)}/leaderboard", {}
+
+
+def _verification_inbox(rng: random.Random, user_id: int, size: DatasetSize) -> RequestSpec:
+    return "GET", "/verification/pending-verification", {}
+
+
+def _match_create(rng: random.Random, user_id: int, size: DatasetSize) -> RequestSpec:
+    # Any other user; skipping over our own id keeps the draw uniform
+    opponent = rng.randint(1, size.users - 1)
+    if opponent >= user_id:
+        opponent += 1
+    loser_score = rng.randint(5, 19)
+    payload = {
+        "player1_id": user_id,
+        "player2_id": opponent,
+        "player1_score": 21,
+        "player2_score": loser_score,
+        "match_type": "casual",
+    }
+    return "POST", "/matches", {"json": payload, "headers": {"Idempotency-Key": str(uuid.UUID(int=rng.getrandbits(128)))}}
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario("feed", "GET /posts/normalized (home feed)", _feed),
+        Scenario("comments", "GET /posts/{id}/comments (comment thread)", _comments),
+        Scenario("reports", "GET /reports/ (reports list)", _reports_list),
+        Scenario("report_search", "GET /reports/?search_text=... (full-text search)", _reports_search),
+        Scenario("search", "GET /search?q=... (posts, comments, reports, users, tournaments)", _search),
+        Scenario("leaderboard", "GET /tournaments/{id}/leaderboard", _leaderboard),
+        Scenario("verification", "GET /verification/pending-verification (inbox)", _verification_inbox),
+        Scenario("match_create", "POST /matches with an Idempotency-Key", _match_create),
+    ]
+}
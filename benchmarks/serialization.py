@@ -0,0 +1,143 @@
+"""
+Serialization and compression benchmark for the largest list responses.
+
+    python -m benchmarks.serialization                       # SQLite file, full dataset
+    python -m benchmarks.serialization --scale small --reuse-data
+
+Fetches each endpoint once through the in-process app, then times what happens to
+its content after the route returns: rendering with the stdlib JSONResponse against
+ORJSONResponse (the app's default response class), and compressing the result with
+gzip and brotli at the configured levels. The request column is the median latency of
+the whole request (uncompressed), for the share serialization takes of it.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Callable, List
+
+from benchmarks.run import DEFAULT_DATABASE_URL
+
+ENDPOINTS = {
+    "matches": "/matches?limit=500",
+    "matches_normalized": "/matches/normalized?limit=500",
+    "feed": "/posts/?limit=20",
+    "feed_normalized": "/posts/normalized?limit=20",
+}
+
+
+@dataclass
+class SerializationResult:
+    endpoint: str
+    request_ms: float
+    json_ms: float
+    orjson_ms: float
+    raw_bytes: int
+    gzip_bytes: int
+    gzip_ms: float
+    brotli_bytes: int
+    brotli_ms: float
+
+
+def median_ms(function: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--scale", default="full", help="Dataset size: full or small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reuse-data", action="store_true", help="Skip data generation")
+    parser.add_argument("--repeat", type=int, default=30, help="Timed repetitions per measurement")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.pop("DATABASE_PASSWORD", None)
+    os.environ.setdefault("LAZY_ROUTERS", "false")
+
+    import brotli
+    import httpx
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from fastapi.testclient import TestClient
+
+    from app.core.config import settings
+    from app.core.database import engine
+    from benchmarks.data import BENCHMARK_PASSWORD, SCALES, generate, username
+    from main import app
+
+    if args.scale not in SCALES:
+        raise SystemExit(f"Unknown scale: {args.scale} (choose from {', '.join(SCALES)})")
+    if not args.reuse_data:
+        print(f"Generating '{args.scale}' dataset on {engine.url.render_as_string(hide_password=True)} ...")
+        generate(engine, SCALES[args.scale], seed=args.seed)
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("app.core.query_stats").setLevel(logging.ERROR)
+    client = TestClient(app, headers={"Accept-Encoding": "identity"})
+    response = client.post("/auth/login", json={"username": username(2), "password": BENCHMARK_PASSWORD})
+    response.raise_for_status()
+    client.cookies = httpx.Cookies({"access_token": response.cookies["access_token"]})
+
+    results: List[SerializationResult] = []
+    for name, path in ENDPOINTS.items():
+        response = client.get(path)
+        response.raise_for_status()
+        # What FastAPI hands the response class once the response model has been applied
+        content = response.json()
+        body = ORJSONResponse(content).body
+
+        # Default arguments bind this endpoint's body, content and path (not the last loop's)
+        def gzip_body(body: bytes = body) -> bytes:
+            compressor = zlib.compressobj(settings.gzip_level, zlib.DEFLATED, 31)
+            return compressor.compress(body) + compressor.flush()
+
+        def brotli_body(body: bytes = body) -> bytes:
+            return brotli.compress(body, mode=brotli.MODE_TEXT, quality=settings.brotli_quality)
+
+        results.append(SerializationResult(
+            endpoint=name,
+            request_ms=median_ms(lambda path=path: client.get(path), max(args.repeat // 3, 3)),
+            json_ms=median_ms(lambda content=content: JSONResponse(content), args.repeat),
+            orjson_ms=median_ms(lambda content=content: ORJSONResponse(content), args.repeat),
+            raw_bytes=len(body),
+            gzip_bytes=len(gzip_body()),
+            gzip_ms=median_ms(gzip_body, args.repeat),
+            brotli_bytes=len(brotli_body()),
+            brotli_ms=median_ms(brotli_body, args.repeat),
+        ))
+
+    print()
+    print(f"{engine.dialect.name}, scale={args.scale}, gzip level {settings.gzip_level}, brotli quality {settings.brotli_quality}")
+    print(
+        f"{'endpoint':<20}{'request ms':>11}{'json ms':>9}{'orjson ms':>11}{'raw KB':>9}"
+        f"{'gzip KB':>9}{'gzip ms':>9}{'br KB':>8}{'br ms':>8}"
+    )
+    for result in results:
+        print(
+            f"{result.endpoint:<20}{result.request_ms:>11.1f}{result.json_ms:>9.2f}{result.orjson_ms:>11.2f}"
+            f"{result.raw_bytes / 1024:>9.1f}{result.gzip_bytes / 1024:>9.1f}{result.gzip_ms:>9.2f}"
+            f"{result.brotli_bytes / 1024:>8.1f}{result.brotli_ms:>8.2f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({
+                "database": engine.dialect.name,
+                "scale": args.scale,
+                "results": [asdict(result) for result in results],
+            }, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
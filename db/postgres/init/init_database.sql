@@ -10,6 +10,9 @@
 CREATE SCHEMA IF NOT EXISTS badminton;
 CREATE SCHEMA IF NOT EXISTS access_control;
 
+-- Trigram indexes for user typeahead
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Set search path
 SET search_path TO badminton, access_control, public;
 
@@ -254,6 +257,7 @@ CREATE TABLE badminton."Attachment" (
     "file_size" BIGINT,
     "mime_type" VARCHAR(100),
     "file_metadata" JSONB,
+    "processing_status" VARCHAR(20),
     "created_at" TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
     PRIMARY KEY ("id"),
     CONSTRAINT attachment_post_id_fkey FOREIGN KEY ("post_id") REFERENCES badminton."Post"("id") ON DELETE CASCADE,
@@ -292,6 +296,29 @@ CREATE TABLE badminton."CommentReaction" (
     CONSTRAINT unique_user_emoji_per_comment UNIQUE ("comment_id", "user_id", "emoji")
 );
 
+-- Idempotency keys table (retry-safe match submission)
+DROP TABLE IF EXISTS badminton.idempotency_keys CASCADE;
+CREATE TABLE badminton.idempotency_keys (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES badminton."User"(id) ON DELETE CASCADE,
+    scope VARCHAR(100) NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    request_hash VARCHAR(64) NOT NULL,
+    status_code INTEGER NOT NULL,
+    response_body JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    CONSTRAINT unique_user_scope_idempotency_key UNIQUE (user_id, scope, key)
+);
+
+-- Collection versions (ETags for read endpoints; one row per cache namespace, bumped on every change)
+DROP TABLE IF EXISTS badminton.collection_versions CASCADE;
+CREATE TABLE badminton.collection_versions (
+    namespace VARCHAR(32) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
 -- ============================================================================
 -- INDEXES FOR PERFORMANCE
 -- ============================================================================
@@ -301,19 +328,26 @@ CREATE INDEX idx_user_username ON badminton."User"("username");
 CREATE INDEX idx_user_email ON badminton."User"("email");
 CREATE INDEX idx_user_role_id ON badminton."User"("role_id");
 CREATE INDEX idx_user_profile_picture ON badminton."User"("profile_picture_url");
+-- Typeahead LIKE 'prefix%' / '% prefix%' lookups (app/services/user_autocomplete.py)
+CREATE INDEX idx_user_username_trgm ON badminton."User" USING gin(lower(username) gin_trgm_ops);
+CREATE INDEX idx_user_full_name_trgm ON badminton."User" USING gin(lower(full_name) gin_trgm_ops);
+-- Name search (app/services/report_search.py and search_service.py build the same expression)
+CREATE INDEX idx_user_name_search ON badminton."User" USING gin(to_tsvector('simple', (coalesce(full_name, '') || ' ') || username));
 
 -- Match indexes
 CREATE INDEX idx_match_player1_id ON badminton."Match"("player1_id");
 CREATE INDEX idx_match_player2_id ON badminton."Match"("player2_id");
 CREATE INDEX idx_match_status ON badminton."Match"("status");
 CREATE INDEX idx_match_type ON badminton."Match"("match_type");
-CREATE INDEX idx_match_tournament_id ON badminton."Match"("tournament_id");
+-- Standings: verified matches of one tournament (also serves tournament_id alone)
+CREATE INDEX idx_match_tournament_status ON badminton."Match"("tournament_id", "status");
 CREATE INDEX idx_match_player1_verified ON badminton."Match"("player1_verified");
 CREATE INDEX idx_match_player2_verified ON badminton."Match"("player2_verified");
 CREATE INDEX idx_match_verification_status ON badminton."Match"("player1_verified", "player2_verified");
 
 -- Tournament indexes
 CREATE INDEX idx_tournament_is_active ON badminton."Tournament"("is_active");
+CREATE INDEX idx_tournament_name_search ON badminton."Tournament" USING gin(to_tsvector('simple', name));
 
 -- Medal indexes
 CREATE INDEX idx_medals_user_id ON badminton.medals(user_id);
@@ -342,6 +376,9 @@ CREATE INDEX idx_report_views_viewed_at ON badminton.report_views(viewed_at);
 CREATE INDEX idx_post_user_id ON badminton."Post"("user_id");
 CREATE INDEX idx_post_created_at ON badminton."Post"("created_at" DESC);
 CREATE INDEX idx_post_is_deleted ON badminton."Post"("is_deleted");
+-- Feed: newest live posts first
+CREATE INDEX idx_post_feed ON badminton."Post"("created_at" DESC) WHERE is_deleted = false;
+CREATE INDEX idx_post_content_search ON badminton."Post" USING gin(to_tsvector('english', content));
 
 -- Comment indexes
 CREATE INDEX idx_comment_post_id ON badminton."Comment"("post_id");
@@ -349,11 +386,15 @@ CREATE INDEX idx_comment_user_id ON badminton."Comment"("user_id");
 CREATE INDEX idx_comment_parent_comment_id ON badminton."Comment"("parent_comment_id");
 CREATE INDEX idx_comment_created_at ON badminton."Comment"("created_at" DESC);
 CREATE INDEX idx_comment_is_deleted ON badminton."Comment"("is_deleted");
+-- Threads: live top-level comments of a post in posting order
+CREATE INDEX idx_comment_thread ON badminton."Comment"("post_id", "parent_comment_id", "created_at") WHERE is_deleted = false;
+CREATE INDEX idx_comment_content_search ON badminton."Comment" USING gin(to_tsvector('english', content));
 
 -- Attachment indexes
 CREATE INDEX idx_attachment_post_id ON badminton."Attachment"("post_id");
 CREATE INDEX idx_attachment_comment_id ON badminton."Attachment"("comment_id");
 CREATE INDEX idx_attachment_file_type ON badminton."Attachment"("file_type");
+CREATE INDEX idx_attachment_pending ON badminton."Attachment"("created_at") WHERE "processing_status" = 'pending';
 
 -- Reaction indexes
 CREATE INDEX idx_post_reaction_post_id ON badminton."PostReaction"("post_id");
@@ -361,6 +402,9 @@ CREATE INDEX idx_post_reaction_user_id ON badminton."PostReaction"("user_id");
 CREATE INDEX idx_comment_reaction_comment_id ON badminton."CommentReaction"("comment_id");
 CREATE INDEX idx_comment_reaction_user_id ON badminton."CommentReaction"("user_id");
 
+-- Idempotency key indexes
+CREATE INDEX idx_idempotency_keys_expires_at ON badminton.idempotency_keys(expires_at);
+
 -- Access control indexes
 CREATE INDEX idx_roles_permissions_role_id ON access_control."RolesPermissions"("role_id");
 CREATE INDEX idx_roles_permissions_permission_id ON access_control."RolesPermissions"("permission_id");
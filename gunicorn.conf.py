@@ -0,0 +1,55 @@
+"""
+Gunicorn configuration for production.
+
+    gunicorn main:app --config gunicorn.conf.py
+
+Runs uvicorn workers sized from the CPU count and the database connection budget
+(see app/core/runtime.py). The app is preloaded in the master, which also runs the
+database initialization once (RUN_DB_INIT=true) before any worker is forked.
+
+Reloading:
+    kill -HUP <master>   graceful restart of all workers (same code, since the app is preloaded)
+    kill -USR2 <master>  start a new master with new code; then WINCH + QUIT the old one
+"""
+import os
+
+from app.core.runtime import threadpool_size, worker_count
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = worker_count()
+preload_app = True
+
+# Let in-flight requests finish on reload/shutdown; long-lived SSE streams are cut after this
+graceful_timeout = 30
+timeout = 60
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth; jitter avoids restarting all at once
+max_requests = 5000
+max_requests_jitter = 500
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    from app.core.config import settings
+
+    server.log.info(f"Starting {workers} workers with {threadpool_size()} threads each")
+    if settings.run_db_init:
+        from startup import run_database_init
+
+        run_database_init()
+
+        # Close the master's connections before workers are forked
+        from app.core.database import engine
+
+        engine.dispose()
+
+
+def post_fork(server, worker):
+    # Connections opened in the master (preload, init_db) must not be shared with children
+    from app.core.database import engine
+
+    engine.dispose(close=False)
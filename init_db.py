@@ -5,6 +5,11 @@ Run this to create tables and add sample data
 """
 
 from datetime import datetime, timedelta
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
 
 from app.core.auth import get_password_hash
 from app.core.database import SessionLocal, engine
@@ -15,8 +20,14 @@ from app.models.tournament_invitations import TournamentParticipant, TournamentI
 
 
 def init_db():
+    fresh = not inspect(engine).has_table("User", schema="badminton")
+
     # Create all tables
     Base.metadata.create_all(bind=engine)
+    if fresh:
+        # The new tables are what the latest migration describes; older databases are
+        # left unstamped so `alembic upgrade head` brings them there
+        command.stamp(Config(str(Path(__file__).parent / "alembic.ini")), "head")
 
     db = SessionLocal()
 
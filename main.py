@@ -1,17 +1,11 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import os
 import logging
 import sys
 
-try:
-    from app.api.routers import auth, matches, tournaments, users, permissions, roles, verification, medals, tournament_invitations, reports, posts
-    print("✅ All routers imported successfully")
-except Exception as e:
-    print(f"❌ Failed to import routers: {e}")
-    sys.exit(1)
-
 try:
     from app.core.config import settings
     print("✅ Settings imported successfully")
@@ -19,6 +13,10 @@ except Exception as e:
     print(f"❌ Failed to import settings: {e}")
     sys.exit(1)
 
+from app.api.routers import LazyRouterMiddleware, RouterRegistry
+from app.core.etag import ETagMiddleware
+from app.core.file_responses import RangeStaticFiles
+
 # Configure logging
 try:
     logging.basicConfig(
@@ -34,9 +32,35 @@ except Exception as e:
 # Create database tables (only in production)
 # Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.core.events import get_event_backend
+    from app.core.invalidation import get_invalidation_bus
+    from app.core.runtime import configure_threadpool
+
+    configure_threadpool()
+    event_backend = get_event_backend()
+    invalidation_bus = get_invalidation_bus()
+    event_backend.start()
+    invalidation_bus.start()
+    scheduler = None
+    if settings.scheduler_enabled:
+        from app.services.housekeeping import create_scheduler
+
+        scheduler = create_scheduler()
+        scheduler.start()
+    yield
+    if scheduler is not None:
+        await scheduler.stop()
+    invalidation_bus.stop()
+    event_backend.stop()
+
 app = FastAPI(
     title="Badminton App API", 
     version="1.0.0",
+    lifespan=lifespan,
+    # orjson encodes the large lists (matches, feed) several times faster than json.dumps
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if not settings.is_production else None,
     redoc_url="/redoc" if not settings.is_production else None
 )
@@ -48,32 +72,69 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# ETags for read endpoints that declare their collections (see app/core/conditional.py);
+# added before compression so that compressed responses get the weak form
+app.add_middleware(ETagMiddleware)
+
+# Per-request SQL statistics (Server-Timing header, slow request log, per-route histograms)
+if settings.query_stats_enabled:
+    from app.core.query_stats import QueryStatsMiddleware
+    app.add_middleware(QueryStatsMiddleware, server_timing=settings.server_timing)
+
+# Compress JSON and text responses (brotli or gzip); disable where nginx compresses
+if settings.compression_enabled:
+    from app.core.compression import CompressionMiddleware
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.gzip_level,
+        brotli_quality=settings.brotli_quality,
+    )
+
 # Create uploads directory if it doesn't exist
 os.makedirs("uploads/profile_pictures", exist_ok=True)
 
-# Mount static files
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-
-# Include routers
-app.include_router(auth.router)
-app.include_router(users.router)
-app.include_router(verification.router)
-app.include_router(matches.router)
-app.include_router(tournaments.router)
-app.include_router(permissions.router)
-app.include_router(roles.router)
-app.include_router(medals.router)
-app.include_router(tournament_invitations.router)
-app.include_router(reports.router)
-app.include_router(posts.router)
-
-# Health check
+# Mount static files (byte ranges and conditional requests, see app/core/file_responses.py)
+app.mount("/uploads", RangeStaticFiles(directory="uploads"), name="uploads")
+
+# Include routers (lazily on scale-to-zero hosts, see app/api/routers/__init__.py)
+routers = RouterRegistry(app)
+if settings.lazy_routers:
+    app.add_middleware(LazyRouterMiddleware, registry=routers)
+else:
+    try:
+        routers.load_all()
+        print("✅ All routers imported successfully")
+    except Exception as e:
+        print(f"❌ Failed to import routers: {e}")
+        sys.exit(1)
+
+# Liveness: the process answers (container restarts, platform health checks)
 @app.get("/health")
-def health_check():
+@app.get("/health/live")
+async def health_check():
     return {"status": "healthy"}
 
+# Readiness: database, pool and upload directory (load balancer rotation)
+@app.get("/health/ready")
+async def readiness_check():
+    from app.core.health import FAIL, readiness
+
+    result = await readiness()
+    return JSONResponse(result, status_code=503 if result["status"] == FAIL else 200)
+
+# Metrics in Prometheus text format (per worker process)
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    from app.core.metrics import render
+
+    if settings.metrics_token and request.headers.get("authorization") != f"Bearer {settings.metrics_token}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Database initialization endpoint
 @app.post("/init-db")
 def init_database():
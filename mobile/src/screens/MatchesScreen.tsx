@@ -9,13 +9,14 @@ import {
   ActivityIndicator,
 } from 'react-native';
 import { useNavigation } from '@react-navigation/native';
-import { Match } from '../types';
+import { Match, UserSuggestion } from '../types';
 import { apiService } from '../services/api';
 import { FloatingActionButton } from '../components/FloatingActionButton';
 
 export const MatchesScreen: React.FC = () => {
   const navigation = useNavigation();
   const [matches, setMatches] = useState<Match[]>([]);
+  const [users, setUsers] = useState<Record<string, UserSuggestion>>({});
   const [isLoading, setIsLoading] = useState(true);
 
   useEffect(() => {
@@ -25,9 +26,13 @@ export const MatchesScreen: React.FC = () => {
   const loadMatches = async () => {
     try {
       setIsLoading(true);
-      const matchesData = await apiService.getMatches();
+      // Only what the match cards show
+      const matchesData = await apiService.getMatchesNormalized([
+        'player1_id', 'player2_id', 'player1_score', 'player2_score', 'match_type', 'status', 'notes', 'match_date',
+      ]);
       // Matches are already sorted by newest to oldest from the backend
-      setMatches(matchesData);
+      setMatches(matchesData.matches);
+      setUsers(matchesData.users);
     } catch (error) {
       console.error('Failed to load matches:', error);
       Alert.alert('Error', 'Failed to load matches. Please try again.');
@@ -113,14 +118,14 @@ export const MatchesScreen: React.FC = () => {
               <View style={styles.playersContainer}>
                 <View style={styles.player}>
                   <Text style={styles.playerName}>
-                    {match.player1?.full_name || `Player ${match.player1_id}`}
+                    {users[match.player1_id]?.full_name || `Player ${match.player1_id}`}
                   </Text>
                   <Text style={styles.playerScore}>{match.player1_score}</Text>
                 </View>
                 <Text style={styles.vsText}>VS</Text>
                 <View style={styles.player}>
                   <Text style={styles.playerName}>
-                    {match.player2?.full_name || `Player ${match.player2_id}`}
+                    {users[match.player2_id]?.full_name || `Player ${match.player2_id}`}
                   </Text>
                   <Text style={styles.playerScore}>{match.player2_score}</Text>
                 </View>
@@ -1,11 +1,13 @@
 // API service for Badminton App
-import { User, UserLogin, UserCreate, Match, MatchCreate, MatchVerification, Tournament, TournamentCreate, TournamentStats, TournamentLeaderboard, Report, ReportCreate, ReportUpdate, ReportReactionCreate, Post, PostCreate, PostUpdate, Comment, CommentCreate, CommentUpdate, Attachment, AttachmentCreate, PostReactionCreate, CommentReactionCreate, TournamentInvitation, TournamentParticipant } from '../types';
+import { User, UserLogin, UserCreate, Match, MatchCreate, MatchesNormalized, MatchVerification, Tournament, TournamentCreate, TournamentStats, TournamentLeaderboard, Report, ReportCreate, ReportUpdate, ReportReactionCreate, Post, PostCreate, PostUpdate, Comment, CommentCreate, CommentUpdate, Attachment, AttachmentCreate, PostReactionCreate, CommentReactionCreate, TournamentInvitation, TournamentParticipant, SearchResponse, SearchType, UserSuggestion, BulkInvitationResponse } from '../types';
 import config from '../config/environment';
 
 const API_BASE_URL = config.API_BASE_URL;
 
 class ApiService {
   private baseUrl: string;
+  // Last response of each GET URL with an ETag; sent back as If-None-Match, reused on 304
+  private etagCache = new Map<string, { etag: string; data: unknown }>();
 
   constructor(baseUrl: string = API_BASE_URL) {
     this.baseUrl = baseUrl;
@@ -16,12 +18,17 @@ class ApiService {
     options: RequestInit = {}
   ): Promise<T> {
     const url = `${this.baseUrl}${endpoint}`;
+    const isGet = (options.method || 'GET').toUpperCase() === 'GET';
+    const cached = isGet ? this.etagCache.get(url) : undefined;
     
     // Don't set Content-Type for FormData, let the browser set it with boundary
     const headers: Record<string, string> = {};
     if (!(options.body instanceof FormData)) {
       headers['Content-Type'] = 'application/json';
     }
+    if (cached) {
+      headers['If-None-Match'] = cached.etag;
+    }
     
     const config: RequestInit = {
       headers: {
@@ -49,6 +56,11 @@ class ApiService {
         headers: Object.fromEntries(response.headers.entries()),
       });
 
+      // Nothing changed since the cached copy: the server skipped the query and the body
+      if (response.status === 304 && cached) {
+        return cached.data as T;
+      }
+
       if (!response.ok) {
         const errorText = await response.text();
         console.error('API Error Response:', errorText);
@@ -60,7 +72,12 @@ class ApiService {
         return null;
       }
 
-      return await response.json();
+      const data = await response.json();
+      const etag = response.headers.get('ETag');
+      if (isGet && etag) {
+        this.etagCache.set(url, { etag, data });
+      }
+      return data;
     } catch (error) {
       console.error('API request failed:', error);
       throw error;
@@ -76,6 +93,7 @@ class ApiService {
   }
 
   async logout(): Promise<void> {
+    this.etagCache.clear();
     return this.request('/auth/logout', {
       method: 'POST',
     });
@@ -97,6 +115,12 @@ class ApiService {
     return this.request('/users');
   }
 
+  // Typeahead for user pickers; avoids downloading the full user list
+  async autocompleteUsers(query: string, limit: number = 10): Promise<UserSuggestion[]> {
+    const queryParams = new URLSearchParams({ q: query, limit: limit.toString() });
+    return this.request(`/users/autocomplete?${queryParams.toString()}`);
+  }
+
   async getUser(id: number): Promise<User> {
     return this.request(`/users/${id}`);
   }
@@ -126,9 +150,20 @@ class ApiService {
     return this.request('/matches');
   }
 
-  async createMatch(matchData: MatchCreate): Promise<Match> {
+  // Matches reference players by id; each user is sent once in `users`.
+  // With `fields`, matches carry only those fields (and id).
+  async getMatchesNormalized(fields?: (keyof Match)[]): Promise<MatchesNormalized> {
+    const queryString = fields ? `?fields=${fields.join(',')}` : '';
+    return this.request(`/matches/normalized${queryString}`);
+  }
+
+  async createMatch(matchData: MatchCreate, idempotencyKey?: string): Promise<Match> {
+    // Reuse the same key when retrying so the server returns the original match
     return this.request('/matches', {
       method: 'POST',
+      ...(idempotencyKey && {
+        headers: { 'Content-Type': 'application/json', 'Idempotency-Key': idempotencyKey },
+      }),
       body: JSON.stringify(matchData),
     });
   }
@@ -202,6 +237,13 @@ class ApiService {
     });
   }
 
+  async inviteUsersToTournament(tournamentId: number, userIds: number[]): Promise<BulkInvitationResponse> {
+    return this.request(`/tournament-invitations/tournament/${tournamentId}/invite`, {
+      method: 'POST',
+      body: JSON.stringify({ user_ids: userIds }),
+    });
+  }
+
   async respondToInvitation(invitationId: number, status: string): Promise<TournamentInvitation> {
     return this.request(`/tournament-invitations/${invitationId}/respond`, {
       method: 'POST',
@@ -238,6 +280,19 @@ class ApiService {
     return this.request('/health');
   }
 
+  // Search API: one server-side search instead of filtering downloaded lists
+  async search(query: string, params?: {
+    types?: SearchType[];
+    skip?: number;
+    limit?: number;
+  }): Promise<SearchResponse> {
+    const queryParams = new URLSearchParams({ q: query });
+    if (params?.types?.length) queryParams.append('types', params.types.join(','));
+    if (params?.skip !== undefined) queryParams.append('skip', params.skip.toString());
+    if (params?.limit !== undefined) queryParams.append('limit', params.limit.toString());
+    return this.request(`/search?${queryParams.toString()}`);
+  }
+
   // Reports API
   async getReports(params?: {
     skip?: number;
@@ -15,6 +15,13 @@ export interface User {
   profile_picture_updated_at?: string;
 }
 
+export interface UserSuggestion {
+  id: number;
+  username: string;
+  full_name: string;
+  profile_picture_url?: string;
+}
+
 export interface UserMedalCounts {
   gold: number;
   silver: number;
@@ -60,6 +67,11 @@ export interface Match {
   verified_by?: User;
 }
 
+export interface MatchesNormalized {
+  matches: Match[];
+  users: Record<string, UserSuggestion>;
+}
+
 export interface MatchCreate {
   player1_id: number;
   player2_id: number;
@@ -84,6 +96,8 @@ export interface Tournament {
   is_active: boolean;
   status: string;
   created_at: string;
+  participant_count?: number;
+  invitation_count?: number;
 }
 
 export interface TournamentCreate {
@@ -180,6 +194,18 @@ export interface TournamentInvitationUpdate {
   status: 'accepted' | 'declined';
 }
 
+export interface BulkInvitationOutcome {
+  user_id: number;
+  status: 'invited' | 'joined' | 'already_invited' | 'already_participant' | 'user_not_found';
+  invitation_id?: number;
+}
+
+export interface BulkInvitationResponse {
+  tournament_id: number;
+  invited_count: number;
+  outcomes: BulkInvitationOutcome[];
+}
+
 // Reports types
 export interface Report {
   id: number;
@@ -308,3 +334,27 @@ export interface CommentReaction {
 export interface CommentReactionCreate {
   emoji: string;
 }
+
+export type SearchType = 'post' | 'comment' | 'report' | 'user' | 'tournament';
+
+export interface SearchHit {
+  type: SearchType;
+  id: number;
+  score: number;
+  title: string;
+  snippet?: string;
+  created_at?: string;
+  user_id?: number;
+  user_full_name?: string;
+  post_id?: number;
+  profile_picture_url?: string;
+  status?: string;
+}
+
+export interface SearchResponse {
+  hits: SearchHit[];
+  counts: Partial<Record<SearchType, number>>;
+  total_count: number;
+  skip: number;
+  limit: number;
+}
@@ -1,12 +1,11 @@
 #!/usr/bin/env python3
 """
 Startup script for Railway deployment
-This script initializes the database and starts the FastAPI server
+This script starts the FastAPI server under gunicorn; the gunicorn master
+initializes the database once before forking workers
 """
 
 import os
-import sys
-import subprocess
 from pathlib import Path
 
 def run_database_init():
@@ -33,26 +32,18 @@ def run_database_init():
         return True  # Don't fail startup if database init fails
 
 def start_server():
-    """Start the FastAPI server"""
+    """Start the FastAPI server under gunicorn (see gunicorn.conf.py)"""
     port = os.getenv("PORT", "8000")
     print(f"🚀 Starting FastAPI server on port {port}")
     
-    # Start uvicorn server
-    subprocess.run([
-        "uvicorn", 
-        "main:app", 
-        "--host", "0.0.0.0", 
-        "--port", port,
-        "--workers", "1"
+    # The gunicorn master runs run_database_init once before forking workers
+    os.environ.setdefault("RUN_DB_INIT", "true")
+    os.execvp("gunicorn", [
+        "gunicorn",
+        "main:app",
+        "--config", str(Path(__file__).parent / "gunicorn.conf.py")
     ])
 
 if __name__ == "__main__":
     print("🏸 Badminton App - Starting up...")
-    
-    # Initialize database first
-    if run_database_init():
-        # Start the server
-        start_server()
-    else:
-        print("💥 Failed to initialize database. Exiting.")
-        sys.exit(1)
+    start_server()
@@ -1,10 +1,10 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.core.database import Base, get_db
+from app.core.database import Base, attach_sqlite_schemas, get_db
 from main import app
 
 # Test database URL - use in-memory SQLite for fast, isolated tests
@@ -15,6 +15,8 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+# Tables live in the badminton and access_control schemas
+attach_sqlite_schemas(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def override_get_db():
@@ -27,27 +29,52 @@ def override_get_db():
 app.dependency_overrides[get_db] = override_get_db
 
 @pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database for each test."""
-    # Create tables for this test
+def db_engine():
+    """The test database, with fresh tables for each test."""
     Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture(scope="function")
+def session_factory(db_engine):
+    """Session factory for code that opens its own sessions."""
+    return TestingSessionLocal
+
+@pytest.fixture(scope="function")
+def test_get_db(db_engine):
+    """get_db override for apps built inside a test."""
+    return override_get_db
+
+@pytest.fixture(scope="function")
+def db_session(db_engine):
+    """Create a fresh database for each test."""
     db = TestingSessionLocal()
     try:
         yield db
     finally:
         db.close()
-        # Drop all tables after test
-        Base.metadata.drop_all(bind=engine)
 
 @pytest.fixture(scope="function")
-def client():
+def client(db_engine):
     """Create a test client."""
-    # Create tables for this test session
-    Base.metadata.create_all(bind=engine)
     with TestClient(app) as c:
         yield c
-    # Clean up after test
-    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture(scope="function")
+def statements(db_engine):
+    """SQL statements executed on the test database; clear() it before the part being counted."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(db_engine, "before_cursor_execute", record)
 
 @pytest.fixture
 def test_user_data():
@@ -0,0 +1,126 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import HTTPException
+from PIL import Image
+
+from app.common.enums import AttachmentType
+from app.core.media import LocalMediaStore, key_from_url, set_media_store
+from app.models import User
+from app.models.posts import Comment, Post
+from app.services import attachment_service
+from app.services.attachment_service import (
+    DISPLAY_SIZE,
+    append_upload,
+    complete_upload,
+    get_upload,
+    process_attachment,
+    start_upload,
+    upload_attachment,
+)
+
+
+async def _chunks(data: bytes, size: int = 1000):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (30, 120, 200)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def setup(monkeypatch, tmp_path, db_session):
+    store = LocalMediaStore(tmp_path / "media")
+    set_media_store(store)
+    queued = []
+    monkeypatch.setattr(attachment_service, "enqueue_processing", queued.append)
+    user = User(username="alice", email="alice@example.com", full_name="Alice", hashed_password="x")
+    db_session.add(user)
+    db_session.flush()
+    post = Post(user_id=user.id, content="Match photos")
+    db_session.add(post)
+    db_session.flush()
+    comment = Comment(post_id=post.id, user_id=user.id, content="And a clip")
+    db_session.add(comment)
+    db_session.commit()
+    yield db_session, store, queued, user, post, comment
+    set_media_store(None)
+
+
+class TestAttachmentUploads:
+    def test_upload_is_processed_into_renditions(self, setup):
+        """Test that an uploaded image gets its dimensions and renditions, rendered once per content."""
+        db, store, queued, user, post, comment = setup
+        photo = _jpeg(3000, 2000)
+
+        attachment = asyncio.run(upload_attachment(db, user.id, _chunks(photo), "rally.jpg", "image/jpeg", post_id=post.id))
+        assert attachment.file_type == AttachmentType.IMAGE
+        assert attachment.processing_status == "pending"
+        assert queued == [attachment.id]
+
+        assert process_attachment(db, attachment.id) == "ready"
+        metadata = attachment.file_metadata
+        assert (metadata["width"], metadata["height"]) == (3000, 2000)
+        with Image.open(store.local_path(key_from_url(metadata["renditions"]["display"]))) as display:
+            assert display.size == (DISPLAY_SIZE, DISPLAY_SIZE * 2 // 3)
+        blobs = len(list(store.iter_blobs()))
+
+        again = asyncio.run(upload_attachment(db, user.id, _chunks(photo), "copy.jpg", "image/jpeg", comment_id=comment.id))
+        process_attachment(db, again.id)
+        assert again.file_path == attachment.file_path
+        assert again.file_metadata["renditions"] == metadata["renditions"]
+        assert len(list(store.iter_blobs())) == blobs
+
+        broken = asyncio.run(upload_attachment(db, user.id, _chunks(b"not a picture"), "x.png", "image/png", post_id=post.id))
+        assert process_attachment(db, broken.id) == "failed"
+
+    def test_resumable_upload(self, setup):
+        """Test resuming from the server's offset, offset conflicts and attaching the finished upload."""
+        db, store, queued, user, post, comment = setup
+        data = b"%PDF" + bytes(range(256)) * 20
+
+        session = start_upload(user.id, "draw.pdf", None, len(data))
+        assert asyncio.run(append_upload(session.id, user.id, 0, _chunks(data[:2000]))).offset == 2000
+        with pytest.raises(HTTPException) as conflict:
+            asyncio.run(append_upload(session.id, user.id, 0, _chunks(data)))
+        assert conflict.value.status_code == 409
+        with pytest.raises(HTTPException) as incomplete:
+            asyncio.run(complete_upload(db, session.id, user.id, comment_id=comment.id))
+        assert incomplete.value.status_code == 409
+
+        offset = get_upload(session.id, user.id).offset
+        asyncio.run(append_upload(session.id, user.id, offset, _chunks(data[offset:])))
+        with pytest.raises(HTTPException) as not_owner:
+            asyncio.run(complete_upload(db, session.id, user.id + 1, comment_id=comment.id))
+        assert not_owner.value.status_code == 404
+
+        attachment = asyncio.run(complete_upload(db, session.id, user.id, comment_id=comment.id))
+        assert attachment.file_type == AttachmentType.DOCUMENT
+        assert attachment.mime_type == "application/pdf"
+        assert store.open(key_from_url(attachment.file_path)).read() == data
+        assert list(store.staging_dir().iterdir()) == []
+
+    def test_uploaded_pages_are_stored_and_served_as_downloads(self, setup, client):
+        """Test that HTML and SVG uploads cannot run as pages on the API's origin."""
+        db, store, queued, user, post, comment = setup
+        for file_name, mime_type in (("evil.html", "text/html"), ("evil.svg", "image/svg+xml"), ("evil.html", None)):
+            attachment = asyncio.run(upload_attachment(
+                db, user.id, _chunks(f"<script>{file_name}{mime_type}</script>".encode()), file_name, mime_type, post_id=post.id,
+            ))
+            assert attachment.file_path.endswith(".bin")
+            response = client.get(attachment.file_path)
+            assert response.headers["content-type"] == "application/octet-stream"
+            assert response.headers["content-disposition"] == "attachment"
+            assert response.headers["x-content-type-options"] == "nosniff"
+
+        # The declared media type picks the extension, not the file name
+        photo = asyncio.run(upload_attachment(db, user.id, _chunks(_jpeg(10, 10)), "photo.html", "image/jpeg", post_id=post.id))
+        assert photo.file_path.endswith(".jpg")
+        response = client.get(photo.file_path)
+        assert response.headers["content-type"] == "image/jpeg"
+        assert "content-disposition" not in response.headers
+        assert response.headers["x-content-type-options"] == "nosniff"
@@ -0,0 +1,42 @@
+from sqlalchemy import func
+
+from app.models import Match, Post, ReportView, User
+from benchmarks.data import DatasetSize, generate
+from benchmarks.index_advisor import predicates, propose, table_aliases
+from benchmarks.run import percentile
+
+
+class TestBenchmarks:
+    def test_generate_small_dataset(self, db_engine, db_session):
+        """Test that the generator fills every table consistently."""
+        size = DatasetSize(users=10, matches=50, tournaments=2, participants_per_tournament=4, posts=5, reports=3, views_per_report=2)
+
+        generate(db_engine, size, seed=1)
+
+        assert db_session.query(func.count(User.id)).scalar() == 10
+        assert db_session.query(func.count(Match.id)).scalar() == 50
+        assert db_session.query(func.count(Post.id)).scalar() == 5
+        assert db_session.query(Match).filter(Match.player1_id == Match.player2_id).count() == 0
+        assert db_session.query(func.count(ReportView.id)).scalar() <= 3 * 4
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles."""
+        values = [float(value) for value in range(1, 101)]
+
+        assert percentile(values, 0.50) == 50.0
+        assert percentile(values, 0.99) == 99.0
+        assert percentile([], 0.95) == 0.0
+
+    def test_index_advisor_reads_filters_and_order(self):
+        """Test equality-then-order columns, partial predicates and aliases from emitted SQL."""
+        statement = (
+            'SELECT "Comment_1".id FROM badminton."Comment" AS "Comment_1" '
+            'WHERE "Comment_1".post_id = ? AND "Comment_1".parent_comment_id IS NULL AND "Comment_1".is_deleted = 0 '
+            'ORDER BY "Comment_1".created_at ASC LIMIT ? OFFSET ?'
+        )
+
+        assert table_aliases(statement) == {"Comment_1": "Comment"}
+        assert predicates(statement, "Comment_1") == (["post_id", "parent_comment_id"], None, ["is_deleted = false"])
+        assert propose(statement, "Comment_1", sorts=True) == (
+            ["post_id", "parent_comment_id", "created_at"], ["is_deleted = false"]
+        )
@@ -0,0 +1,61 @@
+import gzip
+
+import brotli
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+
+def _app() -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/matches")
+    def matches(response: Response):
+        response.headers["ETag"] = '"v1"'
+        return [{"id": index, "player1": {"username": f"player_{index}"}} for index in range(100)]
+
+    @app.get("/small")
+    def small():
+        return {"status": "ok"}
+
+    @app.get("/export")
+    def export():
+        return StreamingResponse((f"row {index}\n" for index in range(1000)), media_type="text/csv")
+
+    return app
+
+
+class TestCompression:
+    def test_accept_encoding_negotiation(self):
+        """Test brotli preference, q=0 refusals and the wildcard."""
+        assert choose_encoding("gzip, deflate, br") == "br"
+        assert choose_encoding("gzip, deflate, br", brotli_available=False) == "gzip"
+        assert choose_encoding("br;q=0, gzip;q=0.5") == "gzip"
+        assert choose_encoding("*") == "br"
+        assert choose_encoding("identity") is None
+        assert choose_encoding("") is None
+
+    def test_compresses_large_and_streamed_bodies_only(self):
+        """Test brotli and gzip bodies, Vary, weakened ETags and small responses left alone."""
+        client = TestClient(_app())
+        plain = client.get("/matches", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+
+        for encoding, decompress in (("br", brotli.decompress), ("gzip", gzip.decompress)):
+            # httpx would decode the body itself; ask for the raw bytes
+            with client.stream("GET", "/matches", headers={"Accept-Encoding": encoding}) as response:
+                raw = b"".join(response.iter_raw())
+            assert response.headers["content-encoding"] == encoding
+            assert response.headers["vary"] == "Accept-Encoding"
+            assert response.headers["etag"] == 'W/"v1"'
+            assert int(response.headers["content-length"]) == len(raw) < len(plain.content)
+            assert decompress(raw) == plain.content
+
+        small = client.get("/small", headers={"Accept-Encoding": "br"})
+        assert "content-encoding" not in small.headers
+        streamed = client.get("/export", headers={"Accept-Encoding": "gzip"})
+        assert streamed.headers["content-encoding"] == "gzip"
+        assert streamed.text.count("\n") == 1000
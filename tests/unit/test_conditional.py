@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.conditional import collection_etag
+from app.core.database import get_db
+from app.core.etag import ETagMiddleware
+from app.core.invalidation import mark_changed
+from app.core.versions import get_versions
+from app.models.models import Tournament
+
+
+class TestCollectionVersions:
+    def test_commits_bump_the_namespaces_they_change(self, db_session):
+        """Test that ORM commits and mark_changed bump versions, and that rolled back changes do not."""
+        assert get_versions(db_session, ["tournaments", "invitations"]) == {"invitations": 0, "tournaments": 0}
+        db_session.add(Tournament(name="Cup", start_date=datetime(2025, 5, 1)))
+        db_session.commit()
+        assert get_versions(db_session, ["tournaments", "invitations"]) == {"invitations": 0, "tournaments": 1}
+
+        db_session.add(Tournament(name="Open", start_date=datetime(2025, 6, 1)))
+        db_session.rollback()
+        mark_changed(db_session, "invitations", [1, 2])
+        db_session.commit()
+        assert get_versions(db_session, ["tournaments", "invitations"]) == {"invitations": 1, "tournaments": 1}
+
+    def test_unchanged_collection_is_answered_304_without_running_the_endpoint(self, session_factory, test_get_db):
+        """Test that a matching If-None-Match skips the endpoint until the collection changes."""
+        calls = []
+
+        app = FastAPI()
+        app.add_middleware(ETagMiddleware)
+
+        @app.get("/tournaments", dependencies=[Depends(collection_etag("tournaments", public=True))])
+        def tournaments(db: Session = Depends(get_db)):
+            calls.append(1)
+            return [tournament.name for tournament in db.query(Tournament)]
+
+        app.dependency_overrides[get_db] = test_get_db
+        client = TestClient(app)
+
+        first = client.get("/tournaments")
+        etag = first.headers["etag"]
+        assert first.status_code == 200 and first.headers["cache-control"] == "private, no-cache"
+
+        again = client.get("/tournaments", headers={"If-None-Match": etag})
+        assert again.status_code == 304 and again.content == b"" and again.headers["etag"] == etag
+        assert len(calls) == 1
+        assert client.get("/tournaments?page=2", headers={"If-None-Match": etag}).status_code == 200
+
+        with session_factory() as db:
+            db.add(Tournament(name="Cup", start_date=datetime(2025, 5, 1)))
+            db.commit()
+        changed = client.get("/tournaments", headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.json() == ["Cup"]
+        assert changed.headers["etag"] != etag
+
+    def test_public_tournament_routes_need_no_token(self, db_session, client):
+        """Test that the tournament routes that were public stay public with their ETag checks."""
+        tournament = Tournament(name="Cup", start_date=datetime(2025, 5, 1))
+        db_session.add(tournament)
+        db_session.commit()
+        tournament_id = tournament.id
+
+        for path in [
+            "/tournaments", "/tournaments?active_only=false", "/tournaments/public",
+            f"/tournaments/{tournament_id}", f"/tournaments/{tournament_id}/leaderboard",
+        ]:
+            response = client.get(path)
+            assert response.status_code == 200, path
+            assert client.get(path, headers={"If-None-Match": response.headers["etag"]}).status_code == 304
@@ -0,0 +1,55 @@
+from app.api.routers.events import _format_sse, _is_relevant
+from app.core import events
+from app.core.events import (
+    EVENTS_CHANNEL,
+    EventTypes,
+    InMemoryEventBackend,
+    publish_event,
+)
+
+
+class TestEvents:
+    def test_in_memory_backend_delivers_and_unsubscribes(self):
+        """Test subscribe, publish and unsubscribe on the in-memory backend."""
+        backend = InMemoryEventBackend()
+        received = []
+        unsubscribe = backend.subscribe("channel", received.append)
+
+        backend.publish("channel", {"n": 1})
+        backend.publish("other", {"n": 2})
+        unsubscribe()
+        backend.publish("channel", {"n": 3})
+
+        assert received == [{"n": 1}]
+
+    def test_failing_subscriber_does_not_block_others(self):
+        """Test that one broken callback does not stop delivery."""
+        backend = InMemoryEventBackend()
+        received = []
+
+        def broken(message):
+            raise RuntimeError("boom")
+
+        backend.subscribe("channel", broken)
+        backend.subscribe("channel", received.append)
+        backend.publish("channel", {"n": 1})
+
+        assert received == [{"n": 1}]
+
+    def test_publish_event_targets_users(self, monkeypatch):
+        """Test event filtering by user, tournament and type."""
+        backend = InMemoryEventBackend()
+        # The process-wide backend is restored after the test
+        monkeypatch.setattr(events, "_event_backend", backend)
+        received = []
+        backend.subscribe(EVENTS_CHANNEL, received.append)
+
+        publish_event(EventTypes.MATCH_CREATED, {"match_id": 1}, user_ids=[2, 1, 2], tournament_id=5)
+        event = received[0]
+
+        assert event["user_ids"] == [1, 2]
+        assert _is_relevant(event, 1, None, None)
+        assert not _is_relevant(event, 3, None, None)
+        assert not _is_relevant(event, 1, 6, None)
+        assert not _is_relevant(event, 1, None, {EventTypes.MATCH_VERIFIED})
+        assert "event: match.created" in _format_sse(event)
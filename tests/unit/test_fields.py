@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.fields import parse_fields, render_fields
+from app.models import User
+from app.models.medals import Medal
+from app.models.models import Tournament
+from app.schemas.schemas import TournamentResponse
+from app.services.user_service import USER_LIST_FIELDS, get_all_users
+
+
+class TestSparseFields:
+    def test_parse_fields(self):
+        """Test that id always comes first, duplicates collapse and unknown names are rejected."""
+        assert parse_fields(None, USER_LIST_FIELDS) is None
+        assert parse_fields("full_name, username,full_name", USER_LIST_FIELDS) == ["id", "full_name", "username"]
+        with pytest.raises(HTTPException) as error:
+            parse_fields("username,hashed_password", USER_LIST_FIELDS)
+        assert error.value.status_code == 400
+        assert "hashed_password" in error.value.detail
+
+    def test_sparse_values_serialize_like_full_responses(self):
+        """Test that datetimes come out as the response model writes them."""
+        tournament = SimpleNamespace(
+            id=1, name="Cup", description=None, start_date=datetime(2025, 5, 1, 9, tzinfo=timezone.utc),
+            end_date=None, is_active=True, status="active", created_at=datetime(2025, 4, 1, 12, 30),
+            participant_count=0, invitation_count=0,
+        )
+        names = ["id", "start_date", "created_at"]
+
+        full = TournamentResponse.model_validate(tournament, from_attributes=True).model_dump(mode="json")
+        assert render_fields([tournament], names) == [{name: full[name] for name in names}]
+        assert render_fields([tournament], names)[0]["start_date"] == "2025-05-01T09:00:00Z"
+
+    def test_only_requested_columns_and_relationships_are_loaded(self, db_session, statements):
+        """Test that the user list selects just the requested columns and loads medals only when asked."""
+        users = [
+            User(username=f"player{index}", email=f"p{index}@example.com", full_name=f"Player {index}", hashed_password="x")
+            for index in range(5)
+        ]
+        tournament = Tournament(name="Cup", start_date=datetime(2025, 5, 1))
+        db_session.add_all(users + [tournament])
+        db_session.flush()
+        db_session.add(Medal(user_id=users[0].id, tournament_id=tournament.id, position=1, medal_type="gold"))
+        db_session.commit()
+        first_id = users[0].id
+        db_session.expunge_all()
+
+        statements.clear()
+        assert get_all_users(db_session, fields=["id", "full_name"])[0] == {"id": first_id, "full_name": "Player 0"}
+        assert len(statements) == 1
+        assert "email" not in statements[0] and "hashed_password" not in statements[0]
+
+        db_session.expunge_all()
+        statements.clear()
+        rows = get_all_users(db_session, fields=["id", "medals"])
+        assert rows[0]["medals"]["gold"] == 1
+        assert len(statements) == 2
@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+import app.core.database
+from app.core import health
+from app.core.config import settings
+
+
+class TestReadiness:
+    def test_full_pool_fails_and_busy_pool_degrades(self, monkeypatch):
+        """Test pool saturation thresholds."""
+        monkeypatch.setattr(app.core.database, "pool_status", lambda: {"checked_out": 10, "capacity": 10})
+        assert health.check_pool()["status"] == health.FAIL
+
+        monkeypatch.setattr(app.core.database, "pool_status", lambda: {"checked_out": 9, "capacity": 10})
+        assert health.check_pool()["status"] == health.DEGRADED
+
+    def test_result_is_cached_between_probes(self, monkeypatch, tmp_path):
+        """Test that repeated probes share one database round trip."""
+        calls = []
+        monkeypatch.setattr(health, "_database_round_trip", lambda: calls.append(1) or 1.0)
+        monkeypatch.setattr(settings, "upload_path", str(tmp_path))
+        monkeypatch.setattr(settings, "health_cache_seconds", 60)
+
+        async def probe_twice():
+            await health.readiness(force=True)
+            return await health.readiness()
+
+        result = asyncio.run(probe_twice())
+
+        assert result["status"] == health.OK
+        assert len(calls) == 1
+
+    def test_database_timeout_fails_readiness(self, monkeypatch, tmp_path):
+        """Test that a hanging database marks the worker as not ready."""
+        monkeypatch.setattr(health, "_database_round_trip", lambda: time.sleep(0.3) or 1.0)
+        monkeypatch.setattr(settings, "upload_path", str(tmp_path))
+        monkeypatch.setattr(settings, "health_db_timeout_seconds", 0.05)
+
+        result = asyncio.run(health.readiness(force=True))
+
+        assert result["status"] == health.FAIL
+        assert result["checks"]["database"]["status"] == health.FAIL
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+from app.common.enums import InvitationStatus
+from app.core.metrics import BACKGROUND_JOB_DURATION
+from app.core.scheduler import LeaderLock, Scheduler
+from app.models import Tournament, User
+from app.models.posts import Comment, Post
+from app.models.tournament_invitations import TournamentInvitation
+from app.services import housekeeping
+
+
+class TestHousekeeping:
+    def test_jobs_work_in_batches(self, db_session):
+        """Test invitation expiry, comment count repair and the soft-delete purge."""
+        long_ago = datetime.utcnow() - timedelta(days=90)
+
+        users = [User(username=f"user{index}", email=f"u{index}@example.com", full_name=f"User {index}", hashed_password="x") for index in range(6)]
+        tournament = Tournament(name="Club Open", start_date=datetime(2024, 6, 1))
+        db_session.add_all(users + [tournament])
+        db_session.flush()
+        db_session.add_all([
+            TournamentInvitation(tournament_id=tournament.id, user_id=user.id, invited_by=users[0].id,
+                                 status=InvitationStatus.PENDING.value,
+                                 expires_at=long_ago if index < 4 else datetime(2030, 1, 1))
+            for index, user in enumerate(users[1:])
+        ])
+        live, gone = Post(user_id=users[0].id, content="Still here", comment_count=7), Post(user_id=users[0].id, content="Gone", is_deleted=True)
+        db_session.add_all([live, gone])
+        db_session.flush()
+        parent = Comment(post_id=live.id, user_id=users[1].id, content="Deleted parent", is_deleted=True)
+        db_session.add(parent)
+        db_session.flush()
+        db_session.add_all([
+            Comment(post_id=live.id, user_id=users[2].id, content="Live reply", parent_comment_id=parent.id),
+            Comment(post_id=live.id, user_id=users[3].id, content="Deleted leaf", is_deleted=True),
+        ])
+        db_session.commit()
+        db_session.query(Comment).update({Comment.updated_at: long_ago})
+        db_session.query(Post).filter(Post.id == gone.id).update({Post.updated_at: long_ago})
+        db_session.commit()
+        live_id = live.id
+
+        assert housekeeping.expire_invitations(db_session, batch_size=3) == 4
+        assert db_session.query(TournamentInvitation).filter(TournamentInvitation.status == InvitationStatus.EXPIRED.value).count() == 4
+
+        assert housekeeping.refresh_comment_counts(db_session, batch_size=1) == 1
+        assert db_session.get(Post, live_id).comment_count == 1
+
+        # The parent stays while its reply is live
+        assert housekeeping.purge_deleted_content(db_session, retention_days=30) == 2
+        assert {comment.content for comment in db_session.query(Comment)} == {"Deleted parent", "Live reply"}
+        assert [post.id for post in db_session.query(Post)] == [live_id]
+
+
+class TestScheduler:
+    def test_run_job_reports_failures_and_reschedules(self, session_factory):
+        """Test that a failing job is recorded and does not stop the next run."""
+        scheduler = Scheduler(session_factory=session_factory, leader_lock=LeaderLock(dsn="sqlite://"))
+        calls = []
+
+        def flaky(db):
+            calls.append(db)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+
+        job = scheduler.add_job("flaky_test_job", 60, flaky, initial_delay_seconds=0)
+
+        assert scheduler._run_due_jobs() == 1
+        assert scheduler._run_due_jobs() == 0
+        job.due_at = 0
+        assert scheduler.run_job(job) is True
+
+        samples = BACKGROUND_JOB_DURATION.collect()
+        assert samples[("flaky_test_job", "failure")]["count"] == 1
+        assert samples[("flaky_test_job", "success")]["count"] == 1
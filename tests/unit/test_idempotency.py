@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.routers import matches as matches_router
+from app.common.enums import MatchType
+from app.core.auth import get_current_active_user
+from app.core.database import get_db
+from app.models import IdempotencyKey, User
+from app.models.models import Match
+from app.schemas.schemas import MatchCreate
+from app.services.idempotency_service import (
+    IDEMPOTENCY_HEADER,
+    REPLAYED_HEADER,
+    hash_request,
+    purge_expired_idempotency_keys,
+    save_idempotent_response,
+    validate_idempotency_key,
+)
+
+
+class TestIdempotency:
+    def test_hash_request_is_stable(self):
+        """Test that equal payloads hash identically regardless of key order."""
+        match = MatchCreate(player1_id=1, player2_id=2, player1_score=21, player2_score=18, match_type=MatchType.CASUAL)
+
+        assert hash_request(match) == hash_request(match.model_dump())
+        assert hash_request({"a": 1, "b": 2}) == hash_request({"b": 2, "a": 1})
+
+    def test_hash_request_detects_changes(self):
+        """Test that a different body produces a different fingerprint."""
+        first = MatchCreate(player1_id=1, player2_id=2, player1_score=21, player2_score=18, match_type=MatchType.CASUAL)
+        second = MatchCreate(player1_id=1, player2_id=2, player1_score=21, player2_score=19, match_type=MatchType.CASUAL)
+
+        assert hash_request(first) != hash_request(second)
+        assert hash_request([first]) != hash_request([first, second])
+
+    def test_validate_idempotency_key(self):
+        """Test key length validation."""
+        validate_idempotency_key("3f2b6c1e-retry-key")
+
+        with pytest.raises(HTTPException) as exc_info:
+            validate_idempotency_key("x" * 256)
+        assert exc_info.value.status_code == 400
+
+
+class TestIdempotentMatchEndpoints:
+    @pytest.fixture
+    def api(self, monkeypatch, session_factory, test_get_db):
+        """A client for the matches router on the test database, with two players"""
+        monkeypatch.setattr(matches_router, "authorize", lambda *args: None)
+        monkeypatch.setattr(matches_router, "publish_event", lambda *args, **kwargs: None)
+
+        with session_factory() as db:
+            players = [
+                User(username=f"player{index}", email=f"p{index}@example.com", full_name=f"Player {index}", hashed_password="x")
+                for index in range(2)
+            ]
+            db.add_all(players)
+            db.commit()
+            player_ids = [player.id for player in players]
+
+        app = FastAPI()
+        app.include_router(matches_router.router)
+        app.dependency_overrides[get_db] = test_get_db
+        app.dependency_overrides[get_current_active_user] = lambda: SimpleNamespace(id=player_ids[0])
+        body = {"player1_id": player_ids[0], "player2_id": player_ids[1], "player1_score": 21, "player2_score": 18, "match_type": "casual"}
+        return TestClient(app), session_factory, body
+
+    def test_retry_replays_the_stored_response(self, api):
+        """Test that a retry with the same key returns the first response without inserting again."""
+        client, SessionLocal, body = api
+        headers = {IDEMPOTENCY_HEADER: "retry-1"}
+
+        first = client.post("/matches", json=body, headers=headers)
+        retry = client.post("/matches", json=body, headers=headers)
+
+        assert first.status_code == retry.status_code == 200
+        assert REPLAYED_HEADER not in first.headers
+        assert retry.headers[REPLAYED_HEADER] == "true"
+        assert retry.json()["id"] == first.json()["id"]
+        with SessionLocal() as db:
+            assert db.query(Match).count() == 1
+
+    def test_reused_key_with_a_different_body_is_rejected(self, api):
+        """Test that a key already used for another body answers 422 and stores nothing."""
+        client, SessionLocal, body = api
+        headers = {IDEMPOTENCY_HEADER: "retry-2"}
+
+        client.post("/matches", json=body, headers=headers)
+        response = client.post("/matches", json={**body, "player2_score": 19}, headers=headers)
+
+        assert response.status_code == 422
+        assert IDEMPOTENCY_HEADER in response.json()["detail"]
+        with SessionLocal() as db:
+            assert db.query(Match).count() == 1
+
+    def test_concurrent_retry_rolls_back_and_replays_the_winner(self, api, monkeypatch):
+        """Test that losing the race on the key's unique constraint replays the winning response."""
+        client, SessionLocal, body = api
+        real_lookup = matches_router.get_idempotent_response
+        lookups = []
+
+        def lookup_while_the_other_request_commits(db, user_id, scope, key, request_hash):
+            lookups.append(key)
+            if len(lookups) > 1:
+                return real_lookup(db, user_id, scope, key, request_hash)
+            # The concurrent request stores its result after this one found no record
+            with SessionLocal() as other:
+                save_idempotent_response(other, user_id, scope, key, request_hash, {"id": 999}, 200)
+                other.commit()
+            return None
+
+        monkeypatch.setattr(matches_router, "get_idempotent_response", lookup_while_the_other_request_commits)
+        response = client.post("/matches", json=body, headers={IDEMPOTENCY_HEADER: "race"})
+
+        assert response.status_code == 200
+        assert response.json() == {"id": 999}
+        assert response.headers[REPLAYED_HEADER] == "true"
+        with SessionLocal() as db:
+            assert db.query(Match).count() == 0
+
+    def test_bulk_import_is_idempotent(self, api):
+        """Test that a retried bulk import replays every match once."""
+        client, SessionLocal, body = api
+        headers = {IDEMPOTENCY_HEADER: "bulk-1"}
+        matches = [body, {**body, "player2_score": 15}]
+
+        first = client.post("/matches/bulk", json=matches, headers=headers)
+        retry = client.post("/matches/bulk", json=matches, headers=headers)
+
+        assert first.status_code == retry.status_code == 200
+        assert retry.headers[REPLAYED_HEADER] == "true"
+        assert [match["id"] for match in retry.json()] == [match["id"] for match in first.json()]
+        with SessionLocal() as db:
+            assert db.query(Match).count() == 2
+
+    def test_purge_deletes_only_expired_keys(self, api):
+        """Test that the purge job removes expired records and keeps live ones."""
+        _, SessionLocal, _ = api
+        with SessionLocal() as db:
+            user_id = db.query(User.id).first()[0]
+            save_idempotent_response(db, user_id, "POST /matches", "live", "hash", {})
+            expired = save_idempotent_response(db, user_id, "POST /matches", "old", "hash", {})
+            expired.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+            db.commit()
+
+            assert purge_expired_idempotency_keys(db) == 1
+            assert [record.key for record in db.query(IdempotencyKey)] == ["live"]
@@ -0,0 +1,45 @@
+from app.core.events import InMemoryEventBackend
+from app.core.invalidation import InvalidationBus, LocalCache, get_invalidation_bus
+
+
+class TestInvalidation:
+    def test_bus_delivers_to_other_workers_once(self):
+        """Test that two buses on a shared backend see each other's changes exactly once."""
+        backend = InMemoryEventBackend()
+        worker_a = InvalidationBus(backend)
+        worker_b = InvalidationBus(backend)
+        seen_a, seen_b = [], []
+        worker_a.register("users", seen_a.append)
+        worker_b.register("users", seen_b.append)
+
+        worker_a.invalidate("users", [1, 2])
+        worker_b.invalidate("users")
+
+        assert seen_a == [[1, 2], None]
+        assert seen_b == [[1, 2], None]
+
+    def test_local_cache_drops_invalidated_keys(self):
+        """Test per-key and whole-namespace invalidation of a local cache."""
+        cache = LocalCache("test_namespace", ttl_seconds=60)
+        cache.set(1, "a")
+        cache.set(2, "b")
+
+        get_invalidation_bus().invalidate("test_namespace", [1])
+        assert cache.get(1) is None
+        assert cache.get(2) == "b"
+
+        get_invalidation_bus().invalidate("test_namespace")
+        assert len(cache) == 0
+
+    def test_local_cache_expiry_and_loader(self):
+        """Test TTL expiry and get_or_set loading."""
+        cache = LocalCache("test_expiry", ttl_seconds=0)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return "value"
+
+        assert cache.get_or_set("key", loader) == "value"
+        assert cache.get_or_set("key", loader) == "value"
+        assert len(calls) == 2
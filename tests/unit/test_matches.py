@@ -0,0 +1,44 @@
+from app.api.routers import matches as matches_router
+from app.common.enums import MatchType
+from app.models import User
+from app.models.models import Match
+
+
+class TestNormalizedMatches:
+    def test_users_are_listed_once_and_loaded_in_one_query(self, monkeypatch, db_session, statements):
+        """Test that matches reference users by id and that query count does not grow with users."""
+        monkeypatch.setattr(matches_router, "authorize", lambda *args: None)
+        users = [
+            User(username=f"player{index}", email=f"p{index}@example.com", full_name=f"Player {index}", hashed_password="x")
+            for index in range(10)
+        ]
+        db_session.add_all(users)
+        db_session.flush()
+        db_session.add_all([
+            Match(
+                player1_id=users[index % 10].id, player2_id=users[(index + 1) % 10].id, player1_score=21,
+                player2_score=index % 20, match_type=MatchType.CASUAL, submitted_by_id=users[index % 10].id,
+            )
+            for index in range(40)
+        ])
+        db_session.commit()
+        usernames = {str(user.id): user.username for user in users}
+        db_session.expunge_all()
+
+        statements.clear()
+        response = matches_router.read_matches_normalized(
+            skip=0, limit=500, match_type=None, status=None, fields=None, current_user=None, db=db_session
+        )
+        assert len(statements) == 2
+        assert len(response.matches) == 40
+        assert set(response.users) == set(usernames)
+        assert {user.username for user in response.users.values()} == set(usernames.values())
+        assert "player1" not in response.matches[0].model_dump()
+
+        db_session.expunge_all()
+        statements.clear()
+        nested = matches_router.read_matches(
+            skip=0, limit=500, match_type=None, status=None, fields=None, current_user=None, db=db_session
+        )
+        assert {match.player2.username for match in nested} == set(usernames.values())
+        assert len(statements) <= 7
@@ -0,0 +1,157 @@
+import asyncio
+import io
+import os
+import time
+from datetime import datetime, timezone
+
+from app.core.media import (
+    LocalMediaStore,
+    S3MediaStore,
+    media_key,
+    media_url,
+    set_media_store,
+    stage_upload,
+    staging_file,
+)
+from app.models import User
+from app.services.housekeeping import purge_unreferenced_media
+
+
+class _MissingKey(Exception):
+    response = {"Error": {"Code": "404"}}
+
+
+class LocalS3Client:
+    """Stand-in for the subset of the boto3 S3 client the store uses"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def _get(self, key):
+        if key not in self.objects:
+            raise _MissingKey(key)
+        return self.objects[key]
+
+    def upload_file(self, filename, bucket, key, ExtraArgs=None):
+        with open(filename, "rb") as source:
+            self.objects[key] = {"Body": source.read(), "LastModified": datetime.now(timezone.utc), **(ExtraArgs or {})}
+
+    def head_object(self, Bucket, Key):
+        item = self._get(Key)
+        return {"ContentLength": len(item["Body"]), "LastModified": item["LastModified"]}
+
+    def copy_object(self, Bucket, Key, CopySource, **metadata):
+        self._get(CopySource["Key"])["LastModified"] = datetime.now(timezone.utc)
+
+    def get_object(self, Bucket, Key, Range=None):
+        body = self._get(Key)["Body"]
+        if Range:
+            first, last = Range.removeprefix("bytes=").split("-")
+            body = body[int(first):int(last) + 1]
+        return {"Body": io.BytesIO(body)}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def list_objects_v2(self, Bucket, Prefix="", ContinuationToken=None):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        return {"Contents": [{"Key": key, "Size": len(self.objects[key]["Body"]), "LastModified": self.objects[key]["LastModified"]} for key in keys]}
+
+
+async def _chunks(data: bytes):
+    yield data[:3]
+    yield data[3:]
+
+
+def _store(store, data: bytes, extension: str = "txt") -> str:
+    staged = asyncio.run(stage_upload(_chunks(data), 1024 * 1024, store))
+    key = media_key(staged.digest, extension)
+    store.save(key, staged.path)
+    return key
+
+
+class TestMediaStore:
+    def test_backends_deduplicate_by_content(self, tmp_path):
+        """Test that the local and S3 backends store identical uploads once."""
+        s3 = LocalS3Client()
+        for store in (LocalMediaStore(tmp_path / "media"), S3MediaStore(s3, "bucket", "media/", staging=tmp_path / "staging")):
+            first = _store(store, b"same bytes")
+            assert _store(store, b"same bytes") == first
+            assert _store(store, b"other bytes") != first
+            assert sorted(blob.size for blob in store.iter_blobs()) == [10, 11]
+            assert store.open(first).read() == b"same bytes"
+            assert list(store.staging_dir().iterdir()) == []
+        assert all(item["CacheControl"].endswith("immutable") for item in s3.objects.values())
+
+    def test_media_route_is_immutable_and_conditional(self, tmp_path, client):
+        """Test the far-future caching headers, the ETag and 304 on revalidation."""
+        store = LocalMediaStore(tmp_path / "media")
+        set_media_store(store)
+        try:
+            key = _store(store, b"\x89PNG fake", "png")
+
+            response = client.get(media_url(key))
+            assert response.status_code == 200
+            assert response.content == b"\x89PNG fake"
+            assert response.headers["content-type"] == "image/png"
+            assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+            assert response.headers["x-content-type-options"] == "nosniff"
+
+            revalidated = client.get(media_url(key), headers={"If-None-Match": response.headers["etag"]})
+            assert revalidated.status_code == 304
+            assert client.get(media_url("0" * 64 + ".png")).status_code == 404
+        finally:
+            set_media_store(None)
+
+    def test_purge_keeps_referenced_digests(self, tmp_path, db_session):
+        """Test that the purge removes old unreferenced blobs and keeps renditions of referenced ones."""
+        store = LocalMediaStore(tmp_path / "media")
+        original = _store(store, b"picture", "png")
+        # A rendition: the original's digest with a variant
+        avatar = original.replace(".png", "_avatar256.jpg")
+        rendition = staging_file(store)
+        rendition.write_bytes(b"avatar")
+        store.save(avatar, rendition)
+        orphan = _store(store, b"orphan", "png")
+        fresh_orphan = _store(store, b"fresh orphan", "png")
+        long_ago = time.time() - 3 * 24 * 3600
+        for key in (original, avatar, orphan):
+            os.utime(store.local_path(key), (long_ago, long_ago))
+
+        db_session.add(User(username="alice", email="alice@example.com", full_name="Alice", hashed_password="x", profile_picture_url=media_url(avatar)))
+        db_session.commit()
+        assert purge_unreferenced_media(db_session, store) == 1
+
+        assert sorted(blob.key for blob in store.iter_blobs()) == sorted([original, avatar, fresh_orphan])
+
+    def test_media_route_serves_byte_ranges(self, tmp_path, client):
+        """Test 206 ranges from local and S3 stores, If-Range, 416 and If-Modified-Since."""
+        data = bytes(range(256)) * 40
+        for store in (LocalMediaStore(tmp_path / "media"), S3MediaStore(LocalS3Client(), "bucket", staging=tmp_path / "staging")):
+            set_media_store(store)
+            try:
+                url = media_url(_store(store, data, "mp4"))
+                full = client.get(url)
+                assert full.headers["accept-ranges"] == "bytes"
+                assert full.headers["content-type"] == "video/mp4"
+
+                partial = client.get(url, headers={"Range": "bytes=1000-1999"})
+                assert partial.status_code == 206
+                assert partial.headers["content-range"] == f"bytes 1000-1999/{len(data)}"
+                assert partial.content == data[1000:2000]
+                assert client.get(url, headers={"Range": "bytes=-100"}).content == data[-100:]
+                assert client.get(url, headers={"Range": "bytes=10000-"}).content == data[10000:]
+
+                unsatisfiable = client.get(url, headers={"Range": f"bytes={len(data)}-"})
+                assert unsatisfiable.status_code == 416
+                assert unsatisfiable.headers["content-range"] == f"bytes */{len(data)}"
+                # A partial copy of other content gets the whole file instead
+                stale = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+                assert (stale.status_code, stale.content) == (200, data)
+
+                head = client.head(url, headers={"Range": "bytes=0-9"})
+                assert (head.status_code, head.headers["content-length"], head.content) == (206, "10", b"")
+                revalidated = client.get(url, headers={"If-Modified-Since": full.headers["last-modified"]})
+                assert revalidated.status_code == 304
+            finally:
+                set_media_store(None)
@@ -0,0 +1,49 @@
+import threading
+
+from app.core.metrics import Registry, render
+
+
+class TestMetrics:
+    def test_counter_merges_thread_shards(self):
+        """Test that increments from many threads are all counted."""
+        registry = Registry()
+        counter = registry.counter("test_events_total", "Events", labelnames=("kind",))
+
+        def work():
+            for _ in range(1000):
+                counter.inc("a")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.collect() == {("a",): 4000}
+
+    def test_render_text_format(self):
+        """Test the Prometheus text exposition of each metric kind."""
+        registry = Registry()
+        registry.counter("test_requests_total", "Requests", labelnames=("route",)).inc("/a\"b")
+        registry.histogram("test_latency_seconds", "Latency", buckets=(0.1,)).observe(0.05)
+        registry.callback("test_pool", "Pool", lambda: {("idle",): 3}, labelnames=("state",))
+
+        text = render(registry)
+
+        assert "# TYPE test_requests_total counter" in text
+        assert 'test_requests_total{route="/a\\"b"} 1' in text
+        assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'test_latency_seconds_bucket{le="+Inf"} 1' in text
+        assert "test_latency_seconds_count 1" in text
+        assert 'test_pool{state="idle"} 3' in text
+
+    def test_failing_callback_is_skipped(self):
+        """Test that a broken collector does not break the scrape."""
+        registry = Registry()
+
+        def broken():
+            raise RuntimeError("boom")
+
+        registry.callback("test_broken", "Broken", broken)
+
+        assert "# TYPE test_broken gauge" in render(registry)
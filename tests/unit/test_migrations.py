@@ -0,0 +1,58 @@
+import re
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.core.migrations import backfill_in_batches
+from app.models import User
+from app.models.posts import Comment, Post
+
+INIT_SQL = Path(__file__).resolve().parents[2] / "db" / "postgres" / "init" / "init_database.sql"
+
+
+class TestSchemaParity:
+    def test_models_declare_the_indexes_of_init_sql(self):
+        """Test that create_all and init_database.sql build the same set of indexes."""
+        sql_indexes = set(re.findall(r"CREATE INDEX (\w+)", INIT_SQL.read_text()))
+        model_indexes = {index.name for table in Base.metadata.tables.values() for index in table.indexes}
+
+        assert model_indexes == sql_indexes
+
+
+class TestBackfill:
+    def test_counter_column_is_backfilled_in_batches(self, db_engine, db_session):
+        """Test adding a counter column and filling it window by window."""
+        author = User(username="author", email="author@example.com", full_name="Author", hashed_password="x")
+        db_session.add(author)
+        db_session.flush()
+        posts = [Post(user_id=author.id, content=f"Post {index}") for index in range(7)]
+        db_session.add_all(posts)
+        db_session.flush()
+        db_session.add_all([Comment(post_id=post.id, user_id=author.id, content="Hi") for post in posts for _ in range(post.id % 3)])
+        db_session.commit()
+
+        post_table = sa.table("Post", sa.column("id"), sa.column("reply_total"), schema="badminton")
+        comment_table = sa.table("Comment", sa.column("post_id"), schema="badminton")
+        replies = (
+            sa.select(sa.func.count())
+            .where(comment_table.c.post_id == post_table.c.id)
+            .scalar_subquery()
+        )
+        with db_engine.connect() as connection:
+            migration = MigrationContext.configure(connection)
+            # As run_migrations does around each revision
+            with Operations.context(migration):
+                with migration.begin_transaction(_per_migration=True):
+                    Operations(migration).add_column(
+                        "Post", sa.Column("reply_total", sa.Integer, nullable=False, server_default="0"), schema="badminton",
+                    )
+                    updated = backfill_in_batches(post_table, {"reply_total": replies}, batch_size=3)
+
+            totals = dict(connection.execute(sa.select(post_table.c.id, post_table.c.reply_total)).all())
+
+        assert updated == 7
+        assert totals == {post_id: post_id % 3 for post_id in totals}
@@ -0,0 +1,71 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import HTTPException
+from PIL import Image
+
+from app.core.media import LocalMediaStore, key_from_url, set_media_store
+from app.models import User
+from app.services import profile_picture_service
+from app.services.profile_picture_service import (
+    AVATAR_SIZE,
+    remove_profile_picture,
+    store_profile_picture,
+)
+
+
+async def _chunks(data: bytes, size: int = 1000):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGBA", (width, height), (200, 30, 30, 128)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class TestProfilePictures:
+    def test_upload_is_streamed_and_rendered_once(self, monkeypatch, tmp_path, db_session):
+        """Test the avatar, deduplicated re-uploads and rejecting oversized or non-image bodies."""
+        store = LocalMediaStore(tmp_path / "media")
+        set_media_store(store)
+        renders = []
+        render_avatar = profile_picture_service.render_avatar
+        monkeypatch.setattr(profile_picture_service, "render_avatar", lambda *paths: renders.append(paths) or render_avatar(*paths))
+
+        try:
+            user = User(username="alice", email="alice@example.com", full_name="Alice", hashed_password="x")
+            db_session.add(user)
+            db_session.commit()
+            picture = _png(1200, 800)
+
+            first = asyncio.run(store_profile_picture(db_session, user, _chunks(picture)))
+            with Image.open(store.local_path(key_from_url(first))) as avatar:
+                assert avatar.format == "JPEG"
+                assert avatar.size == (AVATAR_SIZE, AVATAR_SIZE)
+
+            # Same bytes again: same URL, nothing stored or rendered
+            assert asyncio.run(store_profile_picture(db_session, user, _chunks(picture))) == first
+            assert len(renders) == 1
+            # The original is keyed by the format Pillow found, not what the client called it
+            digest = key_from_url(first).split("_")[0]
+            assert sorted(blob.key for blob in store.iter_blobs()) == [f"{digest}.png", key_from_url(first)]
+
+            monkeypatch.setattr(profile_picture_service, "MAX_PROFILE_PICTURE_BYTES", 5000)
+            with pytest.raises(HTTPException) as too_large:
+                asyncio.run(store_profile_picture(db_session, user, _chunks(b"x" * 6000)))
+            assert too_large.value.status_code == 413
+
+            with pytest.raises(HTTPException) as not_an_image:
+                asyncio.run(store_profile_picture(db_session, user, _chunks(b"not an image")))
+            assert not_an_image.value.status_code == 400
+            assert user.profile_picture_url == first
+            assert len(list(store.iter_blobs())) == 2
+            assert list(store.staging_dir().iterdir()) == []
+
+            asyncio.run(remove_profile_picture(db_session, user))
+            assert user.profile_picture_url is None
+        finally:
+            set_media_store(None)
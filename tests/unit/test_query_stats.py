@@ -0,0 +1,50 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.metrics import Histogram
+from app.core.query_stats import QUERIES_PER_REQUEST, QueryStatsMiddleware
+
+
+class TestQueryStats:
+    def test_counts_queries_of_sync_endpoint(self):
+        """Test that statements run in the threadpool are attributed to the request."""
+        engine = create_engine("sqlite://")
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware, server_timing=True)
+
+        @app.get("/items/{item_id}")
+        def read_item(item_id: int):
+            with engine.connect() as connection:
+                for _ in range(3):
+                    connection.execute(text("SELECT 1"))
+            return {"id": item_id}
+
+        response = TestClient(app).get("/items/7")
+
+        assert response.status_code == 200
+        assert 'desc="3 queries"' in response.headers["server-timing"]
+        assert QUERIES_PER_REQUEST.collect()[("GET", "/items/{item_id}")]["sum"] >= 3
+
+    def test_server_timing_can_be_disabled(self):
+        """Test that production mode omits the header."""
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware, server_timing=False)
+
+        @app.get("/ping")
+        def ping():
+            return {}
+
+        assert "server-timing" not in TestClient(app).get("/ping").headers
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket, sum and count aggregation."""
+        histogram = Histogram("test_histogram", "test", buckets=(1, 5), labelnames=("route",))
+        for value in (0.5, 3, 3, 10):
+            histogram.observe(value, "/x")
+
+        series = histogram.collect()[("/x",)]
+
+        assert series["buckets"] == [(1, 1), (5, 3), (float("inf"), 4)]
+        assert series["sum"] == 16.5
+        assert series["count"] == 4
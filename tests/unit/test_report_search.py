@@ -0,0 +1,67 @@
+from datetime import date
+
+from app.models import Report, User
+from app.services.report_search import ReportSearchIndex
+from app.services.search_index import InMemoryTextIndex, prefix_tsquery, query_terms
+
+
+class TestSearchIndex:
+    def test_terms_match_word_prefixes_within_one_field(self):
+        """Test that every term must match a word prefix in the same field."""
+        index = InMemoryTextIndex({"content": 1.0, "author": 0.5})
+        index.add(1, {"content": "Great smashes at the club night", "author": "Alice Smith"})
+        index.add(2, {"content": "Drop shots all evening", "author": "Bob Jones"})
+
+        assert set(index.search(query_terms("smash club"))) == {1}
+        assert set(index.search(query_terms("ali"))) == {1}
+        assert index.search(query_terms("alice smash")) == {}
+
+        index.remove(1)
+        assert index.search(query_terms("smash")) == {}
+
+    def test_query_terms_become_a_safe_prefix_tsquery(self):
+        """Test that operators and stopwords never reach to_tsquery."""
+        terms = query_terms("The smash & drop:* | !net")
+
+        assert prefix_tsquery(terms) == "smash:* & drop:* & net:*"
+        assert prefix_tsquery(query_terms("the of")) is None
+
+    def test_query_words_reach_postgres_unstemmed(self):
+        """Test that Postgres gets the words to stem itself while the in-memory index still finds stems."""
+        assert prefix_tsquery(query_terms("Winning stopped")) == "winning:* & stopped:*"
+
+        index = InMemoryTextIndex({"content": 1.0})
+        index.add(1, {"content": "A win after we stop the rot"})
+        index.add(2, {"content": "Hitting and running drills"})
+        assert set(index.search(query_terms("winning stopped"))) == {1}
+        assert set(index.search(query_terms("hit run"))) == {2}
+
+
+class TestReportSearch:
+    def test_index_follows_committed_changes(self, db_session):
+        """Test that the in-memory fallback ranks matches and picks up edits."""
+        index = ReportSearchIndex()
+
+        author = User(username="mira", email="mira@example.com", full_name="Mira Novak", hashed_password="x")
+        db_session.add(author)
+        db_session.flush()
+        db_session.add_all([
+            Report(created_by_id=author.id, event_date=date(2024, 5, 1), content="Smash smash smash practice"),
+            Report(created_by_id=author.id, event_date=date(2024, 5, 2), content="One smash then rain"),
+            Report(created_by_id=author.id, event_date=date(2024, 5, 3), content="Footwork drills"),
+        ])
+        db_session.commit()
+
+        ids, total = index.search_page(db_session, query_terms("smash"), None, None, 0, 10)
+        assert total == 2
+        assert ids[0] == 1
+
+        ids, total = index.search_page(db_session, query_terms("novak"), date(2024, 5, 2), None, 0, 10)
+        assert (sorted(ids), total) == ([2, 3], 2)
+
+        report = db_session.get(Report, 3)
+        report.content = "Footwork and a smash finish"
+        db_session.commit()
+
+        _, total = index.search_page(db_session, query_terms("smash"), None, None, 0, 10)
+        assert total == 3
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routers import ROUTER_PREFIXES, LazyRouterMiddleware, RouterRegistry
+
+
+class TestRouterRegistry:
+    def test_router_for_path_matches_whole_segments(self):
+        """Test that prefixes only match complete path segments."""
+        registry = RouterRegistry(FastAPI())
+
+        assert registry.router_for_path("/tournaments/1") == "tournaments"
+        assert registry.router_for_path("/tournament-invitations/my-invitations") == "tournament_invitations"
+        assert registry.router_for_path("/matchesx") is None
+        assert registry.router_for_path("/health") is None
+
+    def test_lazy_middleware_loads_router_on_first_request(self):
+        """Test that only the requested router is imported and its routes are served."""
+        app = FastAPI()
+        registry = RouterRegistry(app)
+        app.add_middleware(LazyRouterMiddleware, registry=registry)
+        client = TestClient(app)
+
+        response = client.post("/auth/logout")
+
+        assert response.status_code == 401
+        assert registry.loaded == ["auth"]
+
+        client.get("/openapi.json")
+        assert sorted(registry.loaded) == sorted(ROUTER_PREFIXES)
+
+    def test_lazy_start_does_not_import_models(self):
+        """Test that with lazy routers importing main leaves auth, models and schemas unloaded."""
+        script = (
+            "import sys, main; "
+            "print(sorted(m for m in ('app.core.auth', 'app.models.models', 'app.schemas.schemas') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], env={**os.environ, "LAZY_ROUTERS": "true"},
+            capture_output=True, text=True, check=True,
+        )
+        assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,36 @@
+from app.core.config import settings
+from app.core.runtime import threadpool_size, worker_count
+
+
+class TestRuntime:
+    def test_worker_count_defaults_to_cpu_formula(self, monkeypatch):
+        """Test 2 * CPUs + 1 when the database budget allows it."""
+        monkeypatch.setattr(settings, "web_concurrency", None)
+        monkeypatch.setattr(settings, "db_max_connections", 1000)
+
+        assert worker_count(cpus=4) == 9
+
+    def test_worker_count_respects_database_budget(self, monkeypatch):
+        """Test that workers never oversubscribe Postgres connections."""
+        monkeypatch.setattr(settings, "web_concurrency", 16)
+        monkeypatch.setattr(settings, "db_max_connections", 45)
+        monkeypatch.setattr(settings, "db_pool_size", 5)
+        monkeypatch.setattr(settings, "db_max_overflow", 5)
+        monkeypatch.setattr(settings, "event_backend", "memory")
+        monkeypatch.setattr(settings, "invalidation_backend", "memory")
+        monkeypatch.setattr(settings, "scheduler_enabled", False)
+
+        assert worker_count(cpus=8) == 4
+
+        # Each Postgres pub/sub backend holds one extra LISTEN connection per worker
+        monkeypatch.setattr(settings, "event_backend", "postgres")
+        monkeypatch.setattr(settings, "invalidation_backend", "postgres")
+        assert worker_count(cpus=8) == 3
+
+    def test_threadpool_matches_pool_size(self, monkeypatch):
+        """Test threadpool sizing from the connection pool."""
+        monkeypatch.setattr(settings, "threadpool_size", None)
+        monkeypatch.setattr(settings, "db_pool_size", 8)
+        monkeypatch.setattr(settings, "db_max_overflow", 4)
+
+        assert threadpool_size() == 12
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from sqlalchemy import union_all
+from sqlalchemy.dialects import postgresql
+
+from app.models import Comment, Post, Tournament, User
+from app.services import search_service
+
+
+class TestUnifiedSearch:
+    def test_search_ranks_across_types_and_hides_deleted_posts(self, monkeypatch, db_session):
+        """Test one paginated result list over every type, kept current after writes."""
+        monkeypatch.setattr(search_service, "_memory_indexes", None)
+        author = User(username="smasher", email="s@example.com", full_name="Sam Smash", hashed_password="x")
+        db_session.add(author)
+        db_session.flush()
+        post = Post(user_id=author.id, content="Who wants to practise smashes on Friday?")
+        db_session.add_all([
+            post,
+            Tournament(name="Smash Cup", start_date=datetime(2024, 6, 1)),
+            Tournament(name="Winter League", start_date=datetime(2024, 12, 1)),
+        ])
+        db_session.flush()
+        db_session.add(Comment(post_id=post.id, user_id=author.id, content="Count me in for smash drills"))
+        db_session.commit()
+
+        result = search_service.search(db_session, "smash")
+        assert result["counts"] == {"post": 1, "comment": 1, "user": 1, "tournament": 1}
+        assert {hit["type"] for hit in result["hits"]} == {"post", "comment", "user", "tournament"}
+
+        page = search_service.search(db_session, "smash", types=["tournament", "user"], skip=1, limit=1)
+        assert page["total_count"] == 2
+        assert len(page["hits"]) == 1
+
+        post.is_deleted = True
+        db_session.commit()
+
+        result = search_service.search(db_session, "smash", types=["post", "comment"])
+        assert result["total_count"] == 0
+
+    def test_excerpt_centres_on_the_first_match(self):
+        """Test that long texts are cut around the matching word."""
+        text = "rally " * 50 + "smash finish " + "rally " * 50
+
+        snippet = search_service.excerpt(text, ["smash"], length=40)
+
+        assert "smash" in snippet
+        assert snippet.startswith("…") and snippet.endswith("…")
+
+    def test_winning_finds_a_win_document_on_both_paths(self, monkeypatch, db_session):
+        """Test that Postgres stems the query words itself and the in-memory index matches the same stems."""
+        statement = union_all(*search_service._postgres_selects(search_service.query_terms("Winning"), ["post", "user"]))
+        compiled = statement.compile(dialect=postgresql.dialect())
+        # to_tsquery('english', 'winning:*') is win:*, which matches the indexed 'win'
+        assert set(compiled.params.values()) >= {"winning:*"}
+        assert "winn:*" not in compiled.params.values()
+
+        monkeypatch.setattr(search_service, "_memory_indexes", None)
+        author = User(username="mira", email="m@example.com", full_name="Mira Novak", hashed_password="x")
+        db_session.add(author)
+        db_session.flush()
+        db_session.add(Post(user_id=author.id, content="Big win for the club"))
+        db_session.commit()
+
+        assert search_service.search(db_session, "winning", types=["post"])["total_count"] == 1
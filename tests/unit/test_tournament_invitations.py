@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from app.common.enums import InvitationStatus, TournamentStatus
+from app.models import Tournament, User
+from app.models.tournament_invitations import (
+    TournamentInvitation,
+    TournamentParticipant,
+)
+from app.services import tournament_invitation_service as service
+
+
+class TestBulkInvitations:
+    def test_bulk_invite_uses_fixed_number_of_queries(self, db_session, statements):
+        """Test per-user outcomes and that the query count does not grow with the batch."""
+        users = [
+            User(username=f"player{index}", email=f"p{index}@example.com", full_name=f"Player {index}", hashed_password="x")
+            for index in range(45)
+        ]
+        tournament = Tournament(name="Club Open", start_date=datetime(2024, 6, 1), status=TournamentStatus.INVITING.value)
+        db_session.add_all(users + [tournament])
+        db_session.flush()
+        admin, already_invited, already_playing = users[0], users[1], users[2]
+        db_session.add_all([
+            TournamentInvitation(tournament_id=tournament.id, user_id=already_invited.id, invited_by=admin.id,
+                                 status=InvitationStatus.PENDING.value, expires_at=datetime(2030, 1, 1)),
+            TournamentParticipant(tournament_id=tournament.id, user_id=already_playing.id),
+        ])
+        db_session.commit()
+        tournament_id, admin_id = tournament.id, admin.id
+        user_ids = [user.id for user in users] + [users[5].id, 9999]
+
+        statements.clear()
+        outcomes = service.create_tournament_invitations_bulk(db_session, tournament_id, user_ids, invited_by=admin_id)
+
+        by_user = {outcome["user_id"]: outcome["status"] for outcome in outcomes}
+        assert len(outcomes) == 46
+        assert by_user[admin_id] == service.JOINED
+        assert by_user[already_invited.id] == service.ALREADY_INVITED
+        assert by_user[already_playing.id] == service.ALREADY_PARTICIPANT
+        assert by_user[9999] == service.USER_NOT_FOUND
+        assert list(by_user.values()).count(service.INVITED) == 42
+        assert all(outcome.get("invitation_id") for outcome in outcomes if outcome["status"] == service.INVITED)
+        inserts = [sql for sql in statements if sql.lstrip().upper().startswith("INSERT")]
+        assert len([sql for sql in inserts if "collection_versions" not in sql]) == 2
+        assert len(inserts) == 3  # plus one upsert bumping the changed collections' versions
+        assert len(statements) <= 9
+        assert db_session.query(TournamentInvitation).count() == 43
+
+
+class TestInvitationInbox:
+    def test_inbox_loads_in_three_queries(self, db_session, statements):
+        """Test that the inbox carries tournaments, inviters and counts without per-row queries."""
+        invitee, *organisers = [
+            User(username=f"user{index}", email=f"u{index}@example.com", full_name=f"User {index}", hashed_password="x")
+            for index in range(4)
+        ]
+        tournaments = [Tournament(name=f"Open {index}", start_date=datetime(2024, 6, index + 1)) for index in range(3)]
+        db_session.add_all([invitee, *organisers, *tournaments])
+        db_session.flush()
+        db_session.add_all([
+            TournamentInvitation(tournament_id=tournament.id, user_id=invitee.id, invited_by=organiser.id,
+                                 status=InvitationStatus.PENDING.value, expires_at=datetime(2030, 1, 1))
+            for tournament, organiser in zip(tournaments, organisers)
+        ] + [TournamentParticipant(tournament_id=tournaments[0].id, user_id=organiser.id) for organiser in organisers])
+        db_session.commit()
+        invitee_id, first_tournament_id = invitee.id, tournaments[0].id
+
+        statements.clear()
+        inbox = service.get_user_invitations(db_session, invitee_id)
+
+        assert len(statements) == 3
+        assert len(inbox) == 3
+        assert {item["inviter"]["username"] for item in inbox} == {"user1", "user2", "user3"}
+        assert all(item["user"]["id"] == invitee_id for item in inbox)
+        first = next(item for item in inbox if item["tournament_id"] == first_tournament_id)
+        assert first["tournament"]["participant_count"] == 3
+        assert first["tournament"]["invitation_count"] == 1
+        assert service.get_tournament_counts(db_session, [first_tournament_id]) == {
+            first_tournament_id: {"participant_count": 3, "invitation_count": 1}
+        }
@@ -0,0 +1,46 @@
+
+from app.models import User
+from app.services import user_autocomplete
+from app.services.search_index import PrefixTrie
+
+
+class TestPrefixTrie:
+    def test_username_matches_rank_above_name_matches(self):
+        """Test field priority, whole-word bonus and removal."""
+        trie = PrefixTrie()
+        trie.add(1, {"username": "anna", "full_name": "Anna Kovac"})
+        trie.add(2, {"username": "mkovac", "full_name": "Marko Annic"})
+        trie.add(3, {"username": "annabel", "full_name": "Annabel Lee"})
+
+        scores = trie.search(["ann"])
+        assert scores[1] == scores[3] > scores[2]
+        scores = trie.search(["anna"])
+        assert scores[1] > scores[3]
+        assert set(trie.search(["ann", "kov"])) == {1}
+
+        trie.remove(1)
+        assert set(trie.search(["ann"])) == {2, 3}
+        assert trie.search(["kovac", "anna"]) == {}
+
+
+class TestUserAutocomplete:
+    def test_suggestions_follow_user_changes(self, monkeypatch, db_session):
+        """Test top-k suggestions, including cached short prefixes, after a rename."""
+        monkeypatch.setattr(user_autocomplete, "_trie", None)
+        db_session.add_all([
+            User(username=f"player{index}", email=f"p{index}@example.com", full_name=f"Player {index}", hashed_password="x")
+            for index in range(30)
+        ] + [User(username="zed", email="z@example.com", full_name="Zoe Daniels", hashed_password="x")])
+        db_session.commit()
+
+        assert [user["username"] for user in user_autocomplete.autocomplete_users(db_session, "play", limit=3)] == [
+            "player0", "player1", "player10"
+        ]
+        assert user_autocomplete.autocomplete_users(db_session, "Zo")[0]["username"] == "zed"
+
+        zed = db_session.query(User).filter(User.username == "zed").one()
+        zed.full_name = "Zara Daniels"
+        db_session.commit()
+
+        assert user_autocomplete.autocomplete_users(db_session, "zo") == []
+        assert user_autocomplete.autocomplete_users(db_session, "zara d")[0]["id"] == zed.id